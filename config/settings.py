@@ -0,0 +1,141 @@
+"""
+Настройки проекта MTS Shop Autotests
+
+Модуль импортируется при первом обращении к config (config/config.py):
+переменные из .env читаются один раз, директории отчётов создают те, кто
+в них пишет.
+"""
+import os
+from pathlib import Path
+from dotenv import load_dotenv
+
+# Загружаем переменные окружения
+load_dotenv()
+
+# Базовые пути
+BASE_DIR = Path(__file__).parent.parent
+
+
+class Config:
+    """Основные настройки"""
+
+    # URL
+    BASE_URL = os.getenv("BASE_URL", "https://shop.mts.ru")
+    API_BASE_URL = os.getenv("API_BASE_URL", "https://shop.mts.ru/api/v1")
+
+    # Данные тестового товара
+    TEST_PRODUCT_ID = os.getenv("TEST_PRODUCT_ID", "708888")
+    TEST_PRODUCT_NAME = os.getenv("TEST_PRODUCT_NAME", "Смартфон")
+
+    # Учетные данные
+    TEST_USERNAME = os.getenv("TEST_USERNAME", "")
+    TEST_PASSWORD = os.getenv("TEST_PASSWORD", "")
+    API_TOKEN = os.getenv("API_TOKEN", "")
+
+     # Настройки браузера
+    BROWSER = os.getenv("BROWSER", "chrome").lower()
+    HEADLESS = os.getenv("HEADLESS", "false").lower() == "true"
+    IMPLICIT_WAIT = int(os.getenv("IMPLICIT_WAIT", "10"))  # таймаут явных ожиданий в page objects
+    WINDOW_WIDTH = int(os.getenv("WINDOW_WIDTH", "1920"))  # Добавь эту строку
+    WINDOW_HEIGHT = int(os.getenv("WINDOW_HEIGHT", "1080"))  # И эту
+
+    # Загрузка страниц: профиль (full, functional, fast - utils/page_load.py), стратегия
+    # вместо стратегии профиля (normal, eager, none), таймаут и блок-лист сторонних запросов
+    PAGE_LOAD_PROFILE = os.getenv("PAGE_LOAD_PROFILE", "functional").lower()
+    PAGE_LOAD_STRATEGY = os.getenv("PAGE_LOAD_STRATEGY", "").lower()
+    PAGE_LOAD_TIMEOUT = int(os.getenv("PAGE_LOAD_TIMEOUT", "30"))
+    BLOCKLIST_FILE = Path(os.getenv("BLOCKLIST_FILE", str(BASE_DIR / "config" / "blocklist.txt")))
+
+    # Ожидания готовности страницы: бюджет (с) после перехода и действий - виджеты
+    # и карусели могут не дать странице успокоиться, поэтому он меньше IMPLICIT_WAIT;
+    # сколько мс сеть/DOM должны быть спокойны
+    PAGE_READY_TIMEOUT = float(os.getenv("PAGE_READY_TIMEOUT", "2"))
+    WAIT_NETWORK_IDLE_MS = int(os.getenv("WAIT_NETWORK_IDLE_MS", "200"))
+    WAIT_DOM_QUIET_MS = int(os.getenv("WAIT_DOM_QUIET_MS", "300"))
+
+    # Бюджет проверки необязательных элементов (BasePage.probe), мс
+    PROBE_BUDGET_MS = int(os.getenv("PROBE_BUDGET_MS", "300"))
+
+    # Кэш выученных альтернатив составных локаторов (между запусками)
+    LOCATOR_CACHE_FILE = Path(os.getenv("LOCATOR_CACHE_FILE", str(BASE_DIR / ".locator_cache.json")))
+
+    # Ожидание условий (utils/polling.py): первый интервал, множитель и предел интервала, секунды
+    POLL_INITIAL_INTERVAL = float(os.getenv("POLL_INITIAL_INTERVAL", "0.05"))
+    POLL_BACKOFF = float(os.getenv("POLL_BACKOFF", "1.5"))
+    POLL_MAX_INTERVAL = float(os.getenv("POLL_MAX_INTERVAL", "1"))
+
+    # Метрики загрузки страниц и действий page objects (utils/page_perf.py)
+    PAGE_PERF = os.getenv("PAGE_PERF", "true").lower() == "true"
+    PAGE_PERF_DEVTOOLS = os.getenv("PAGE_PERF_DEVTOOLS", "false").lower() == "true"  # логи сети DevTools (Chrome)
+    PAGE_PERF_BUDGETS_FILE = os.getenv("PAGE_PERF_BUDGETS_FILE", str(BASE_DIR / "config" / "page_budgets.json"))
+    PAGE_PERF_TREND_FILE = Path(os.getenv("PAGE_PERF_TREND_FILE", str(BASE_DIR / "reports" / "page_perf_trend.jsonl")))
+
+    # Сетевые профили UI тестов через запятую (utils/network_profiles.py), пусто - без эмуляции
+    NETWORK_PROFILE = os.getenv("NETWORK_PROFILE", "")
+
+    # Быстрое заполнение форм одним скриптом вместо посимвольного ввода
+    FAST_FORM_FILL = os.getenv("FAST_FORM_FILL", "true").lower() == "true"
+
+    # Пул браузеров: сколько прогретых браузеров держать и через сколько тестов пересоздавать
+    DRIVER_POOL_SIZE = int(os.getenv("DRIVER_POOL_SIZE", "1"))
+    DRIVER_RECYCLE_AFTER = int(os.getenv("DRIVER_RECYCLE_AFTER", "50"))
+
+    # Поиск драйверов: lock-файл закрепляет найденный бинарник за машиной
+    DRIVER_LOCK_FILE = Path(os.getenv("DRIVER_LOCK_FILE", str(BASE_DIR / "config" / "drivers.lock.json")))
+    DRIVER_OFFLINE = os.getenv("DRIVER_OFFLINE", "false").lower() == "true"
+
+    # Настройки API
+    API_TIMEOUT = int(os.getenv("API_TIMEOUT", "30"))
+    API_CONNECT_TIMEOUT = float(os.getenv("API_CONNECT_TIMEOUT", "5"))
+    API_READ_TIMEOUT = float(os.getenv("API_READ_TIMEOUT", str(API_TIMEOUT)))
+    API_MAX_RETRIES = int(os.getenv("API_MAX_RETRIES", "3"))
+    API_BACKOFF_BASE = float(os.getenv("API_BACKOFF_BASE", "0.5"))  # секунды, удваивается с каждой попыткой
+    API_BACKOFF_MAX = float(os.getenv("API_BACKOFF_MAX", "10"))
+    API_POOL_CONNECTIONS = int(os.getenv("API_POOL_CONNECTIONS", "10"))  # сколько хостов держать в пуле
+    API_POOL_SIZE = int(os.getenv("API_POOL_SIZE", "10"))  # соединений на хост
+    API_BREAKER_THRESHOLD = int(os.getenv("API_BREAKER_THRESHOLD", "5"))  # ошибок подряд до размыкания
+    API_BREAKER_RESET = float(os.getenv("API_BREAKER_RESET", "30"))  # секунд до пробного запроса
+    API_P95_BUDGET_MS = int(os.getenv("API_P95_BUDGET_MS", "1000"))  # бюджет p95 для маркера perf_budget
+    API_CONCURRENCY = int(os.getenv("API_CONCURRENCY", "20"))  # одновременных запросов асинхронного клиента
+
+    # Кэш ответов каталога (цены товаров) на сессию pytest; файл - хранить между запусками
+    API_CACHE = os.getenv("API_CACHE", "true").lower() == "true"
+    API_CACHE_TTL = float(os.getenv("API_CACHE_TTL", "600"))  # секунд
+    API_CACHE_SIZE = int(os.getenv("API_CACHE_SIZE", "512"))  # записей
+    API_CACHE_FILE = os.getenv("API_CACHE_FILE", "")
+
+    # Очистка корзин, изменённых тестами: сколько накопить перед параллельной очисткой
+    CART_CLEANUP_BATCH = int(os.getenv("CART_CLEANUP_BATCH", "20"))
+
+    # Кассеты API: live - реальные запросы, record - запись, replay - воспроизведение без сети
+    API_MODE = os.getenv("API_MODE", "live").lower()
+    CASSETTE_DIR = Path(os.getenv("CASSETTE_DIR", str(BASE_DIR / "tests" / "cassettes")))
+    CASSETTE_IGNORE_PARAMS = [p for p in os.getenv("CASSETTE_IGNORE_PARAMS", "").split(",") if p]
+    CASSETTE_IGNORE_BODY_FIELDS = [f for f in os.getenv("CASSETTE_IGNORE_BODY_FIELDS", "").split(",") if f]
+    CASSETTE_LATENCY_FACTOR = float(os.getenv("CASSETTE_LATENCY_FACTOR", "0"))  # 1 - отвечать с записанной задержкой
+
+    # Локальный стенд магазина (tests/local_shop.py) вместо shop.mts.ru
+    LOCAL_SHOP = os.getenv("LOCAL_SHOP", "false").lower() == "true"
+    LOCAL_SHOP_LATENCY_MS = int(os.getenv("LOCAL_SHOP_LATENCY_MS", "0"))  # задержка каждого ответа стенда
+    LOCAL_SHOP_ERROR_RATE = float(os.getenv("LOCAL_SHOP_ERROR_RATE", "0"))  # доля ответов API с кодом 503
+
+    # Товары для нагрузочных сценариев (python run.py load)
+    LOAD_PRODUCT_IDS = os.getenv("LOAD_PRODUCT_IDS", "708888,708882,708870,947478").split(",")
+
+    # Пути
+    SCREENSHOTS_DIR = BASE_DIR / "screenshots"
+    REPORTS_DIR = BASE_DIR / "reports"
+    LOGS_DIR = BASE_DIR / "logs"
+
+    # Артефакты упавших тестов: качество JPEG скриншотов и лимит места на прогон
+    ARTIFACTS_JPEG_QUALITY = int(os.getenv("ARTIFACTS_JPEG_QUALITY", "70"))
+    ARTIFACTS_BUDGET_MB = int(os.getenv("ARTIFACTS_BUDGET_MB", "200"))
+
+    # История длительностей тестов для балансировки шардов (run.py --workers)
+    DURATIONS_FILE = REPORTS_DIR / "durations.json"
+
+    # Настройки тестов
+    TEST_MODE = os.getenv("TEST_MODE", "all")  # all, ui, api
+
+    # Бюджет импорта conftest без браузера (tests/test_startup.py), мс
+    IMPORT_BUDGET_MS = int(os.getenv("IMPORT_BUDGET_MS", "1000"))
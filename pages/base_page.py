@@ -1,34 +1,115 @@
+from contextlib import contextmanager
+from urllib.parse import urlparse
+from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import JavascriptException, TimeoutException, NoSuchElementException
 from config.config import config
+from utils.artifacts import artifacts, capture_screenshot
+from utils.locator_cache import locator_cache, split_selector
+from utils.network_profiles import after_load, before_navigation
+from utils.page_perf import page_perf
+from utils.page_scripts import PAGE_READY_JS, QUERY_ALL_JS, FILL_FORM_JS, PROBE_JS, MATCH_ALTERNATIVE_JS
 
 
 class BasePage:
     """Базовый класс для всех страниц"""
 
-    def __init__(self, driver, timeout=10):
+    # Индикатор загрузки (спиннер), общий для страниц магазина
+    SPINNER = (By.CSS_SELECTOR, "[data-test='spinner'], .spinner, .loader")
+
+    def __init__(self, driver, timeout=None):
         self.driver = driver
-        self.timeout = timeout
-        self.wait = WebDriverWait(driver, timeout)
+        self.timeout = timeout or config.IMPLICIT_WAIT
+        self.wait = WebDriverWait(driver, self.timeout)
         self.base_url = config.BASE_URL
 
     def open(self, url=""):
         """Открыть страницу"""
         full_url = f"{self.base_url}{url}"
+        if config.PAGE_PERF:
+            page_perf.drain_devtools(self.driver)
+        before_navigation(self.driver)
+        new_document = self.page_load_strategy == "none"
+        if new_document:
+            # get вернётся до начала навигации - отличаем старый документ от нового
+            self.driver.execute_script("window.__staleDocument = true;")
         self.driver.get(full_url)
+        if new_document:
+            self.wait_for_new_document()
+        self.wait_for_page_ready()
+        after_load(self.driver)
+        if config.PAGE_PERF:
+            page_perf.record_load(self.driver, type(self).__name__)
         return self
 
+    @contextmanager
+    def measure(self, action):
+        """
+        Записать метрики действия (время, запросы, объём) в page_perf
+
+        Пример:
+        with self.measure("add_to_cart"):
+            self.click(self.ADD_TO_CART_BUTTON)
+        """
+        if not config.PAGE_PERF:
+            yield
+            return
+        start = page_perf.start(self.driver)
+        yield
+        page_perf.record_action(self.driver, type(self).__name__, action, start)
+
     def find_element(self, locator, timeout=None):
         """Найти элемент с ожиданием"""
+        learned = self._learned_alternative(locator)
+        if learned is not None:
+            # Быстрый путь без ожидания: элемент по выученной альтернативе
+            elements = self.driver.find_elements(By.CSS_SELECTOR, split_selector(locator[1])[learned])
+            if elements:
+                locator_cache.hit(type(self).__name__, urlparse(self.base_url).netloc, locator[1])
+                return elements[0]
+
         wait = WebDriverWait(self.driver, timeout or self.timeout)
-        return wait.until(EC.presence_of_element_located(locator))
+        element = wait.until(EC.presence_of_element_located(locator))
+        self._learn_alternative(locator, element, learned)
+        return element
 
     def find_elements(self, locator, timeout=None):
         """Найти все элементы с ожиданием"""
+        # Составной селектор - объединение альтернатив, поэтому ищем по полному:
+        # строки, подходящие под другие альтернативы, не теряются
         wait = WebDriverWait(self.driver, timeout or self.timeout)
         return wait.until(EC.presence_of_all_elements_located(locator))
 
+    def _learned_alternative(self, locator):
+        """Индекс выученной альтернативы составного CSS-селектора или None"""
+        by, selector = locator
+        if by != By.CSS_SELECTOR or len(split_selector(selector)) < 2:
+            return None
+        return locator_cache.preferred(type(self).__name__, urlparse(self.base_url).netloc, selector)
+
+    def _learn_alternative(self, locator, element, learned=None):
+        """
+        Запомнить, какая альтернатива составного селектора нашла элемент
+
+        learned - альтернатива, по которой элемент не нашёлся быстрым путём.
+        Она заменяется, только если элемент нашёлся по другой альтернативе;
+        если он просто появился позже, альтернатива остаётся.
+        """
+        by, selector = locator
+        alternatives = split_selector(selector) if by == By.CSS_SELECTOR else ()
+        if len(alternatives) < 2:
+            return
+
+        page, host = type(self).__name__, urlparse(self.base_url).netloc
+        index = self.driver.execute_script(MATCH_ALTERNATIVE_JS, element, list(alternatives))
+        if index < 0:
+            return
+        if index == learned:
+            locator_cache.hit(page, host, selector)
+        else:
+            locator_cache.remember(page, host, selector, index, len(alternatives))
+
     def click(self, locator, timeout=None):
         """Кликнуть по элементу"""
         element = self.find_element(locator, timeout)
@@ -55,6 +136,22 @@ class BasePage:
         except (TimeoutException, NoSuchElementException):
             return False
 
+    def probe(self, *locators, budget=None):
+        """
+        Проверить наличие необязательных элементов без ожидания таймаута
+
+        Все локаторы проверяются одним вызовом в браузере в пределах
+        небольшого бюджета (мс, по умолчанию PROBE_BUDGET_MS). Возвращает
+        первый по порядку найденный локатор или None.
+
+        Пример:
+        control = page.probe(QUANTITY_INPUT, QUANTITY_SELECT)
+        """
+        budget = config.PROBE_BUDGET_MS if budget is None else budget
+        js_locators = [self._to_js_locator(locator) for locator in locators]
+        index = self.driver.execute_async_script(PROBE_JS, js_locators, budget)
+        return locators[index] if index >= 0 else None
+
     def is_element_visible(self, locator, timeout=5):
         """Проверить видимость элемента"""
         try:
@@ -64,13 +161,171 @@ class BasePage:
         except (TimeoutException, NoSuchElementException):
             return False
 
+    def query_all(self, container_locator, fields, timeout=0):
+        """
+        Получить данные всех строк за один вызов execute_script
+
+        fields - словарь {имя: локатор} (текст элемента), {имя: (локатор, атрибут)}
+        (значение атрибута) или {имя: None} (текст самого контейнера). Текст,
+        как у WebElement.text, только отрисованный: у скрытого элемента - ''.
+        В каждой строке есть ключ '_element' - WebElement контейнера.
+        При timeout > 0 ждёт появления хотя бы одной строки.
+
+        Пример:
+        rows = page.query_all(CART_ITEMS, {
+            "name": ITEM_NAME,
+            "link": (ITEM_LINK, "href"),
+        })
+        """
+        script_fields = []
+        for name, field in fields.items():
+            if field is None:
+                script_fields.append({"name": name, "locator": None, "attribute": None})
+            elif isinstance(field[0], tuple):
+                locator, attribute = field
+                script_fields.append({"name": name, "locator": self._to_js_locator(locator), "attribute": attribute})
+            else:
+                script_fields.append({"name": name, "locator": self._to_js_locator(field), "attribute": None})
+
+        container = self._to_js_locator(container_locator)
+
+        def query(driver):
+            return driver.execute_script(QUERY_ALL_JS, container, script_fields)
+
+        if not timeout:
+            return query(self.driver)
+        try:
+            return WebDriverWait(self.driver, timeout, poll_frequency=0.1).until(query)
+        except TimeoutException:
+            return []
+
+    def fill_form_js(self, fields):
+        """
+        Заполнить поля формы одним вызовом execute_script
+
+        fields - словарь {имя: (локатор, значение)}. Подходит для input,
+        textarea, select (по тексту или value опции) и групп radio/checkbox
+        (по вхождению значения в value или id). Возвращает список имён полей,
+        которые заполнить не удалось.
+        """
+        script_fields = [
+            {"name": name, "locator": self._to_js_locator(locator), "value": str(value)}
+            for name, (locator, value) in fields.items()
+        ]
+        return self.driver.execute_script(FILL_FORM_JS, script_fields)
+
+    @staticmethod
+    def _to_js_locator(locator):
+        """Перевести локатор Selenium в CSS/XPath для скриптов"""
+        by, value = locator
+        if by == By.XPATH:
+            return {"using": "xpath", "value": value}
+        if by == By.ID:
+            value = f'[id="{value}"]'
+        elif by == By.NAME:
+            value = f'[name="{value}"]'
+        elif by == By.CLASS_NAME:
+            value = f".{value}"
+        elif by not in (By.CSS_SELECTOR, By.TAG_NAME):
+            raise ValueError(f"Локатор {by} не поддерживается в скриптах")
+        return {"using": "css", "value": value}
+
     def wait_for_url_contains(self, text, timeout=None):
         """Ожидание появления текста в URL"""
         wait = WebDriverWait(self.driver, timeout or self.timeout)
         return wait.until(EC.url_contains(text))
 
+    def wait_for_document_ready(self, timeout=None):
+        """Ожидание document.readyState == 'complete'"""
+        return self._wait_in_browser("document.readyState", timeout, document=True)
+
+    def wait_for_network_idle(self, timeout=None, idle_ms=None):
+        """Ожидание завершения всех fetch/XHR запросов страницы"""
+        return self._wait_in_browser("запросы fetch/XHR", timeout, network=True,
+                                     idle=idle_ms or config.WAIT_NETWORK_IDLE_MS)
+
+    def wait_for_dom_stable(self, timeout=None, quiet_ms=None):
+        """Ожидание, пока DOM перестанет меняться"""
+        return self._wait_in_browser("мутации DOM", timeout, dom=True,
+                                     quiet=quiet_ms or config.WAIT_DOM_QUIET_MS)
+
+    def wait_for_spinner_gone(self, locator=None, timeout=None):
+        """Ожидание исчезновения индикатора загрузки"""
+        locator = locator or self.SPINNER
+        return self._wait_in_browser("индикатор загрузки", timeout, spinner=locator[1])
+
+    @property
+    def page_load_strategy(self):
+        """Стратегия загрузки браузера: normal, eager или none (utils/page_load.py)"""
+        capabilities = getattr(self.driver, "capabilities", None) or {}
+        return capabilities.get("pageLoadStrategy", "normal")
+
+    def wait_for_new_document(self, timeout=None):
+        """
+        Ожидание документа, который открыл driver.get при стратегии none
+
+        Старый документ помечен window.__staleDocument (см. open). Ждём из
+        Python короткими execute_script: асинхронный скрипт в старом
+        документе оборвался бы его выгрузкой (JavascriptException), а
+        скрипт, попавший на момент смены документа, просто повторяется.
+        """
+        def new_document_ready(driver):
+            return driver.execute_script(
+                "return !window.__staleDocument && document.readyState !== 'loading';"
+            )
+
+        timeout = timeout or self.timeout
+        wait = WebDriverWait(self.driver, timeout, poll_frequency=0.1, ignored_exceptions=(JavascriptException,))
+        wait.until(new_document_ready, f"Не дождались загрузки нового документа за {timeout} с")
+        return self
+
+    def wait_for_page_ready(self, timeout=None):
+        """
+        Ожидание полной готовности страницы (все проверки за один вызов)
+
+        При стратегии eager/none достаточно DOMContentLoaded: картинки и
+        сторонние скрипты не ждём. По умолчанию ждёт не дольше
+        PAGE_READY_TIMEOUT и возвращает False вместо исключения: карусели и
+        сторонние виджеты могут держать сеть занятой, а упасть лучше на
+        ожидании конкретного элемента. Переход (редирект) во время ожидания
+        обрывает скрипт - это тоже False.
+        """
+        timeout = timeout or config.PAGE_READY_TIMEOUT
+        ready_state = "complete" if self.page_load_strategy == "normal" else "interactive"
+        try:
+            self._wait_in_browser(
+                "готовность страницы", timeout,
+                document=ready_state, network=True, dom=True, spinner=self.SPINNER[1],
+                idle=config.WAIT_NETWORK_IDLE_MS, quiet=config.WAIT_DOM_QUIET_MS
+            )
+            return True
+        except (TimeoutException, JavascriptException):
+            return False
+
+    def _wait_in_browser(self, description, timeout=None, **checks):
+        """Выполнить ожидание внутри браузера через execute_async_script"""
+        timeout = timeout or self.timeout
+        options = {
+            "timeout": int(timeout * 1000),
+            "document": False,
+            "network": False,
+            "dom": False,
+            "spinner": None,
+            "idle": 0,
+            "quiet": 0,
+        }
+        options.update(checks)
+
+        if not self.driver.execute_async_script(PAGE_READY_JS, options):
+            raise TimeoutException(f"Не дождались за {timeout} с: {description}")
+        return self
+
+    def mark_cart_touched(self):
+        """Отметить, что тест менял корзину в браузере (очистка после теста)"""
+        self.driver.cart_touched = True
+
     def take_screenshot(self, name):
-        """Сделать скриншот"""
-        screenshot_path = config.SCREENSHOTS_DIR / f"{name}.png"
-        self.driver.save_screenshot(str(screenshot_path))
-        return screenshot_path
+        """Сделать скриншот (файл записывается в фоне, возвращается его будущий путь)"""
+        screenshot = capture_screenshot(self.driver)
+        artifacts.submit(name, screenshot=screenshot)
+        return artifacts.screenshot_path(name, screenshot[1])
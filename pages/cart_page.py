@@ -1,5 +1,9 @@
+import time
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.select import Select
+from selenium.webdriver.support.ui import WebDriverWait
 from .base_page import BasePage
 from .order_page import OrderPage
 
@@ -22,47 +26,73 @@ class CartPage(BasePage):
     EMPTY_CART_MESSAGE = (By.CSS_SELECTOR, "[data-test='empty-cart'], .empty-cart")
     QUANTITY_INPUT = (By.CSS_SELECTOR, "input[data-test='quantity-input']")
     QUANTITY_SELECT = (By.CSS_SELECTOR, "select[data-test='quantity-select']")
+    CONFIRM_REMOVE_BUTTON = (By.CSS_SELECTOR, "[data-test='confirm-remove']")
+    CONFIRM_YES_BUTTON = (By.XPATH, "//button[normalize-space()='Да']")
 
     def __init__(self, driver):
         super().__init__(driver)
 
     def is_empty(self):
         """Проверить пуста ли корзина"""
-        return self.is_element_present(self.EMPTY_CART_MESSAGE) or \
-            len(self.find_elements(self.CART_ITEMS)) == 0
+        # Товары - основное содержимое страницы, а не необязательный элемент:
+        # ждём полный таймаут, пока не появятся они или сообщение о пустой корзине
+        try:
+            WebDriverWait(self.driver, self.timeout).until(EC.any_of(
+                EC.presence_of_element_located(self.CART_ITEMS),
+                EC.presence_of_element_located(self.EMPTY_CART_MESSAGE),
+            ))
+        except TimeoutException:
+            return True
+        return not self.driver.find_elements(*self.CART_ITEMS)
 
     def get_items_count(self):
         """Получить количество товаров в корзине"""
-        if self.is_empty():
-            return 0
-        return len(self.find_elements(self.CART_ITEMS))
+        return len(self._get_items())
 
     def get_total_price(self):
         """Получить общую сумму корзины"""
         if self.is_empty():
             return 0
 
-        total_text = self.get_text(self.CART_TOTAL)
+        # Текст суммы одним скриптом; если её ещё нет - ждём элемент как раньше
+        totals = self.query_all(self.CART_TOTAL, {'text': None})
+        total_text = totals[0]['text'] if totals else self.get_text(self.CART_TOTAL)
         import re
         numbers = re.findall(r'\d+', total_text.replace(' ', ''))
         return float(''.join(numbers)) if numbers else 0
 
     def get_item_details(self, index=0):
         """Получить детали товара по индексу"""
-        if self.is_empty():
+        items = self._get_items()
+        if not items:
             return {}
-
-        items = self.find_elements(self.CART_ITEMS)
         if index >= len(items):
             raise IndexError(f"Товар с индексом {index} не найден")
-
-        item = items[index]
-        return {
-            'name': item.find_element(*self.ITEM_NAME).text.strip(),
-            'price': self._extract_price(item.find_element(*self.ITEM_PRICE).text),
-            'quantity': item.find_element(*self.ITEM_QUANTITY).text.strip(),
-            'total': self._extract_price(item.find_element(*self.ITEM_TOTAL).text)
-        }
+        return items[index]
+
+    def get_all_items(self):
+        """Получить детали всех товаров корзины (один запрос к браузеру)"""
+        rows = self.query_all(self.CART_ITEMS, {
+            'name': self.ITEM_NAME,
+            'price': self.ITEM_PRICE,
+            'quantity': self.ITEM_QUANTITY,
+            'total': self.ITEM_TOTAL,
+        })
+        return [
+            {
+                'name': row['name'] or '',
+                'price': self._extract_price(row['price'] or ''),
+                'quantity': row['quantity'] or '',
+                'total': self._extract_price(row['total'] or '')
+            }
+            for row in rows
+        ]
+
+    def _get_items(self):
+        """Товары корзины: ожидание содержимого и данные строк одним запросом"""
+        if self.is_empty():
+            return []
+        return self.get_all_items()
 
     def _extract_price(self, price_text):
         """Извлечь цену из текста"""
@@ -80,29 +110,49 @@ class CartPage(BasePage):
             raise IndexError(f"Товар с индексом {index} не найден")
 
         item = items[index]
+        self.mark_cart_touched()
+        before = self.get_state()
 
-        # Пробуем найти поле ввода количества
-        try:
-            quantity_input = item.find_element(*self.QUANTITY_INPUT)
-            quantity_input.clear()
-            quantity_input.send_keys(str(quantity))
-        except:
+        with self.measure("update_quantity"):
+            # Пробуем найти поле ввода количества
             try:
-                quantity_select = item.find_element(*self.QUANTITY_SELECT)
-                select = Select(quantity_select)
-                select.select_by_value(str(quantity))
+                quantity_input = item.find_element(*self.QUANTITY_INPUT)
+                quantity_input.clear()
+                quantity_input.send_keys(str(quantity))
             except:
-                raise ValueError("Не удалось изменить количество товара")
-
-        # Ждем обновления
-        self.wait_for_update()
+                try:
+                    quantity_select = item.find_element(*self.QUANTITY_SELECT)
+                    select = Select(quantity_select)
+                    select.select_by_value(str(quantity))
+                except:
+                    raise ValueError("Не удалось изменить количество товара")
+
+            # Ждем обновления
+            self.wait_for_update(before)
         return self
 
-    def wait_for_update(self, timeout=5):
-        """Ожидание обновления корзины"""
-        # Можно добавить ожидание спиннера или другого индикатора загрузки
-        import time
-        time.sleep(1)  # Простая задержка для примера
+    def get_state(self):
+        """Число строк и текст суммы корзины - для wait_for_update"""
+        totals = self.query_all(self.CART_TOTAL, {'text': None})
+        return len(self.query_all(self.CART_ITEMS, {})), totals[0]['text'] if totals else None
+
+    def wait_for_update(self, before, timeout=5):
+        """
+        Ожидание пересчёта корзины
+
+        before - get_state() до действия. Ждём, пока изменится сумма или число
+        строк, затем исчезновения спиннера - всё в пределах одного таймаута.
+        Возвращает False, если корзина за это время не изменилась.
+        """
+        deadline = time.monotonic() + timeout
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=0.1).until(
+                lambda driver: self.get_state() != before
+            )
+            self.wait_for_spinner_gone(timeout=max(deadline - time.monotonic(), 0.1))
+            return True
+        except TimeoutException:
+            return False
 
     def remove_item(self, index=0):
         """Удалить товар из корзины"""
@@ -114,6 +164,7 @@ class CartPage(BasePage):
             raise IndexError(f"Товар с индексом {index} не найден")
 
         item = items[index]
+        self.mark_cart_touched()
         remove_btn = item.find_element(*self.REMOVE_BUTTON)
         remove_btn.click()
 
@@ -124,13 +175,9 @@ class CartPage(BasePage):
     def _confirm_removal(self):
         """Подтверждение удаления"""
         # Если есть диалог подтверждения
-        try:
-            confirm_btn = self.driver.find_element(
-                By.CSS_SELECTOR, "[data-test='confirm-remove'], button:contains('Да')"
-            )
-            confirm_btn.click()
-        except:
-            pass  # Нет диалога подтверждения
+        confirm_button = self.probe(self.CONFIRM_REMOVE_BUTTON, self.CONFIRM_YES_BUTTON)
+        if confirm_button:
+            self.click(confirm_button)
 
     def clear_cart(self):
         """Очистить корзину полностью"""
@@ -15,7 +15,9 @@ class MainPage(BasePage):
     CATALOG_BUTTON = (By.CSS_SELECTOR, "[data-test='catalog-button'], .catalog")
     USER_PROFILE = (By.CSS_SELECTOR, "[data-test='user-profile'], .profile")
     PRODUCT_CARDS = (By.CSS_SELECTOR, "[data-test='product-card'], .product-card")
+    PRODUCT_CARD_NAME = (By.CSS_SELECTOR, "[data-test='product-name'], .product-name")
     CATEGORIES = (By.CSS_SELECTOR, "[data-test='category'], .category")
+    CART_COUNTER = (By.CSS_SELECTOR, "[data-test='cart-counter'], .cart-counter")
 
     def __init__(self, driver):
         super().__init__(driver)
@@ -31,7 +33,9 @@ class MainPage(BasePage):
     def search_product(self, product_name):
         """Поиск товара"""
         self.input_text(self.SEARCH_INPUT, product_name)
-        self.click(self.SEARCH_BUTTON)
+        with self.measure("search_product"):
+            self.click(self.SEARCH_BUTTON)
+            self.wait_for_page_ready()
         # Возвращаем эту же страницу для проверки результатов
         return self
 
@@ -49,18 +53,12 @@ class MainPage(BasePage):
 
     def open_product_by_name(self, product_name):
         """Открыть товар по названию"""
-        products = self.find_elements(self.PRODUCT_CARDS)
+        # Названия всех карточек - одним запросом к браузеру
+        products = self.query_all(self.PRODUCT_CARDS, {"name": self.PRODUCT_CARD_NAME}, timeout=self.timeout)
         for product in products:
-            try:
-                # Пытаемся найти название товара в карточке
-                name_element = product.find_element(
-                    By.CSS_SELECTOR, "[data-test='product-name'], .product-name"
-                )
-                if product_name.lower() in name_element.text.lower():
-                    product.click()
-                    return ProductPage(self.driver)
-            except:
-                continue
+            if product["name"] and product_name.lower() in product["name"].lower():
+                product["_element"].click()
+                return ProductPage(self.driver)
         raise ValueError(f"Товар '{product_name}' не найден")
 
     def open_cart(self):
@@ -84,10 +82,9 @@ class MainPage(BasePage):
 
     def get_cart_items_count(self):
         """Получить количество товаров в корзине (из счетчика)"""
+        if not self.probe(self.CART_COUNTER):
+            return 0
         try:
-            cart_counter = self.driver.find_element(
-                By.CSS_SELECTOR, "[data-test='cart-counter'], .cart-counter"
-            )
-            return int(cart_counter.text)
-        except:
+            return int(self.get_text(self.CART_COUNTER))
+        except ValueError:
             return 0
@@ -1,6 +1,7 @@
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.select import Select
 from .base_page import BasePage
+from config.config import config
 
 
 class OrderPage(BasePage):
@@ -29,43 +30,59 @@ class OrderPage(BasePage):
     SUCCESS_MESSAGE = (By.CSS_SELECTOR, "[data-test='success-message'], .success-message")
     ERROR_MESSAGE = (By.CSS_SELECTOR, "[data-test='error-message'], .error-message")
     VALIDATION_ERROR = (By.CSS_SELECTOR, "[data-test='validation-error'], .error")
+    ALL_ERRORS = (By.CSS_SELECTOR, f"{ERROR_MESSAGE[1]}, {VALIDATION_ERROR[1]}")
+
+    # Поля формы по ключам order_data
+    FORM_FIELDS = {
+        'name': NAME_INPUT,
+        'phone': PHONE_INPUT,
+        'email': EMAIL_INPUT,
+        'address': ADDRESS_INPUT,
+        'city': CITY_SELECT,
+        'delivery': DELIVERY_METHOD,
+        'payment': PAYMENT_METHOD,
+        'comment': COMMENT_INPUT,
+    }
+    TEXT_FIELDS = ('name', 'phone', 'email', 'address', 'comment')
+
+    # Поля, которые вводятся посимвольно даже в быстром режиме
+    # (маска телефона реагирует на нажатия клавиш, а не на событие input)
+    KEYSTROKE_FIELDS = ('phone',)
 
     def __init__(self, driver):
         super().__init__(driver)
 
-    def fill_personal_info(self, name, phone, email):
+    def fill_personal_info(self, name, phone, email, fast=None):
         """Заполнить персональную информацию"""
-        self.input_text(self.NAME_INPUT, name)
-        self.input_text(self.PHONE_INPUT, phone)
-        self.input_text(self.EMAIL_INPUT, email)
-        return self
+        return self.fill_all_required_fields({'name': name, 'phone': phone, 'email': email}, fast=fast)
 
     def fill_address(self, address, city=None):
         """Заполнить адрес"""
         self.input_text(self.ADDRESS_INPUT, address)
-        if city and self.is_element_present(self.CITY_SELECT):
+        if city and self.probe(self.CITY_SELECT):
             select = Select(self.find_element(self.CITY_SELECT))
             select.select_by_visible_text(city)
         return self
 
     def select_delivery_method(self, method="courier"):
         """Выбрать способ доставки"""
-        delivery_methods = self.find_elements(self.DELIVERY_METHOD)
-        for dm in delivery_methods:
-            if method in dm.get_attribute("value") or method in dm.get_attribute("id"):
-                dm.click()
-                break
+        if self.fill_form_js({'delivery': (self.DELIVERY_METHOD, method)}):
+            self._select_radio(self.DELIVERY_METHOD, method)
         return self
 
     def select_payment_method(self, method="card"):
         """Выбрать способ оплаты"""
-        payment_methods = self.find_elements(self.PAYMENT_METHOD)
-        for pm in payment_methods:
-            if method in pm.get_attribute("value") or method in pm.get_attribute("id"):
-                pm.click()
-                break
+        if self.fill_form_js({'payment': (self.PAYMENT_METHOD, method)}):
+            self._select_radio(self.PAYMENT_METHOD, method)
         return self
 
+    def _select_radio(self, locator, method):
+        """Выбрать radio через WebDriver (ждёт появления вариантов)"""
+        for radio in self.find_elements(locator):
+            if method in radio.get_attribute("value") or method in radio.get_attribute("id"):
+                radio.click()
+                break
+
     def add_comment(self, comment):
         """Добавить комментарий к заказу"""
         self.input_text(self.COMMENT_INPUT, comment)
@@ -73,18 +90,21 @@ class OrderPage(BasePage):
 
     def submit_order(self):
         """Отправить заказ"""
-        self.click(self.SUBMIT_ORDER_BUTTON)
+        self.mark_cart_touched()
+        with self.measure("submit_order"):
+            self.click(self.SUBMIT_ORDER_BUTTON)
+            self.wait_for_page_ready()
         return self
 
     def get_order_summary(self):
         """Получить сводку заказа"""
-        if self.is_element_present(self.ORDER_SUMMARY):
+        if self.probe(self.ORDER_SUMMARY):
             return self.get_text(self.ORDER_SUMMARY)
         return ""
 
     def get_order_total(self):
         """Получить итоговую сумму заказа"""
-        if self.is_element_present(self.ORDER_TOTAL):
+        if self.probe(self.ORDER_TOTAL):
             total_text = self.get_text(self.ORDER_TOTAL)
             import re
             numbers = re.findall(r'\d+', total_text.replace(' ', ''))
@@ -103,21 +123,12 @@ class OrderPage(BasePage):
 
     def has_errors(self):
         """Проверить наличие ошибок"""
-        return self.is_element_present(self.ERROR_MESSAGE) or \
-            len(self.find_elements(self.VALIDATION_ERROR)) > 0
+        return self.probe(self.ERROR_MESSAGE, self.VALIDATION_ERROR) is not None
 
     def get_errors(self):
-        """Получить список ошибок"""
-        errors = []
-
-        if self.is_element_present(self.ERROR_MESSAGE):
-            errors.append(self.get_text(self.ERROR_MESSAGE))
-
-        validation_errors = self.find_elements(self.VALIDATION_ERROR)
-        for error in validation_errors:
-            errors.append(error.text.strip())
-
-        return errors
+        """Получить список ошибок (общие и валидации - одним запросом)"""
+        rows = self.query_all(self.ALL_ERRORS, {"text": None})
+        return [row["text"] for row in rows if row["text"]]
 
     def back_to_cart(self):
         """Вернуться в корзину"""
@@ -125,8 +136,51 @@ class OrderPage(BasePage):
         from .cart_page import CartPage
         return CartPage(self.driver)
 
-    def fill_all_required_fields(self, order_data):
-        """Заполнить все обязательные поля"""
+    def fill_all_required_fields(self, order_data, fast=None):
+        """
+        Заполнить все обязательные поля
+
+        В быстром режиме (FAST_FORM_FILL) все поля ставятся одним скриптом,
+        посимвольно вводятся только KEYSTROKE_FIELDS и текстовые поля, которые
+        скрипт не смог заполнить; город, доставка и оплата в этом случае
+        выбираются обычным способом.
+        """
+        fast = config.FAST_FORM_FILL if fast is None else fast
+        if not fast:
+            return self._type_all_fields(order_data)
+
+        batch = {
+            name: (locator, order_data[name])
+            for name, locator in self.FORM_FIELDS.items()
+            if name in order_data and name not in self.KEYSTROKE_FIELDS
+        }
+
+        # Ждём появления формы один раз, дальше - один вызов на все поля
+        failed = []
+        if batch:
+            first_locator = next(iter(batch.values()))[0]
+            self.find_element(first_locator)
+            failed = self.fill_form_js(batch)
+
+        for name in self.TEXT_FIELDS:
+            if name in order_data and (name in self.KEYSTROKE_FIELDS or name in failed):
+                self.input_text(self.FORM_FIELDS[name], order_data[name])
+
+        # Город не выбран скриптом - выбираем через Select (ошибка, если города нет)
+        if 'city' in failed:
+            select = Select(self.find_element(self.CITY_SELECT))
+            select.select_by_visible_text(order_data['city'])
+
+        # Способ доставки/оплаты не найден скриптом - пробуем с ожиданием
+        if 'delivery' in failed:
+            self._select_radio(self.DELIVERY_METHOD, order_data['delivery'])
+        if 'payment' in failed:
+            self._select_radio(self.PAYMENT_METHOD, order_data['payment'])
+
+        return self
+
+    def _type_all_fields(self, order_data):
+        """Заполнить поля посимвольным вводом"""
         # Персональные данные
         if 'name' in order_data:
             self.input_text(self.NAME_INPUT, order_data['name'])
@@ -138,15 +192,15 @@ class OrderPage(BasePage):
         # Адрес
         if 'address' in order_data:
             self.input_text(self.ADDRESS_INPUT, order_data['address'])
-        if 'city' in order_data and self.is_element_present(self.CITY_SELECT):
+        if 'city' in order_data and self.probe(self.CITY_SELECT):
             select = Select(self.find_element(self.CITY_SELECT))
             select.select_by_visible_text(order_data['city'])
 
         # Доставка и оплата
         if 'delivery' in order_data:
-            self.select_delivery_method(order_data['delivery'])
+            self._select_radio(self.DELIVERY_METHOD, order_data['delivery'])
         if 'payment' in order_data:
-            self.select_payment_method(order_data['payment'])
+            self._select_radio(self.PAYMENT_METHOD, order_data['payment'])
 
         # Комментарий
         if 'comment' in order_data:
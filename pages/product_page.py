@@ -38,22 +38,27 @@ class ProductPage(BasePage):
     def add_to_cart(self, quantity=1):
         """Добавить товар в корзину"""
         # Устанавливаем количество если есть поле
-        if self.is_element_present(self.QUANTITY_INPUT):
+        quantity_control = self.probe(self.QUANTITY_INPUT, self.QUANTITY_SELECT)
+        if quantity_control == self.QUANTITY_INPUT:
             self.input_text(self.QUANTITY_INPUT, str(quantity))
-        elif self.is_element_present(self.QUANTITY_SELECT):
+        elif quantity_control == self.QUANTITY_SELECT:
             select = Select(self.find_element(self.QUANTITY_SELECT))
             select.select_by_value(str(quantity))
 
         # Добавляем в корзину
-        self.click(self.ADD_TO_CART_BUTTON)
+        self.mark_cart_touched()
+        with self.measure("add_to_cart"):
+            self.click(self.ADD_TO_CART_BUTTON)
+            # Проверяем сообщение об успехе
+            added = self.is_element_present(self.SUCCESS_MESSAGE, timeout=5)
 
-        # Проверяем сообщение об успехе
-        if self.is_element_present(self.SUCCESS_MESSAGE, timeout=5):
+        if added:
             return self.get_text(self.SUCCESS_MESSAGE)
         return "Товар добавлен в корзину"
 
     def buy_now(self):
         """Купить сейчас (переход к оформлению)"""
+        self.mark_cart_touched()
         self.click(self.BUY_NOW_BUTTON)
         # Возвращаем CartPage или OrderPage в зависимости от реализации
         return CartPage(self.driver)
@@ -66,7 +71,7 @@ class ProductPage(BasePage):
 
     def get_characteristics(self):
         """Получить характеристики товара"""
-        if self.is_element_present(self.CHARACTERISTICS):
+        if self.probe(self.CHARACTERISTICS):
             chars_text = self.get_text(self.CHARACTERISTICS)
             # Парсим характеристики в словарь
             characteristics = {}
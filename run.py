@@ -1,11 +1,23 @@
 import sys
+import os
+import shutil
 import subprocess
 import argparse
+from config.config import config
+from utils.sharding import make_shards, merge_worker_durations
 
 
-def run_tests(mode="all", html=False, allure=False):
-    """Запуск тестов"""
+def mode_args(mode="all"):
+    """Аргументы pytest для выбора тестов"""
+    if mode == "ui":
+        return ["-m", "ui"]
+    elif mode == "api":
+        return ["-m", "api"]
+    return []
+
 
+def build_pytest_args(mode="all"):
+    """Базовые аргументы pytest для выбранного режима"""
     pytest_args = [
         "pytest",
         "-v",
@@ -15,37 +27,177 @@ def run_tests(mode="all", html=False, allure=False):
     ]
 
     # Выбираем тесты
-    if mode == "ui":
-        pytest_args.extend(["-m", "ui"])
-    elif mode == "api":
-        pytest_args.extend(["-m", "api"])
-    elif mode == "all":
-        pass
+    pytest_args.extend(mode_args(mode))
+    return pytest_args
+
+
+def run_tests(mode="all", html=False, allure=False):
+    """Запуск тестов"""
+
+    pytest_args = build_pytest_args(mode)
 
     # HTML отчет
     if html:
         pytest_args.extend([
-            f"--html=reports/report.html",
+            f"--html={config.REPORTS_DIR}/report.html",
             "--self-contained-html"
         ])
 
     # Allure отчет
     if allure:
         pytest_args.extend([
-            f"--alluredir={config.config.REPORTS_DIR}/allure-results"
+            f"--alluredir={config.REPORTS_DIR}/allure-results"
         ])
 
     print(f"Запуск тестов в режиме: {mode}")
     print(f"Команда: {' '.join(pytest_args)}")
 
-    return subprocess.call(pytest_args)
+    code = subprocess.call(pytest_args)
+    merge_worker_durations()
+    return code
+
+
+def collect_tests(mode="all"):
+    """Собрать nodeid тестов без запуска"""
+    args = ["pytest", "--collect-only", "-q"] + mode_args(mode)
+    output = subprocess.run(args, capture_output=True, text=True).stdout
+    return [line.strip() for line in output.splitlines() if "::" in line]
+
+
+def run_parallel(mode="all", workers=2, html=False, allure=False):
+    """
+    Параллельный запуск тестов в N процессах
+
+    Тесты делятся на шарды по историческим длительностям. Каждый воркер -
+    отдельный процесс pytest со своим браузером и своей API-сессией (а значит
+    и своей корзиной). Отчёты воркеров сливаются в конце.
+    """
+    nodeids = collect_tests(mode)
+    if not nodeids:
+        print("Тесты не найдены")
+        return 5
+
+    shards = make_shards(nodeids, workers)
+    workers_dir = config.REPORTS_DIR / "workers"
+    shutil.rmtree(workers_dir, ignore_errors=True)
+
+    print(f"Запуск {len(nodeids)} тестов в {len(shards)} воркерах (режим: {mode})")
+
+    processes = []
+    for index, shard in enumerate(shards, start=1):
+        worker = f"w{index}"
+        worker_dir = workers_dir / worker
+        worker_dir.mkdir(parents=True)
+
+        shard_file = worker_dir / "shard.txt"
+        shard_file.write_text("\n".join(shard), encoding="utf-8")
+
+        pytest_args = build_pytest_args(mode) + [f"--junitxml={worker_dir}/junit.xml"]
+        if html:
+            pytest_args.extend([f"--html={worker_dir}/report.html", "--self-contained-html"])
+        if allure:
+            pytest_args.append(f"--alluredir={worker_dir}/allure-results")
+
+        env = dict(os.environ, TEST_WORKER_ID=worker, TEST_WORKERS=str(len(shards)), TEST_SHARD_FILE=str(shard_file))
+        log = open(worker_dir / "output.log", "w", encoding="utf-8")
+        processes.append((worker, len(shard), log, subprocess.Popen(
+            pytest_args, env=env, stdout=log, stderr=subprocess.STDOUT
+        )))
+
+    exit_code = 0
+    for worker, count, log, process in processes:
+        code = process.wait()
+        log.close()
+        print(f"Воркер {worker}: {count} тестов, код возврата {code}")
+        exit_code = exit_code or code
+
+    merge_worker_durations()
+    if allure:
+        merge_allure_results(workers_dir, config.REPORTS_DIR / "allure-results")
+    if html:
+        merge_html_reports(workers_dir, config.REPORTS_DIR / "report.html")
+
+    return exit_code
+
+
+def run_load(scenario, users, rate, duration, ramp_up):
+    """Нагрузочный прогон API (см. utils/load.py)"""
+    from utils.load import LoadRunner, print_report, save_report
+
+    print(f"Нагрузка: сценарий {scenario}, {users} пользователей, {rate} итераций/с, "
+          f"{duration} с (ramp-up {ramp_up} с)")
+    report = LoadRunner(scenario, users, rate, duration, ramp_up).run()
+    print_report(report)
+    print(f"Отчёт: {save_report(report)}")
+    return 1 if report["requests"]["errors"] else 0
+
+
+def merge_allure_results(workers_dir, target_dir):
+    """Слить результаты Allure воркеров (имена файлов уникальны - uuid)"""
+    target_dir.mkdir(parents=True, exist_ok=True)
+    for source_dir in workers_dir.glob("*/allure-results"):
+        for result_file in source_dir.iterdir():
+            shutil.copy2(result_file, target_dir / result_file.name)
+    print(f"Allure результаты: {target_dir}")
+
+
+def merge_html_reports(workers_dir, target_file):
+    """
+    Сводная HTML-таблица по JUnit XML всех воркеров
+
+    Это не слитый отчёт pytest-html: в таблице статус и время каждого теста
+    и ссылка на полный report.html воркера, где лежат детали падения.
+    """
+    import xml.etree.ElementTree as ET
+    from html import escape
+
+    rows = []
+    totals = {"passed": 0, "failed": 0, "skipped": 0}
+
+    for junit_file in sorted(workers_dir.glob("*/junit.xml")):
+        worker = junit_file.parent.name
+        for case in ET.parse(junit_file).getroot().iter("testcase"):
+            if case.find("failure") is not None or case.find("error") is not None:
+                status = "failed"
+            elif case.find("skipped") is not None:
+                status = "skipped"
+            else:
+                status = "passed"
+            totals[status] += 1
+            rows.append(
+                f"<tr class='{status}'><td>{escape(case.get('classname', ''))}::{escape(case.get('name', ''))}</td>"
+                f"<td>{status}</td><td>{float(case.get('time', 0)):.2f}</td>"
+                f"<td><a href='workers/{worker}/report.html'>{worker}</a></td></tr>"
+            )
+
+    header = (
+        "<html><head><meta charset='utf-8'><title>Отчёт о тестировании</title>"
+        "<style>.passed{color:green}.failed{color:red}.skipped{color:gray}</style></head><body>"
+        f"<h1>Отчёт о тестировании</h1><p>Пройдено: {totals['passed']}, "
+        f"упало: {totals['failed']}, пропущено: {totals['skipped']}</p>"
+        "<table border='1'><tr><th>Тест</th><th>Статус</th><th>Время, с</th><th>Воркер</th></tr>"
+    )
+    target_file.write_text(header + "".join(rows) + "</table></body></html>", encoding="utf-8")
+    print(f"Сводная HTML-таблица (детали - в отчётах воркеров): {target_file}")
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
-    parser.add_argument("mode", nargs="?", choices=["ui", "api", "all"], default="all")
+    parser.add_argument("mode", nargs="?", choices=["ui", "api", "all", "load"], default="all")
     parser.add_argument("--html", action="store_true")
     parser.add_argument("--allure", action="store_true")
+    parser.add_argument("--workers", type=int, default=1, help="Количество параллельных воркеров")
+
+    # Нагрузочный режим (python run.py load ...)
+    parser.add_argument("--scenario", default="add_to_cart", help="Сценарий: browse, add_to_cart, cart_cycle")
+    parser.add_argument("--users", type=int, default=10, help="Количество виртуальных пользователей")
+    parser.add_argument("--rate", type=float, default=5.0, help="Новых итераций сценария в секунду")
+    parser.add_argument("--duration", type=float, default=30.0, help="Длительность нагрузки, с")
+    parser.add_argument("--ramp-up", type=float, default=0.0, help="Время выхода на заданную интенсивность, с")
 
     args = parser.parse_args()
-    sys.exit(run_tests(args.mode, args.html, args.allure))
\ No newline at end of file
+    if args.mode == "load":
+        sys.exit(run_load(args.scenario, args.users, args.rate, args.duration, args.ramp_up))
+    if args.workers > 1:
+        sys.exit(run_parallel(args.mode, args.workers, args.html, args.allure))
+    sys.exit(run_tests(args.mode, args.html, args.allure))
@@ -1,18 +1,170 @@
+"""
+Фикстуры и хуки тестов
+
+Selenium, пул браузеров и локальный стенд импортируются внутри фикстур:
+прогон pytest -m api (или --api-only) не загружает браузерные модули и
+не собирает test_ui*.py.
+"""
+import os
+import json
 import pytest
 import allure
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service as ChromeService
-from selenium.webdriver.firefox.service import Service as FirefoxService
-from webdriver_manager.chrome import ChromeDriverManager
-from webdriver_manager.firefox import GeckoDriverManager
+from pathlib import Path
 from utils.api_client import ApiClient
+from utils.artifacts import artifacts, capture_console_log, capture_screenshot, format_console_log
+from utils.cache import ResponseCache
+from utils.cart_cleanup import CartCleaner, browser_cookies
+from utils.cassette import Cassette
+from utils.command_profiler import webdriver_commands
+from utils.locator_cache import locator_cache
+from utils.metrics import api_metrics
+from utils.network_profiles import apply_profile, parse_profiles
+from utils.page_perf import SUMMARY_METRICS, page_perf
+from utils.polling import wait_timings
+from utils.sharding import save_worker_durations, worker_id
+from utils.ui_state import UiState
 from config.config import config
 
 
+def pytest_addoption(parser):
+    parser.addoption(
+        "--local-shop", action="store_true", default=config.LOCAL_SHOP,
+        help="запускать тесты на локальном стенде магазина (tests/local_shop.py)"
+    )
+    parser.addoption("--ui-only", action="store_true", help="только UI тесты (то же, что -m ui)")
+    parser.addoption("--api-only", action="store_true", help="только API тесты (то же, что -m api)")
+    parser.addoption(
+        "--page-load-profile", default=config.PAGE_LOAD_PROFILE,
+        help="профиль загрузки страниц: full, functional (без счётчиков и чатов), fast (ещё и без картинок)"
+    )
+    parser.addoption(
+        "--network-profile", default=config.NETWORK_PROFILE,
+        help="сетевые профили UI тестов через запятую: lan, 3g, slow-4g, high-latency, offline-after-load"
+    )
+
+
+def pytest_configure(config):
+    """--ui-only и --api-only задают выражение маркеров, --page-load-profile - профиль браузеров"""
+    if config.getoption("--api-only"):
+        config.option.markexpr = "api"
+    elif config.getoption("--ui-only"):
+        config.option.markexpr = "ui"
+
+    from config.config import config as settings
+    from utils.page_load import PAGE_LOAD_PROFILES
+    profile = config.getoption("--page-load-profile").lower()
+    if profile not in PAGE_LOAD_PROFILES:
+        raise pytest.UsageError(f"Неизвестный профиль загрузки: {profile} (есть: {', '.join(PAGE_LOAD_PROFILES)})")
+    settings.PAGE_LOAD_PROFILE = profile
+
+
+def pytest_generate_tests(metafunc):
+    """
+    Матрица сетевых профилей для тестов с драйвером
+
+    Профили берутся из маркера network_profile теста, иначе из
+    --network-profile. Без профилей тест не параметризуется.
+    """
+    if "network_profile" not in metafunc.fixturenames:
+        return
+    marker = metafunc.definition.get_closest_marker("network_profile")
+    names = parse_profiles(",".join(marker.args) if marker else metafunc.config.getoption("--network-profile"))
+    if names:
+        metafunc.parametrize("network_profile", names, indirect=True, ids=[f"net-{name}" for name in names])
+
+
+def pytest_ignore_collect(collection_path, config):
+    """
+    В API-прогоне не импортируем модули UI тестов
+
+    Все тесты test_ui*.py помечены ui, так что -m api их всё равно отберёт,
+    но импорт модуля тянет за собой Selenium и page objects.
+    """
+    if config.option.markexpr.strip() == "api" and collection_path.match("test_ui*.py"):
+        return True
+    return None
+
+
+@pytest.fixture(scope="session", autouse=True)
+def local_shop(request):
+    """Локальный стенд магазина на свободном порту (--local-shop), иначе None"""
+    if not request.config.getoption("--local-shop"):
+        yield None
+        return
+
+    from tests.local_shop import LocalShop
+    shop = LocalShop().start()
+    original_urls = config.BASE_URL, config.API_BASE_URL
+    config.BASE_URL, config.API_BASE_URL = shop.url, shop.api_url
+    yield shop
+    config.BASE_URL, config.API_BASE_URL = original_urls
+    shop.stop()
+
+
 @pytest.fixture
-def api_client():
+def cassette(request):
+    """Кассета теста в режимах record/replay (API_MODE), в режиме live - None"""
+    if config.API_MODE == "live":
+        yield None
+        return
+    test_cassette = Cassette.for_test(request.node)
+    yield test_cassette
+    test_cassette.save()
+
+
+# Ключ кэша каталога сессии в config.stash (для итогов в терминале)
+api_cache_key = pytest.StashKey()
+
+
+@pytest.fixture(scope="session")
+def api_cache(request):
+    """
+    Кэш ответов каталога на сессию
+
+    Выключен с API_CACHE=false и в режимах record/replay: кассета теста
+    должна содержать все его запросы.
+    """
+    if not config.API_CACHE or config.API_MODE != "live":
+        yield None
+        return
+    cache = ResponseCache()
+    request.config.stash[api_cache_key] = cache
+    yield cache
+    cache.save()
+
+
+# Ключ очереди очистки корзин в config.stash (для итогов в терминале)
+cart_cleaner_key = pytest.StashKey()
+
+
+@pytest.fixture(scope="session")
+def cart_cleaner(request, local_shop):
+    """
+    Очередь очистки корзин, изменённых тестами (utils/cart_cleanup.py)
+
+    В режиме replay сети нет - очищать нечего. Зависит от local_shop, чтобы
+    последняя пачка ушла на стенд до его остановки.
+    """
+    if config.API_MODE == "replay":
+        yield None
+        return
+    cleaner = CartCleaner()
+    request.config.stash[cart_cleaner_key] = cleaner
+    yield cleaner
+    cleaner.flush()
+
+
+@pytest.fixture
+def api_client(request, cassette, api_cache, cart_cleaner):
     """Фикстура для API клиента"""
-    return ApiClient()
+    cache = None if request.node.get_closest_marker("no_api_cache") else api_cache
+    client = ApiClient(cassette=cassette, cache=cache)
+
+    yield client
+
+    # Очищаем корзину, только если тест её менял
+    if cart_cleaner and client.cart_touched:
+        cart_cleaner.schedule(request.node.nodeid, client.session.cookies.copy())
 
 
 @pytest.fixture
@@ -21,44 +173,103 @@ def auth_api_client():
     return ApiClient(api_token=config.API_TOKEN)
 
 
+@pytest.fixture(scope="session")
+def driver_pool():
+    """Пул прогретых браузеров на сессию (на воркер)"""
+    from utils.driver_factory import DriverPool
+    pool = DriverPool()
+
+    yield pool
+
+    # Закрываем браузеры после всех тестов
+    pool.close()
+
+
+@pytest.fixture
+def network_profile(request):
+    """Сетевой профиль теста (см. pytest_generate_tests), None - без эмуляции"""
+    profile = getattr(request, "param", None)
+    if profile and profile != "lan" and config.BROWSER != "chrome":
+        pytest.skip(f"Сетевой профиль {profile} доступен только в Chrome")
+    return profile
+
+
+# Начало замеров команд WebDriver и страниц теста в item.stash (см. driver)
+driver_marks_key = pytest.StashKey()
+
+
 @pytest.fixture(scope="function")
-def driver():
+def driver(request, driver_pool, cart_cleaner, network_profile):
     """Фикстура для веб-драйвера"""
-    browser = config.BROWSER
-    driver = None
+    from selenium.common.exceptions import WebDriverException
+    driver = driver_pool.acquire()
+    if network_profile:
+        apply_profile(driver, network_profile)
+        allure.dynamic.parameter("network_profile", network_profile)
+    mark = webdriver_commands.mark()
+    perf_mark = page_perf.mark()
+    request.node.stash[driver_marks_key] = mark, perf_mark
 
-    if browser == "chrome":
-        options = webdriver.ChromeOptions()
-        if config.HEADLESS:
-            options.add_argument("--headless")
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-        options.add_argument("--disable-gpu")
-        options.add_argument("--window-size=1920,1080")
+    yield driver
 
-        service = ChromeService(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=options)
+    commands = webdriver_commands.since(mark)
+    if commands:
+        allure.attach(
+            json.dumps(webdriver_commands.summary(commands), ensure_ascii=False, indent=2),
+            name="Команды WebDriver",
+            attachment_type=allure.attachment_type.JSON
+        )
+    pages = page_perf.since(perf_mark)
+    if pages:
+        allure.attach(
+            json.dumps(pages, ensure_ascii=False, indent=2),
+            name="Загрузка страниц",
+            attachment_type=allure.attachment_type.JSON
+        )
 
-    elif browser == "firefox":
-        options = webdriver.FirefoxOptions()
-        if config.HEADLESS:
-            options.add_argument("--headless")
+    # Cookies корзины нужно забрать до сброса браузера
+    if cart_cleaner and driver.cart_touched:
+        try:
+            cart_cleaner.schedule(request.node.nodeid, browser_cookies(driver))
+        except WebDriverException as e:
+            cart_cleaner.failures.append((request.node.nodeid, f"Не удалось получить cookies браузера: {e.msg}"))
 
-        service = FirefoxService(GeckoDriverManager().install())
-        driver = webdriver.Firefox(service=service, options=options)
+    # Сбрасываем состояние и возвращаем браузер в пул
+    driver_pool.release(driver)
 
-    else:
-        raise ValueError(f"Unsupported browser: {browser}")
 
-    # Настройки драйвера
-    driver.implicitly_wait(config.IMPLICIT_WAIT)
-    driver.set_page_load_timeout(30)
+def page_budget_violations(item):
+    """Превышения бюджетов страниц (PAGE_PERF_BUDGETS_FILE) и маркера webdriver_budget"""
+    if driver_marks_key not in item.stash:
+        return []
+    mark, perf_mark = item.stash[driver_marks_key]
 
-    yield driver
+    violations = page_perf.violations(page_perf.since(perf_mark))
+    marker = item.get_closest_marker("webdriver_budget")
+    if marker:
+        commands = webdriver_commands.since(mark)
+        budget = marker.kwargs.get("max_commands", marker.args[0] if marker.args else None)
+        if not isinstance(budget, int):
+            raise pytest.UsageError(f"{item.nodeid}: webdriver_budget требует max_commands (целое число)")
+        if len(commands) > budget:
+            top = ", ".join(
+                f"{caller}: {entry['count']}"
+                for caller, entry in list(webdriver_commands.summary(commands).items())[:5]
+            )
+            violations.append(f"команды WebDriver: {len(commands)} > {budget} ({top})")
+    return violations
 
-    # Закрываем браузер после теста
-    if driver:
-        driver.quit()
+
+@pytest.fixture
+def ui_state(request, driver, cart_cleaner):
+    """Корзина и оформление заказа, подготовленные через API (utils/ui_state.py)"""
+    state = UiState(driver)
+    yield state
+
+    # Корзина не дошла до браузера (fill_cart упал) - очищаем её по cookies API-сессии
+    if cart_cleaner and state.client.cart_touched:
+        cart_cleaner.schedule(request.node.nodeid, state.client.session.cookies.copy())
+    state.close()
 
 
 @pytest.fixture
@@ -91,33 +302,214 @@ def order_page(driver):
     return OrderPage(driver)
 
 
+# Начало замера API-запросов теста в item.stash (см. api_timings)
+api_timings_key = pytest.StashKey()
+
+
 @pytest.fixture(autouse=True)
-def cleanup_cart(api_client):
-    """Автоматически очищаем корзину после каждого теста"""
+def api_timings(request):
+    """Тайминги API-запросов теста: вложение в Allure (perf_budget проверяется в pytest_runtest_makereport)"""
+    mark = api_metrics.mark()
+    request.node.stash[api_timings_key] = mark
     yield
-    try:
-        api_client.clear_cart()
-    except:
-        pass  # Игнорируем ошибки при очистке
+    samples = api_metrics.since(mark)
+    if not samples:
+        return
+
+    allure.attach(
+        json.dumps(api_metrics.summary(samples), ensure_ascii=False, indent=2),
+        name="Тайминги API",
+        attachment_type=allure.attachment_type.JSON
+    )
+
+
+def api_budget_violations(item):
+    """Превышения маркеров perf_budget("/cart", 500) или perf_budget("/cart", p95_ms=500) запросами теста"""
+    markers = list(item.iter_markers("perf_budget"))
+    if not markers or api_timings_key not in item.stash:
+        return []
+
+    violations = []
+    stats = api_metrics.stats(api_metrics.since(item.stash[api_timings_key]))
+    for marker in markers:
+        endpoint = marker.kwargs.get("endpoint", marker.args[0] if marker.args else None)
+        budget_ms = marker.kwargs.get("p95_ms", marker.args[1] if len(marker.args) > 1 else None)
+        if endpoint is None or budget_ms is None:
+            raise pytest.UsageError(f"{item.nodeid}: perf_budget требует endpoint и p95_ms")
+        for key, endpoint_stats in stats.items():
+            # Эндпоинт указывается как "/cart" (любой метод) или "GET /cart"
+            if endpoint not in (key, key.split(" ", 1)[1]):
+                continue
+            p95_ms = endpoint_stats.percentile(95) * 1000
+            if p95_ms > budget_ms:
+                violations.append(f"{key}: p95 {p95_ms:.0f} мс > {budget_ms} мс")
+    return violations
+
+
+# Длительности тестов текущего прогона (для балансировки шардов)
+_test_durations = {}
+
+# Сколько самых "разговорчивых" методов page objects показывать в итогах
+WEBDRIVER_SUMMARY_TOP = 15
+
+
+def pytest_collection_modifyitems(config, items):
+    """Оставляем только тесты своего шарда при параллельном запуске (run.py --workers)"""
+    shard_file = os.getenv("TEST_SHARD_FILE")
+    if not shard_file:
+        return
+
+    shard = set(Path(shard_file).read_text(encoding="utf-8").splitlines())
+    selected = [item for item in items if item.nodeid in shard]
+    deselected = [item for item in items if item.nodeid not in shard]
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = selected
+
+
+def pytest_runtest_logreport(report):
+    """Суммируем setup + call + teardown каждого теста"""
+    _test_durations[report.nodeid] = _test_durations.get(report.nodeid, 0) + report.duration
+
+
+def pytest_sessionfinish(session):
+    """Сохраняем длительности воркера и выученные локаторы, дописываем артефакты"""
+    if _test_durations:
+        save_worker_durations(_test_durations)
+    if api_metrics.samples:
+        api_metrics.save(config.REPORTS_DIR / "api_timings" / f"{worker_id()}.json")
+    if webdriver_commands.samples:
+        webdriver_commands.save(config.REPORTS_DIR / "webdriver_commands" / f"{worker_id()}.json")
+    if page_perf.samples:
+        page_perf.save_trend()
+    locator_cache.save()
+    artifacts.close()
+
+
+def pytest_terminal_summary(terminalreporter):
+    """Тайминги API, команд WebDriver, страниц и ожиданий, кэш каталога, ошибки очистки корзин и неработающие альтернативы локаторов"""
+    if api_metrics.samples:
+        terminalreporter.section("Тайминги API (total / ttfb, мс)")
+        summary = api_metrics.summary()
+        for key, phases in sorted(summary.items()):
+            total, ttfb = phases["total"], phases["ttfb"]
+            terminalreporter.write_line(
+                f"{key:<28} n={total['count']:<5} p50={total['p50_ms']:<8} p95={total['p95_ms']:<8} "
+                f"p99={total['p99_ms']:<8} ttfb p95={ttfb['p95_ms']}"
+            )
+
+    if webdriver_commands.samples:
+        terminalreporter.section("Команды WebDriver по методам page objects")
+        for caller, entry in list(webdriver_commands.summary().items())[:WEBDRIVER_SUMMARY_TOP]:
+            terminalreporter.write_line(
+                f"{caller:<40} команд={entry['count']:<6} ошибок={entry['errors']:<5} всего={entry['total_ms']} мс"
+            )
+
+    if page_perf.samples:
+        terminalreporter.section("Производительность страниц (p95, в скобках - изменение к прошлому прогону)")
+        for key, metrics in page_perf.summary().items():
+            baseline = page_perf.baseline.get(key, {})
+            parts = []
+            for name in SUMMARY_METRICS:
+                if name not in metrics:
+                    continue
+                p95 = metrics[name]["p95"]
+                previous = baseline.get(name, {}).get("p95")
+                change = f" ({(p95 - previous) / previous:+.0%})" if previous else ""
+                parts.append(f"{name}={p95}{change}")
+            count = max(stats["count"] for stats in metrics.values())
+            terminalreporter.write_line(f"{key:<32} n={count:<5} " + " ".join(parts))
+
+    if wait_timings.samples:
+        terminalreporter.section("Ожидания условий (мс)")
+        for name, stats in sorted(wait_timings.stats().items()):
+            summary = stats.summary()
+            terminalreporter.write_line(
+                f"{name:<28} n={summary['count']:<5} p50={summary['p50_ms']:<8} p95={summary['p95_ms']:<8} "
+                f"таймаутов={summary['errors']}"
+            )
+
+    cache = terminalreporter.config.stash.get(api_cache_key, None)
+    if cache and (cache.hits or cache.coalesced):
+        stats = cache.stats()
+        terminalreporter.write_line(
+            f"Кэш каталога: попаданий {stats['hits']}, объединённых запросов {stats['coalesced']}, "
+            f"запросов к API {stats['misses']}"
+        )
+
+    cleaner = terminalreporter.config.stash.get(cart_cleaner_key, None)
+    if cleaner and cleaner.failures:
+        terminalreporter.section("Не удалось очистить корзины", yellow=True)
+        for nodeid, error in cleaner.failures:
+            terminalreporter.write_line(f"{nodeid}: {error}")
+
+    stats = artifacts.stats()
+    if stats["saved"] or stats["skipped"] or artifacts.errors:
+        terminalreporter.section("Артефакты упавших тестов")
+        terminalreporter.write_line(
+            f"Сохранено файлов: {stats['saved']} ({stats['written_mb']} МБ), одинаковых кадров: {stats['duplicates']}, "
+            f"пропущено сверх ARTIFACTS_BUDGET_MB: {stats['skipped']}"
+        )
+        for error in artifacts.errors:
+            terminalreporter.write_line(error)
+
+    dead = locator_cache.dead_alternatives()
+    if not dead or terminalreporter.config.getoption("verbose") < 1:
+        return
+
+    terminalreporter.section("Неиспользуемые альтернативы локаторов")
+    for key, alternatives in sorted(dead.items()):
+        page, host, _ = key.split("|", 2)
+        terminalreporter.write_line(f"{page} ({host}): {', '.join(alternatives)}")
 
 
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
 def pytest_runtest_makereport(item, call):
-    """Хук для создания скриншотов при падении тестов"""
+    """
+    Бюджеты производительности и артефакты упавшего теста
+
+    Превышение perf_budget, бюджетов страниц и webdriver_budget помечает
+    упавшим сам тест (фаза call), а не его teardown. Для упавшего UI теста в фоне пишутся скриншот, HTML страницы
+    и лог консоли.
+    """
     outcome = yield
     rep = outcome.get_result()
 
+    if rep.when == "call" and rep.passed:
+        failures = [
+            (title, violations)
+            for title, violations in (
+                ("Превышен бюджет времени ответа API", api_budget_violations(item)),
+                ("Превышен бюджет производительности страниц", page_budget_violations(item)),
+            )
+            if violations
+        ]
+        if failures:
+            rep.outcome = "failed"
+            rep.longrepr = "\n\n".join(f"{title}:\n" + "\n".join(violations) for title, violations in failures)
+
     if rep.when == "call" and rep.failed:
+        driver = item.funcargs.get('driver')
+        if not driver:
+            return
         try:
-            # Делаем скриншот если тест упал
-            driver = item.funcargs.get('driver')
-            if driver:
-                screenshot_path = config.SCREENSHOTS_DIR / f"{item.name}.png"
-                driver.save_screenshot(str(screenshot_path))
-                allure.attach.file(
-                    str(screenshot_path),
-                    name="screenshot",
-                    attachment_type=allure.attachment_type.PNG
-                )
+            screenshot = capture_screenshot(driver)
+            page_source = driver.page_source
+            console = capture_console_log(driver, since=getattr(driver, "acquired_at", None))
         except Exception as e:
-            print(f"Не удалось сделать скриншот: {e}")
+            print(f"Не удалось снять артефакты: {e}")
+            return
+
+        artifacts.submit(item.name, screenshot=screenshot, page_source=page_source, console=console)
+        data, extension = screenshot
+        allure.attach(
+            data,
+            name="screenshot",
+            attachment_type=allure.attachment_type.JPG if extension == "jpg" else allure.attachment_type.PNG
+        )
+        if console:
+            allure.attach(
+                format_console_log(console),
+                name="Консоль браузера",
+                attachment_type=allure.attachment_type.TEXT
+            )
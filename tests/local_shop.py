@@ -0,0 +1,578 @@
+"""
+Локальный стенд MTS Shop для автономных прогонов
+
+Отдаёт главную страницу, поиск, карточку товара, корзину и оформление
+заказа с теми же data-test атрибутами, что ожидают page objects, и
+эндпоинты /api/v1, которые использует ApiClient. Корзина хранится на
+сервере и привязана к cookie, поэтому товар, добавленный через API, виден
+в браузере с той же cookie.
+
+Задержки и ошибки:
+- LOCAL_SHOP_LATENCY_MS - задержка каждого ответа;
+- LOCAL_SHOP_ERROR_RATE - доля ответов API с кодом 503;
+- shop.inject("/api/v1/cart", latency_ms=500, status=503, times=2) -
+  задержка или ошибка для запросов с этим префиксом пути.
+
+Запуск: pytest --local-shop (или LOCAL_SHOP=true), стенд поднимается на
+свободном порту и подменяет BASE_URL и API_BASE_URL.
+"""
+import json
+import random
+import threading
+import time
+import uuid
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from config.config import config
+
+
+PRODUCTS = {
+    "708888": {
+        "name": "Смартфон Apple iPhone 15 128GB",
+        "price": 79990,
+        "category": "Смартфоны",
+        "description": "Смартфон с экраном 6.1 дюйма и камерой 48 Мп",
+        "characteristics": {"Экран": "6.1\"", "Память": "128 ГБ", "Цвет": "Чёрный"},
+        "images": 3,
+    },
+    "708882": {
+        "name": "Смартфон Samsung Galaxy S24 256GB",
+        "price": 89990,
+        "category": "Смартфоны",
+        "description": "Флагманский смартфон Samsung",
+        "characteristics": {"Экран": "6.2\"", "Память": "256 ГБ", "Цвет": "Серый"},
+        "images": 4,
+    },
+    "708870": {
+        "name": "Смартфон Xiaomi Redmi Note 13 128GB",
+        "price": 19990,
+        "category": "Смартфоны",
+        "description": "Смартфон с AMOLED-экраном",
+        "characteristics": {"Экран": "6.67\"", "Память": "128 ГБ", "Цвет": "Синий"},
+        "images": 2,
+    },
+    "947478": {
+        "name": "Наушники Apple AirPods Pro 2",
+        "price": 24990,
+        "category": "Аксессуары",
+        "description": "Беспроводные наушники с шумоподавлением",
+        "characteristics": {"Тип": "Вкладыши", "Шумоподавление": "Есть"},
+        "images": 2,
+    },
+}
+
+CITIES = ("Москва", "Санкт-Петербург", "Казань")
+REQUIRED_ORDER_FIELDS = ("name", "phone", "email", "address")
+CART_COOKIE = "cart_id"
+
+# Скрипт всех страниц стенда: корзина и оформление заказа через /api/v1
+SHOP_JS = r"""
+(function () {
+    var api = function (method, path, body) {
+        var spinner = document.querySelector('[data-test="spinner"]');
+        spinner.hidden = false;
+        return fetch('/api/v1' + path, {
+            method: method,
+            headers: {'Content-Type': 'application/json'},
+            body: body ? JSON.stringify(body) : undefined
+        }).then(function (response) {
+            spinner.hidden = true;
+            return response.json().then(function (data) {
+                return {ok: response.ok, data: data};
+            });
+        });
+    };
+    var formatPrice = function (value) {
+        return value.toLocaleString('ru-RU') + ' ₽';
+    };
+    var setCounter = function (count) {
+        var counter = document.querySelector('[data-test="cart-counter"]');
+        counter.textContent = count;
+        counter.hidden = !count;
+    };
+    var confirmThen = function (action) {
+        var dialog = document.createElement('div');
+        dialog.className = 'dialog';
+        dialog.innerHTML = '<p>Удалить?</p><button data-test="confirm-remove">Да</button>';
+        dialog.querySelector('button').addEventListener('click', function () {
+            dialog.remove();
+            action().then(function () { location.reload(); });
+        });
+        document.body.appendChild(dialog);
+    };
+
+    document.addEventListener('click', function (event) {
+        var target = event.target.closest('[data-action]');
+        if (!target) {
+            return;
+        }
+        var action = target.dataset.action;
+        var productId = target.dataset.id;
+
+        if (action === 'add' || action === 'buy') {
+            var quantityInput = document.querySelector('[data-test="quantity-input"]');
+            var quantity = parseInt(quantityInput ? quantityInput.value : '1', 10) || 1;
+            api('POST', '/cart/add', {id: productId, quantity: quantity, corporate: false}).then(function (result) {
+                if (!result.ok) {
+                    return;
+                }
+                if (action === 'buy') {
+                    location.href = '/cart';
+                    return;
+                }
+                setCounter(result.data.count);
+                var message = document.createElement('div');
+                message.dataset.test = 'success-message';
+                message.textContent = 'Товар добавлен в корзину';
+                target.after(message);
+            });
+        } else if (action === 'remove') {
+            confirmThen(function () { return api('POST', '/cart/update', {id: productId, quantity: 0}); });
+        } else if (action === 'clear') {
+            confirmThen(function () { return api('DELETE', '/cart'); });
+        }
+    });
+
+    document.addEventListener('input', function (event) {
+        var input = event.target;
+        if (!input.matches('[data-test="cart-item"] [data-test="quantity-input"]') || input.value === '') {
+            return;
+        }
+        var item = input.closest('[data-test="cart-item"]');
+        api('POST', '/cart/update', {id: item.dataset.id, quantity: parseInt(input.value, 10) || 0}).then(function (result) {
+            result.data.items.forEach(function (row) {
+                var rowElement = document.querySelector('[data-test="cart-item"][data-id="' + row.id + '"]');
+                if (rowElement) {
+                    rowElement.querySelector('[data-test="item-quantity"]').textContent = row.quantity + ' шт.';
+                    rowElement.querySelector('[data-test="item-total"]').textContent = formatPrice(row.total);
+                }
+            });
+            document.querySelector('[data-test="cart-total"]').textContent = 'Итого: ' + formatPrice(result.data.total);
+            setCounter(result.data.count);
+        });
+    });
+
+    var form = document.querySelector('[data-test="order-form"]');
+    if (form) {
+        form.addEventListener('submit', function (event) {
+            event.preventDefault();
+            document.querySelectorAll('[data-test="validation-error"], [data-test="error-message"]').forEach(function (element) {
+                element.remove();
+            });
+            var data = {};
+            new FormData(form).forEach(function (value, name) { data[name] = value; });
+            api('POST', '/orders', data).then(function (result) {
+                if (result.ok) {
+                    form.hidden = true;
+                    var message = document.createElement('div');
+                    message.dataset.test = 'success-message';
+                    message.textContent = 'Заказ №' + result.data.order_id + ' оформлен';
+                    form.after(message);
+                    setCounter(0);
+                    return;
+                }
+                var error = document.createElement('div');
+                error.dataset.test = 'error-message';
+                error.textContent = result.data.error;
+                form.before(error);
+                Object.keys(result.data.fields || {}).forEach(function (name) {
+                    var fieldError = document.createElement('div');
+                    fieldError.dataset.test = 'validation-error';
+                    fieldError.textContent = result.data.fields[name];
+                    form.elements[name].after(fieldError);
+                });
+            });
+        });
+    }
+})();
+"""
+
+
+def format_price(value):
+    """Цена как на сайте: 79 990 ₽"""
+    return f"{value:,}".replace(",", " ") + " ₽"
+
+
+class Fault:
+    """Задержка или ошибка для запросов с префиксом пути"""
+
+    def __init__(self, path, latency_ms=0, status=None, times=None, method=None):
+        self.path = path
+        self.latency_ms = latency_ms
+        self.status = status
+        self.times = times
+        self.method = method
+        self.hits = 0
+
+    def matches(self, method, path):
+        if self.times is not None and self.hits >= self.times:
+            return False
+        return path.startswith(self.path) and self.method in (None, method)
+
+
+class LocalShop:
+    """Локальный сервер магазина в фоновом потоке"""
+
+    def __init__(self, host="127.0.0.1", port=0, latency_ms=None, error_rate=None):
+        self.latency_ms = config.LOCAL_SHOP_LATENCY_MS if latency_ms is None else latency_ms
+        self.error_rate = config.LOCAL_SHOP_ERROR_RATE if error_rate is None else error_rate
+        self.products = PRODUCTS
+        self.carts = {}
+        self.orders = []
+        self.faults = []
+        self.lock = threading.Lock()
+
+        self._server = ThreadingHTTPServer((host, port), ShopRequestHandler)
+        self._server.daemon_threads = True
+        self._server.shop = self
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def api_url(self):
+        return f"{self.url}/api/v1"
+
+    def start(self):
+        """Запустить сервер (возвращает self)"""
+        self._thread = threading.Thread(target=self._server.serve_forever, name="local-shop", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Остановить сервер"""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def inject(self, path, latency_ms=0, status=None, times=None, method=None):
+        """Задержка и/или ошибка status для запросов с префиксом path (times раз или всегда)"""
+        fault = Fault(path, latency_ms, status, times, method)
+        with self.lock:
+            self.faults.append(fault)
+        return fault
+
+    def clear_faults(self):
+        with self.lock:
+            self.faults.clear()
+
+    def take_fault(self, method, path):
+        """Первая подходящая неисчерпанная неисправность"""
+        with self.lock:
+            for fault in self.faults:
+                if fault.matches(method, path):
+                    fault.hits += 1
+                    return fault
+        return None
+
+    def cart(self, cart_id, corporate=False):
+        """Корзина {id товара: количество}"""
+        return self.carts.setdefault((cart_id, corporate), {})
+
+    def cart_view(self, cart_id, corporate=False):
+        """Корзина в формате ответа API"""
+        items = []
+        for product_id, quantity in self.cart(cart_id, corporate).items():
+            product = self.products[product_id]
+            items.append({
+                "id": product_id,
+                "name": product["name"],
+                "price": product["price"],
+                "quantity": quantity,
+                "total": product["price"] * quantity,
+            })
+        return {
+            "items": items,
+            "count": sum(item["quantity"] for item in items),
+            "total": sum(item["total"] for item in items),
+        }
+
+
+class ShopRequestHandler(BaseHTTPRequestHandler):
+    """Обработчик запросов стенда"""
+
+    protocol_version = "HTTP/1.1"
+    # Заголовки и тело уходят разными пакетами - без Nagle нет задержки в 40 мс
+    disable_nagle_algorithm = True
+
+    @property
+    def shop(self):
+        return self.server.shop
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_DELETE(self):
+        self._handle("DELETE")
+
+    def _handle(self, method):
+        url = urlparse(self.path)
+        self.query = parse_qs(url.query)
+        length = int(self.headers.get("Content-Length") or 0)
+        self.body = self.rfile.read(length) if length else b""
+        self.cart_id = self._cart_cookie()
+        self.new_cart = self.cart_id is None
+        if self.new_cart:
+            self.cart_id = uuid.uuid4().hex
+
+        fault = self.shop.take_fault(method, url.path)
+        latency_ms = self.shop.latency_ms + (fault.latency_ms if fault else 0)
+        if latency_ms:
+            time.sleep(latency_ms / 1000)
+
+        if fault and fault.status:
+            return self._send_json(fault.status, {"error": "Injected fault"})
+        if url.path.startswith("/api/") and self.shop.error_rate and random.random() < self.shop.error_rate:
+            return self._send_json(503, {"error": "Service unavailable"}, {"Retry-After": "0"})
+
+        if url.path.startswith("/api/v1/"):
+            return self._api(method, url.path[len("/api/v1"):])
+        if method != "GET":
+            return self._send_json(405, {"error": "Method not allowed"})
+        return self._page(url.path)
+
+    def _cart_cookie(self):
+        for part in (self.headers.get("Cookie") or "").split(";"):
+            name, _, value = part.strip().partition("=")
+            if name == CART_COOKIE and value:
+                return value
+        return None
+
+    def _json_body(self):
+        try:
+            data = json.loads(self.body or b"{}")
+        except ValueError:
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    # ---------- API ----------
+
+    def _api(self, method, path):
+        shop = self.shop
+        data = self._json_body()
+
+        if method == "GET" and path == "/products/prices":
+            ids = self.query.get("id", [])
+            return self._send_json(200, [
+                {"id": product_id, "name": shop.products[product_id]["name"], "price": shop.products[product_id]["price"]}
+                for product_id in ids if product_id in shop.products
+            ])
+
+        corporate = self.query.get("corporate", ["false"])[0] == "true" or data.get("corporate") is True
+
+        if method == "GET" and path == "/cart":
+            return self._send_json(200, shop.cart_view(self.cart_id, corporate))
+
+        if method == "DELETE" and path == "/cart":
+            with shop.lock:
+                shop.cart(self.cart_id, corporate).clear()
+            return self._send_json(200, shop.cart_view(self.cart_id, corporate))
+
+        if method == "POST" and path == "/cart/add":
+            product_id = str(data.get("id") or "")
+            if not product_id:
+                return self._send_json(400, {"error": "Не указан ID товара"})
+            if product_id not in shop.products:
+                return self._send_json(404, {"error": f"Товар {product_id} не найден"})
+            quantity = data.get("quantity", 1)
+            if not isinstance(quantity, int) or quantity < 1:
+                return self._send_json(400, {"error": "Некорректное количество"})
+            with shop.lock:
+                cart = shop.cart(self.cart_id, corporate)
+                cart[product_id] = cart.get(product_id, 0) + quantity
+            view = shop.cart_view(self.cart_id, corporate)
+            return self._send_json(200, dict(view, item_id=product_id))
+
+        if method == "POST" and path == "/cart/update":
+            product_id = str(data.get("id") or "")
+            quantity = data.get("quantity")
+            if product_id not in shop.products or not isinstance(quantity, int) or quantity < 0:
+                return self._send_json(400, {"error": "Некорректный товар или количество"})
+            with shop.lock:
+                cart = shop.cart(self.cart_id, corporate)
+                if quantity:
+                    cart[product_id] = quantity
+                else:
+                    cart.pop(product_id, None)
+            return self._send_json(200, shop.cart_view(self.cart_id, corporate))
+
+        if method == "POST" and path == "/orders":
+            return self._create_order(data)
+
+        return self._send_json(404, {"error": "Not found"})
+
+    def _create_order(self, data):
+        shop = self.shop
+        fields = {name: "Обязательное поле" for name in REQUIRED_ORDER_FIELDS if not str(data.get(name, "")).strip()}
+        if fields:
+            return self._send_json(400, {"error": "Заполните обязательные поля", "fields": fields})
+
+        with shop.lock:
+            view = shop.cart_view(self.cart_id)
+            if not view["items"]:
+                return self._send_json(400, {"error": "Корзина пуста"})
+            order_id = len(shop.orders) + 1
+            shop.orders.append(dict(data, order_id=order_id, items=view["items"], total=view["total"]))
+            shop.cart(self.cart_id).clear()
+        return self._send_json(201, {"order_id": order_id, "total": view["total"]})
+
+    # ---------- Страницы ----------
+
+    def _page(self, path):
+        if path == "/static/shop.js":
+            return self._send(200, SHOP_JS.encode("utf-8"), "application/javascript; charset=utf-8")
+        if path == "/":
+            return self._send_page("Интернет-магазин", self._catalog(self.shop.products))
+        if path == "/search":
+            return self._search()
+        if path.startswith("/product/"):
+            return self._product(path[len("/product/"):])
+        if path == "/cart":
+            return self._send_page("Корзина", self._cart())
+        if path in ("/checkout", "/order"):
+            return self._send_page("Оформление заказа", self._checkout())
+        return self._send_page("Страница не найдена", "<h1>Страница не найдена</h1>", status=404)
+
+    def _search(self):
+        query = self.query.get("q", [""])[0].strip().lower()
+        category = self.query.get("category", [""])[0]
+        products = {
+            product_id: product for product_id, product in self.shop.products.items()
+            if query in product["name"].lower() and category in ("", product["category"])
+        }
+        title = f"Поиск: {query}" if query else category or "Каталог"
+        return self._send_page(title, f"<h1>{escape(title)}</h1>" + self._catalog(products))
+
+    def _catalog(self, products):
+        categories = sorted({product["category"] for product in self.shop.products.values()})
+        category_links = "".join(
+            f'<a data-test="category" href="/search?category={escape(name)}">{escape(name)}</a>'
+            for name in categories
+        )
+        cards = "".join(
+            f'<a data-test="product-card" href="/product/{product_id}">'
+            f'<span data-test="product-name">{escape(product["name"])}</span>'
+            f'<span class="price">{format_price(product["price"])}</span></a>'
+            for product_id, product in products.items()
+        )
+        return f'<nav class="categories">{category_links}</nav><section class="products">{cards}</section>'
+
+    def _product(self, product_id):
+        product = self.shop.products.get(product_id)
+        if product is None:
+            return self._send_page("Товар не найден", "<h1>Товар не найден</h1>", status=404)
+
+        characteristics = "".join(
+            f"<div>{escape(name)}: {escape(value)}</div>" for name, value in product["characteristics"].items()
+        )
+        images = '<div data-test="product-image"></div>' * product["images"]
+        body = f"""
+<a data-test="back-button" href="/">Назад</a>
+<h1 data-test="product-name">{escape(product["name"])}</h1>
+<div class="gallery">{images}</div>
+<div data-test="product-price">{format_price(product["price"])}</div>
+<p data-test="product-description">{escape(product["description"])}</p>
+<div data-test="characteristics">{characteristics}</div>
+<input data-test="quantity-input" name="quantity" type="number" min="1" value="1">
+<button data-test="add-to-cart" data-action="add" data-id="{product_id}">В корзину</button>
+<button data-test="buy-now" data-action="buy" data-id="{product_id}">Купить сейчас</button>
+"""
+        return self._send_page(product["name"], body)
+
+    def _cart(self):
+        view = self.shop.cart_view(self.cart_id)
+        if not view["items"]:
+            return ('<h1 data-test="cart-title">Корзина</h1>'
+                    '<div data-test="empty-cart">Ваша корзина пуста</div>'
+                    '<a data-test="continue-shopping" href="/">Продолжить покупки</a>')
+
+        rows = "".join(f"""
+<div data-test="cart-item" data-id="{item["id"]}">
+  <span data-test="item-name">{escape(item["name"])}</span>
+  <span data-test="item-price">{format_price(item["price"])}</span>
+  <span data-test="item-quantity">{item["quantity"]} шт.</span>
+  <input data-test="quantity-input" type="number" min="0" value="{item["quantity"]}">
+  <span data-test="item-total">{format_price(item["total"])}</span>
+  <button data-test="remove-button" data-action="remove" data-id="{item["id"]}">Удалить</button>
+</div>""" for item in view["items"])
+        return f"""
+<h1 data-test="cart-title">Корзина</h1>
+{rows}
+<div data-test="cart-total">Итого: {format_price(view["total"])}</div>
+<button data-test="clear-cart" data-action="clear">Очистить корзину</button>
+<a data-test="continue-shopping" href="/">Продолжить покупки</a>
+<a data-test="checkout-button" href="/checkout">Оформить заказ</a>
+"""
+
+    def _checkout(self):
+        view = self.shop.cart_view(self.cart_id)
+        items = "".join(f"<li>{escape(item['name'])} x {item['quantity']}</li>" for item in view["items"])
+        cities = "".join(f'<option value="{escape(city)}">{escape(city)}</option>' for city in CITIES)
+        return f"""
+<h1>Оформление заказа</h1>
+<form data-test="order-form" novalidate>
+  <input data-test="name-input" name="name" placeholder="Имя">
+  <input data-test="phone-input" name="phone" type="tel" placeholder="Телефон">
+  <input data-test="email-input" name="email" type="email" placeholder="Email">
+  <textarea data-test="address-input" name="address" placeholder="Адрес"></textarea>
+  <select data-test="city-select" name="city">{cities}</select>
+  <label><input data-test="delivery-method" type="radio" name="delivery" id="delivery-courier" value="courier" checked> Курьер</label>
+  <label><input data-test="delivery-method" type="radio" name="delivery" id="delivery-pickup" value="pickup"> Самовывоз</label>
+  <label><input data-test="payment-method" type="radio" name="payment" id="payment-card" value="card" checked> Картой</label>
+  <label><input data-test="payment-method" type="radio" name="payment" id="payment-cash" value="cash"> Наличными</label>
+  <textarea data-test="comment-input" name="comment" placeholder="Комментарий"></textarea>
+  <button data-test="submit-order" type="submit">Оформить заказ</button>
+</form>
+<aside data-test="order-summary">
+  <ul data-test="order-items">{items}</ul>
+  <div data-test="order-total">Итого: {format_price(view["total"])}</div>
+</aside>
+<a data-test="back-to-cart" href="/cart">Вернуться в корзину</a>
+"""
+
+    def _send_page(self, title, body, status=200):
+        count = self.shop.cart_view(self.cart_id)["count"]
+        html = f"""<!DOCTYPE html>
+<html lang="ru">
+<head><meta charset="utf-8"><title>{escape(title)} | МТС Shop</title></head>
+<body>
+<header>
+  <a data-test="logo" href="/">МТС Shop</a>
+  <a data-test="catalog-button" href="/search">Каталог</a>
+  <form action="/search">
+    <input data-test="search-input" type="search" name="q" placeholder="Поиск">
+    <button data-test="search-button" type="submit">Найти</button>
+  </form>
+  <a data-test="cart-button" href="/cart">Корзина <span data-test="cart-counter"{"" if count else " hidden"}>{count}</span></a>
+  <a data-test="user-profile" href="/">Профиль</a>
+</header>
+<div data-test="spinner" hidden>Загрузка...</div>
+<main>{body}</main>
+<script src="/static/shop.js"></script>
+</body>
+</html>"""
+        return self._send(status, html.encode("utf-8"), "text/html; charset=utf-8")
+
+    def _send_json(self, status, data, headers=None):
+        content = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        return self._send(status, content, "application/json; charset=utf-8", headers)
+
+    def _send(self, status, content, content_type, headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(content)))
+        if self.new_cart:
+            self.send_header("Set-Cookie", f"{CART_COOKIE}={self.cart_id}; Path=/")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(content)
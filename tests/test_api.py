@@ -1,6 +1,21 @@
+import asyncio
 import pytest
 import allure
 from config.config import config
+from utils.async_api_client import AsyncApiClient
+from utils.schema import Optional, Schema
+
+# Схемы ответов (проверяются все элементы, а не только первый)
+PRODUCTS_SCHEMA = Schema([{
+    "id": (str, int),
+    "price": (int, float),
+    "name": Optional(str),
+}])
+CART_ITEMS_SCHEMA = Schema(Optional([{
+    "id": (str, int),
+    "quantity": Optional(int),
+    "price": Optional((int, float)),
+}]))
 
 
 @allure.epic("MTS Shop API")
@@ -10,6 +25,8 @@ class TestMTSShopAPI:
 
     @allure.title("API-POS-001: Информация о товарах")
     @pytest.mark.positive
+    @pytest.mark.perf_budget("/products/prices", p95_ms=config.API_P95_BUDGET_MS)
+    @pytest.mark.no_api_cache
     def test_get_product_info(self, api_client):
         """Тест получения информации о товарах"""
         product_ids = ["708888", "708882", "708870", "947478"]
@@ -26,13 +43,35 @@ class TestMTSShopAPI:
             assert isinstance(data, list), "Ответ должен быть списком"
             assert len(data) > 0, "Список товаров не должен быть пустым"
 
-            # Проверяем структуру первого товара
-            product = data[0]
-            assert "id" in product, "Товар должен иметь поле 'id'"
-            assert "price" in product, "Товар должен иметь поле 'price'"
+            # Каждый товар должен иметь поля 'id' и 'price'
+            PRODUCTS_SCHEMA.validate(data)
+
+    @allure.title("API-POS-004: Информация о товарах параллельными запросами")
+    @pytest.mark.positive
+    def test_get_product_info_concurrent(self, cassette):
+        """Тест одновременного получения цен товаров пачками"""
+        product_ids = ["708888", "708882", "708870", "947478"]
+
+        async def fetch_prices():
+            async with AsyncApiClient(cassette=cassette) as client:
+                return await client.get_prices(product_ids, chunk_size=1)
+
+        with allure.step(f"Параллельный запрос цен товаров {product_ids}"):
+            responses = asyncio.run(fetch_prices())
+
+        with allure.step("Проверка статус кода 200 во всех ответах"):
+            assert len(responses) == len(product_ids)
+            for response in responses:
+                assert response.status_code == 200, \
+                    f"Ожидался статус 200, получен {response.status_code} ({response.url})"
+
+        with allure.step("Проверка структуры всех ответов"):
+            for response in responses:
+                PRODUCTS_SCHEMA.validate(response.json())
 
     @allure.title("API-POS-002: Добавить товар в корзину")
     @pytest.mark.positive
+    @pytest.mark.perf_budget("/cart/add", p95_ms=config.API_P95_BUDGET_MS)
     def test_add_to_cart(self, api_client):
         """Тест добавления товара в корзину"""
         product_id = config.TEST_PRODUCT_ID
@@ -51,6 +90,8 @@ class TestMTSShopAPI:
 
     @allure.title("API-POS-003: Получить корзину")
     @pytest.mark.positive
+    @pytest.mark.perf_budget("/cart/add", p95_ms=config.API_P95_BUDGET_MS)
+    @pytest.mark.perf_budget("GET /cart", p95_ms=config.API_P95_BUDGET_MS)
     def test_get_cart(self, api_client):
         """Тест получения содержимого корзины"""
         with allure.step("Добавляем товар для теста"):
@@ -68,6 +109,8 @@ class TestMTSShopAPI:
             # Структура может быть разной, проверяем базовые поля
             assert "items" in cart_data or "products" in cart_data, \
                 "Корзина должна содержать список товаров"
+            CART_ITEMS_SCHEMA.validate(cart_data.get("items"))
+            CART_ITEMS_SCHEMA.validate(cart_data.get("products"))
 
     @allure.title("API-NEG-001: Пустой ID товара при добавлении")
     @pytest.mark.negative
@@ -0,0 +1,162 @@
+import threading
+import time
+import pytest
+import allure
+from utils import cache as cache_module
+from utils.cache import ResponseCache
+from utils.cassette import build_response, serialize_response
+
+
+class FakeTime:
+    """Управляемое время для time.time() в utils/cache.py"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeTime()
+    monkeypatch.setattr(cache_module, "time", fake)
+    return fake
+
+
+def make_response(body, status_code=200):
+    stored = serialize_response(status_code, {"Content-Type": "application/json"}, body.encode("utf-8"), 0.01)
+    return build_response(stored, "GET", "http://shop.test/products/prices")
+
+
+class Loader:
+    """loader для get_or_load: считает вызовы и отдаёт заданный ответ"""
+
+    def __init__(self, body="{}", status_code=200):
+        self.body = body
+        self.status_code = status_code
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return make_response(self.body, self.status_code)
+
+
+@allure.epic("MTS Shop API")
+@allure.feature("Кэш каталога")
+@pytest.mark.api
+class TestResponseCache:
+    """Кэш ответов: TTL, LRU, объединение запросов, сохранение на диск"""
+
+    @allure.title("CACHE-001: Повторный запрос берётся из кэша")
+    def test_hit_after_miss(self, clock):
+        cache = ResponseCache(ttl=60, max_size=10, path="")
+        loader = Loader('{"price": 100}')
+
+        first = cache.get_or_load("a", loader)
+        second = cache.get_or_load("a", loader)
+
+        assert loader.calls == 1
+        assert second.json() == first.json() == {"price": 100}
+        assert second is not first
+        assert (cache.misses, cache.hits) == (1, 1)
+
+    @allure.title("CACHE-002: Запись истекает через ttl")
+    def test_expiry(self, clock):
+        cache = ResponseCache(ttl=60, max_size=10, path="")
+        loader = Loader()
+
+        cache.get_or_load("a", loader)
+        clock.now += 59
+        cache.get_or_load("a", loader)
+        assert loader.calls == 1
+
+        clock.now += 1
+        cache.get_or_load("a", loader)
+        assert loader.calls == 2
+
+    @allure.title("CACHE-003: Вытесняется самая давно не использованная запись")
+    def test_lru_eviction(self, clock):
+        cache = ResponseCache(ttl=60, max_size=2, path="")
+        loaders = {key: Loader() for key in "abc"}
+
+        cache.get_or_load("a", loaders["a"])
+        cache.get_or_load("b", loaders["b"])
+        cache.get_or_load("a", loaders["a"])  # "a" использована позже "b"
+        cache.get_or_load("c", loaders["c"])
+
+        cache.get_or_load("a", loaders["a"])
+        cache.get_or_load("b", loaders["b"])
+        assert loaders["a"].calls == 1
+        assert loaders["b"].calls == 2
+
+    @allure.title("CACHE-004: Одновременные запросы объединяются в один")
+    def test_concurrent_requests_coalesce(self, clock):
+        cache = ResponseCache(ttl=60, max_size=10, path="")
+        started, release = threading.Event(), threading.Event()
+        calls = []
+
+        def slow_loader():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return make_response('{"price": 100}')
+
+        results = []
+        first = threading.Thread(target=lambda: results.append(cache.get_or_load("a", slow_loader)))
+        second = threading.Thread(target=lambda: results.append(cache.get_or_load("a", slow_loader)))
+        first.start()
+        assert started.wait(5)
+        second.start()
+        time.sleep(0.1)  # второй поток ждёт запрос первого
+        release.set()
+        first.join(5)
+        second.join(5)
+
+        assert len(calls) == 1
+        assert [response.json() for response in results] == [{"price": 100}] * 2
+        assert (cache.misses, cache.coalesced) == (1, 1)
+
+    @allure.title("CACHE-005: Неуспешный ответ не кэшируется")
+    def test_failed_response_is_not_cached(self, clock):
+        cache = ResponseCache(ttl=60, max_size=10, path="")
+        loader = Loader('{"error": "unavailable"}', status_code=503)
+
+        assert cache.get_or_load("a", loader).status_code == 503
+        assert cache.get_or_load("a", loader).status_code == 503
+        assert loader.calls == 2
+        assert cache.stats()["size"] == 0
+
+    @allure.title("CACHE-006: Исключение загрузчика не кэшируется и не блокирует ключ")
+    def test_loader_error_is_not_cached(self, clock):
+        cache = ResponseCache(ttl=60, max_size=10, path="")
+
+        def failing_loader():
+            raise ConnectionError("нет сети")
+
+        with pytest.raises(ConnectionError):
+            cache.get_or_load("a", failing_loader)
+        loader = Loader()
+        cache.get_or_load("a", loader)
+        assert loader.calls == 1
+
+    @allure.title("CACHE-007: Сохранение сливается с записями другого воркера, истёкшие отбрасываются")
+    def test_save_merges_with_file(self, clock, tmp_path):
+        path = tmp_path / "cache.json.gz"
+        worker_1 = ResponseCache(ttl=60, max_size=10, path=path)
+        worker_2 = ResponseCache(ttl=60, max_size=10, path=path)
+
+        worker_1.get_or_load("a", Loader('"a"'))
+        worker_1.save()
+        clock.now += 30
+        worker_2.get_or_load("b", Loader('"b"'))
+        worker_2.save()
+
+        reloaded = ResponseCache(ttl=60, max_size=10, path=path)
+        assert reloaded.get_or_load("a", Loader('"new"')).json() == "a"
+        assert reloaded.get_or_load("b", Loader('"new"')).json() == "b"
+
+        clock.now += 40  # "a" истекла, "b" - нет
+        worker_2.get_or_load("c", Loader('"c"'))
+        worker_2.save()
+        assert ResponseCache(ttl=60, max_size=10, path=path).stats()["size"] == 2
@@ -0,0 +1,131 @@
+import asyncio
+import pytest
+import allure
+from utils import polling
+from utils.polling import Backoff, PollTimeout, WaitTimings, poll, wait_all
+
+
+class FakeClock:
+    """Управляемое время для utils.polling: sleep только сдвигает часы"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    # Подменяется модуль time только в utils.polling: цикл asyncio идёт по настоящим часам.
+    # Ожидания на фальшивых часах не попадают в сводку wait_timings сессии
+    fake = FakeClock()
+    monkeypatch.setattr(polling, "time", fake)
+    monkeypatch.setattr(polling, "wait_timings", WaitTimings())
+    return fake
+
+
+def becomes_true_at(clock, moment, value=True):
+    """Условие, которое выполняется начиная с момента moment (время FakeClock)"""
+    def condition():
+        return value if clock.now >= moment else None
+    return condition
+
+
+@allure.epic("MTS Shop API")
+@allure.feature("Ожидание условий")
+@pytest.mark.api
+class TestPoll:
+    """poll и Backoff: интервалы, срок и последняя проверка"""
+
+    @allure.title("POLL-001: Выполненное условие возвращается без ожидания")
+    def test_immediate_result(self, clock):
+        assert poll(lambda: "готово", timeout=5) == "готово"
+        assert clock.sleeps == []
+
+    @allure.title("POLL-002: Интервал растёт до максимума")
+    def test_backoff_grows_to_maximum(self, clock):
+        backoff = Backoff(100, initial=0.1, factor=2, maximum=0.5)
+
+        delays = [backoff.next_delay() for _ in range(5)]
+
+        assert delays == pytest.approx([0.1, 0.2, 0.4, 0.5, 0.5])
+
+    @allure.title("POLL-003: Пауза не выходит за срок, последняя проверка - ровно на сроке")
+    def test_final_check_on_deadline(self, clock):
+        deadline = clock.now + 1.0
+
+        result = poll(becomes_true_at(clock, deadline, "в последний момент"), timeout=1.0,
+                      initial=0.3, factor=2, max_interval=0.6)
+
+        assert result == "в последний момент"
+        assert sum(clock.sleeps) == pytest.approx(1.0)
+        assert clock.sleeps == pytest.approx([0.3, 0.6, 0.1])
+
+    @allure.title("POLL-004: После срока - PollTimeout, часы не уходят за срок")
+    def test_timeout(self, clock):
+        start = clock.now
+        attempts = []
+
+        def never():
+            attempts.append(clock.now)
+            return False
+
+        with pytest.raises(PollTimeout, match="never"):
+            poll(never, timeout=2, initial=0.5, factor=1, max_interval=0.5)
+
+        assert clock.now == pytest.approx(start + 2)
+        assert attempts[-1] == pytest.approx(start + 2)
+        assert len(attempts) == 5
+
+
+@allure.epic("MTS Shop API")
+@allure.feature("Ожидание условий")
+@pytest.mark.api
+class TestWaitAll:
+    """wait_all: все таймауты в одной ошибке, прочие ошибки пробрасываются"""
+
+    @pytest.fixture(autouse=True)
+    def fake_asyncio_sleep(self, clock, monkeypatch):
+        async def fake_sleep(seconds):
+            clock.sleep(seconds)
+
+        monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+
+    @allure.title("WAIT-001: Результаты всех условий по именам")
+    def test_all_results(self, clock):
+        async def async_condition():
+            return "async"
+
+        results = asyncio.run(wait_all({
+            "sync": lambda: "sync",
+            "async": async_condition,
+            "later": becomes_true_at(clock, clock.now + 0.5, "later"),
+        }, timeout=5, limit=2))
+
+        assert results == {"sync": "sync", "async": "async", "later": "later"}
+
+    @allure.title("WAIT-002: PollTimeout перечисляет все невыполненные условия")
+    def test_lists_every_timed_out_name(self, clock):
+        conditions = {"order-1": lambda: True, "order-2": lambda: False, "order-3": lambda: None}
+
+        with pytest.raises(PollTimeout) as error:
+            asyncio.run(wait_all(conditions, timeout=1))
+
+        message = str(error.value)
+        assert "Не выполнено 2 из 3 условий" in message
+        assert "order-2" in message and "order-3" in message
+        assert "order-1" not in message
+
+    @allure.title("WAIT-003: Ошибка условия (не таймаут) пробрасывается как есть")
+    def test_reraises_non_timeout_errors(self, clock):
+        def broken():
+            raise ValueError("неверный ответ API")
+
+        with pytest.raises(ValueError, match="неверный ответ API"):
+            asyncio.run(wait_all({"broken": broken, "slow": lambda: False}, timeout=1))
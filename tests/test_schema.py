@@ -0,0 +1,118 @@
+import pytest
+import allure
+from utils import schema
+from utils.helpers import validate_response_schema
+from utils.schema import MAX_REPORTED_ERRORS, Enum, Optional, Schema
+
+CART = Schema({
+    "id": str,
+    "items": [{"id": (str, int), "price": (int, float), "quantity": int, "name": Optional(str)}],
+    "delivery": Optional({"type": Enum("courier", "pickup"), "cost": (int, float)}),
+})
+
+
+def cart_item(**fields):
+    return {"id": "708888", "price": 100, "quantity": 1, **fields}
+
+
+@allure.epic("MTS Shop API")
+@allure.feature("Валидация схем")
+@pytest.mark.api
+class TestSchemaCache:
+    """Кэш скомпилированных схем validate_response_schema"""
+
+    @allure.title("SCHEMA-001: Литерал схемы компилируется один раз")
+    def test_literal_schema_is_compiled_once(self):
+        def validate(price):
+            return validate_response_schema(
+                {"id": "708888", "price": price, "tags": ["new"]},
+                {"id": str, "price": (int, float), "tags": [str], "name": Optional(str), "kind": Optional(Enum("a"))}
+            )
+
+        validate(100)
+        size = len(schema._compiled)
+        for price in range(50):
+            validate(price)
+
+        assert len(schema._compiled) == size
+
+    @allure.title("SCHEMA-002: Порядок полей не влияет на кэш, разные схемы не смешиваются")
+    def test_schema_key(self):
+        assert schema.schema_key({"a": str, "b": int}) == schema.schema_key({"b": int, "a": str})
+        assert schema.schema_key({"a": str}) != schema.schema_key({"a": int})
+        assert schema.compiled({"a": str}) is not schema.compiled({"a": Optional(str)})
+
+
+@allure.epic("MTS Shop API")
+@allure.feature("Валидация схем")
+@pytest.mark.api
+class TestSchemaValidation:
+    """Вложенные схемы: словари, списки, Optional, Enum и пути ошибок"""
+
+    @allure.title("SCHEMA-003: Верные вложенные данные проходят проверку")
+    def test_valid_nested_data(self):
+        data = {
+            "id": "c1",
+            "items": [cart_item(), cart_item(id=708889, price=99.5, name=None, extra="допустимо")],
+            "delivery": {"type": "pickup", "cost": 0},
+        }
+
+        assert CART.is_valid(data)
+        assert CART.errors(data) == []
+        assert CART.validate(data) is True
+
+    @allure.title("SCHEMA-004: Optional - поле может отсутствовать или быть null")
+    def test_optional(self):
+        assert CART.is_valid({"id": "c1", "items": []})
+        assert CART.is_valid({"id": "c1", "items": [], "delivery": None})
+        assert CART.errors({"id": "c1", "items": [cart_item(name=5)]}) == [
+            "$.items[0].name: ожидался str, получен int"
+        ]
+
+    @allure.title("SCHEMA-005: Enum принимает только значения из набора")
+    def test_enum(self):
+        errors = CART.errors({"id": "c1", "items": [], "delivery": {"type": "drone", "cost": 0}})
+        assert errors == ["$.delivery.type: значение 'drone' не из набора 'courier', 'pickup'"]
+        assert not CART.is_valid({"id": "c1", "items": [], "delivery": {"type": ["courier"], "cost": 0}})
+
+    @allure.title("SCHEMA-006: bool не принимается вместо числа")
+    def test_bool_is_not_int(self):
+        errors = CART.errors({"id": "c1", "items": [cart_item(quantity=True, price=False)]})
+        assert errors == [
+            "$.items[0].price: ожидался int | float, получен bool",
+            "$.items[0].quantity: ожидался int, получен bool",
+        ]
+        assert Schema({"flag": (bool, int)}).is_valid({"flag": True})
+
+    @allure.title("SCHEMA-007: Собираются все ошибки с JSON-путями")
+    def test_errors_with_paths(self):
+        items = [cart_item() for _ in range(5)]
+        items[3] = cart_item(price="100")
+        del items[1]["quantity"]
+        errors = CART.errors({"items": items, "delivery": []})
+
+        assert errors == [
+            "$.id: отсутствует обязательное поле",
+            "$.items[1].quantity: отсутствует обязательное поле",
+            "$.items[3].price: ожидался int | float, получен str",
+            "$.delivery: ожидался object, получен list",
+        ]
+        assert CART.errors({"id": "c1", "items": {}}) == ["$.items: ожидался list, получен dict"]
+
+    @allure.title("SCHEMA-008: В тексте ошибки не больше MAX_REPORTED_ERRORS")
+    def test_error_message_is_truncated(self):
+        items = [cart_item(price="?") for _ in range(MAX_REPORTED_ERRORS + 5)]
+
+        with pytest.raises(AssertionError) as error:
+            CART.validate({"id": "c1", "items": items})
+
+        lines = str(error.value).splitlines()
+        assert lines[0] == "Ошибки валидации схемы:"
+        assert len(lines) == MAX_REPORTED_ERRORS + 2
+        assert lines[1] == "$.items[0].price: ожидался int | float, получен str"
+        assert lines[-1] == "... и ещё 5"
+
+    @allure.title("SCHEMA-009: Список в схеме описывает ровно один тип элементов")
+    def test_list_schema_requires_single_item(self):
+        with pytest.raises(ValueError):
+            Schema([str, int])
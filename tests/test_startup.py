@@ -0,0 +1,65 @@
+import json
+import subprocess
+import sys
+import pytest
+import allure
+from config.config import BASE_DIR, config
+
+# Замер в отдельном процессе: в текущем всё уже импортировано
+IMPORT_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed_ms = (time.perf_counter() - start) * 1000
+print(json.dumps({{"ms": elapsed_ms, "modules": sorted(sys.modules)}}))
+"""
+
+# Модули, которые не нужны API-прогону
+BROWSER_MODULES = ("selenium", "webdriver_manager", "pages")
+
+
+def import_probe(module):
+    """Время импорта модуля (мс) и загруженные при этом модули"""
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_PROBE.format(module=module)],
+        cwd=BASE_DIR, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output)
+
+
+@allure.epic("MTS Shop API")
+@allure.feature("Запуск тестов")
+@pytest.mark.api
+class TestStartup:
+    """Время запуска и лишние импорты"""
+
+    @allure.title("START-001: conftest не загружает браузерные модули")
+    def test_conftest_imports(self):
+        probe = import_probe("tests.conftest")
+        loaded = [m for m in probe["modules"] if m.split(".")[0] in BROWSER_MODULES]
+
+        assert not loaded, f"conftest загружает браузерные модули: {', '.join(loaded[:10])}"
+        assert "aiohttp" not in probe["modules"], "conftest загружает aiohttp"
+        assert probe["ms"] <= config.IMPORT_BUDGET_MS, \
+            f"Импорт conftest занял {probe['ms']:.0f} мс > {config.IMPORT_BUDGET_MS} мс"
+
+    @allure.title("START-002: Модуль API тестов не загружает Selenium")
+    def test_api_module_imports(self):
+        probe = import_probe("tests.test_api")
+        loaded = [m for m in probe["modules"] if m.split(".")[0] in BROWSER_MODULES]
+
+        assert not loaded, f"tests.test_api загружает браузерные модули: {', '.join(loaded[:10])}"
+
+    @allure.title("START-003: Импорт config не читает настройки")
+    def test_config_is_lazy(self):
+        probe = import_probe("config.config")
+
+        assert "dotenv" not in probe["modules"]
+        assert "config.settings" not in probe["modules"]
+
+    @allure.title("START-004: Импорт conftest не читает настройки")
+    def test_conftest_config_is_lazy(self):
+        probe = import_probe("tests.conftest")
+
+        assert "dotenv" not in probe["modules"], "conftest при импорте читает .env"
+        assert "config.settings" not in probe["modules"], "conftest при импорте загружает настройки"
@@ -0,0 +1,82 @@
+import pytest
+import allure
+from utils.transport import CircuitBreaker, CircuitOpenError
+
+
+class FakeClock:
+    """Управляемое время для time.monotonic"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr("utils.transport.time.monotonic", fake)
+    return fake
+
+
+@pytest.fixture
+def breaker(clock):
+    breaker = CircuitBreaker(threshold=2, reset_timeout=10)
+    breaker.record_failure()
+    breaker.record_failure()
+    return breaker
+
+
+@allure.epic("MTS Shop API")
+@allure.feature("Транспорт")
+@pytest.mark.api
+class TestCircuitBreaker:
+    """Размыкатель цепи: открытое и полуоткрытое состояния"""
+
+    @allure.title("BREAKER-001: После порога ошибок запросы отклоняются")
+    def test_opens_after_threshold(self, breaker):
+        assert breaker.state == CircuitBreaker.OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.check()
+
+    @allure.title("BREAKER-002: После reset_timeout пропускается один пробный запрос")
+    def test_half_open_admits_single_probe(self, breaker, clock):
+        clock.now += 10
+        breaker.check()
+
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        for _ in range(3):
+            with pytest.raises(CircuitOpenError):
+                breaker.check()
+
+    @allure.title("BREAKER-003: Успешная проба замыкает цепь")
+    def test_probe_success_closes(self, breaker, clock):
+        clock.now += 10
+        breaker.check()
+        breaker.record_success()
+
+        assert breaker.state == CircuitBreaker.CLOSED
+        breaker.check()
+        breaker.check()
+
+    @allure.title("BREAKER-004: Неудачная проба снова размыкает цепь")
+    def test_probe_failure_reopens(self, breaker, clock):
+        clock.now += 10
+        breaker.check()
+        breaker.record_failure()
+
+        assert breaker.state == CircuitBreaker.OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.check()
+        clock.now += 10
+        breaker.check()
+
+    @allure.title("BREAKER-005: Проба без результата не блокирует цепь навсегда")
+    def test_lost_probe_is_replaced(self, breaker, clock):
+        clock.now += 10
+        breaker.check()
+        clock.now += 10
+
+        breaker.check()
+        assert breaker.state == CircuitBreaker.HALF_OPEN
@@ -1,17 +1,30 @@
+import time
 import requests
 from config.config import config
+from utils.cassette import build_response
+from utils.metrics import api_metrics
+from utils.transport import Transport, circuit_breaker_for, create_session
 
 
 class ApiClient:
     """Клиент для работы с API MTS Shop"""
 
-    def __init__(self, base_url=None):
+    def __init__(self, base_url=None, cassette=None, cache=None, record_metrics=True):
         self.base_url = base_url or config.API_BASE_URL
-        self.session = requests.Session()
+        # Кассета для режимов record/replay (utils/cassette.py)
+        self.cassette = cassette
+        # Кэш ответов каталога (utils/cache.py), общий для сессии
+        self.cache = cache
+        # Служебные клиенты (очистка корзин) не попадают в тайминги тестов
+        self.record_metrics = record_metrics
+        # Менял ли клиент корзину (нужна ли очистка после теста)
+        self.cart_touched = False
+        self.session = create_session()
         self.session.headers.update({
             "Content-Type": "application/json",
             "Accept": "application/json"
         })
+        self.transport = Transport(self.session, circuit_breaker_for(self.base_url))
 
     def get_product_info(self, product_ids):
         """Получить информацию о товарах по ID"""
@@ -19,7 +32,7 @@ class ApiClient:
             product_ids = [product_ids]
 
         params = {"id": product_ids} if len(product_ids) > 1 else {"id": product_ids[0]}
-        return self._request("GET", "/products/prices", params=params)
+        return self._cached_get("/products/prices", params=params)
 
     def add_to_cart(self, product_id, quantity=1, corporate=False):
         """Добавить товар в корзину"""
@@ -28,7 +41,13 @@ class ApiClient:
             "quantity": quantity,
             "corporate": corporate
         }
-        return self._request("POST", "/cart/add", json=payload)
+        touched = self.cart_touched
+        self.cart_touched = True
+        response = self._request("POST", "/cart/add", json=payload)
+        if 400 <= response.status_code < 500:
+            # Запрос отклонён - корзина не изменилась
+            self.cart_touched = touched
+        return response
 
     def get_cart(self, corporate=False):
         """Получить содержимое корзины"""
@@ -37,12 +56,42 @@ class ApiClient:
 
     def clear_cart(self):
         """Очистить корзину"""
-        return self._request("DELETE", "/cart")
+        response = self._request("DELETE", "/cart")
+        if response.ok:
+            self.cart_touched = False
+        return response
+
+    def _cached_get(self, endpoint, params=None):
+        """GET через кэш - только для данных, которые не меняются за прогон"""
+        if self.cache is None:
+            return self._request("GET", endpoint, params=params)
+        key = self.cache.key("GET", f"{self.base_url}{endpoint}", params)
+        return self.cache.get_or_load(key, lambda: self._request("GET", endpoint, params=params))
 
     def _request(self, method, endpoint, **kwargs):
         """Базовый запрос"""
         url = f"{self.base_url}{endpoint}"
-        if "timeout" not in kwargs:
-            kwargs["timeout"] = 30
+        start = time.perf_counter()
+        try:
+            if self.cassette and self.cassette.replaying:
+                stored = self.cassette.play(method, endpoint, kwargs.get("params"), kwargs.get("json"))
+                time.sleep(self.cassette.delay(stored))
+                response = build_response(stored, method, url)
+            else:
+                response = self.transport.request(method, url, **kwargs)
+        except requests.exceptions.RequestException:
+            # Неудачный запрос тоже попадает в статистику (без статуса)
+            if self.record_metrics:
+                api_metrics.record(method, endpoint, None, 0.0, 0.0, time.perf_counter() - start)
+            raise
+
+        if self.cassette and self.cassette.recording:
+            self.cassette.record(
+                method, endpoint, kwargs.get("params"), kwargs.get("json"),
+                response.status_code, response.headers, response.content, response.timings.total
+            )
 
-        return self.session.request(method, url, **kwargs)
\ No newline at end of file
+        timings = response.timings
+        if self.record_metrics:
+            api_metrics.record(method, endpoint, response.status_code, timings.connect, timings.ttfb, timings.total)
+        return response
@@ -0,0 +1,188 @@
+"""
+Артефакты упавших тестов в фоновом потоке
+
+В потоке теста снимаются только данные из браузера (это нельзя отложить -
+после теста браузер сбрасывается): скриншот, исходный код страницы и лог
+консоли. Перекодирование, сжатие и запись на диск выполняет фоновый поток:
+- скриншот в Chrome снимается через DevTools сразу в JPEG, в других
+  браузерах PNG перекодируется в JPEG через Pillow (без него - PNG как есть);
+- одинаковые кадры (например, одна и та же страница ошибки у десятка
+  тестов) хранятся один раз, остальные файлы - жёсткие ссылки на него;
+- исходный код страницы сохраняется в gzip;
+- после ARTIFACTS_BUDGET_MB (на прогон, делится между воркерами) новые
+  артефакты не пишутся, а учитываются как пропущенные.
+"""
+import base64
+import gzip
+import hashlib
+import io
+import os
+import queue
+import threading
+from datetime import datetime
+from config.config import config
+from utils.sharding import worker_count
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+
+def capture_screenshot(driver):
+    """Скриншот (bytes, расширение): JPEG через DevTools в Chrome, иначе PNG"""
+    if hasattr(driver, "execute_cdp_cmd"):
+        result = driver.execute_cdp_cmd("Page.captureScreenshot", {
+            "format": "jpeg",
+            "quality": config.ARTIFACTS_JPEG_QUALITY,
+        })
+        return base64.b64decode(result["data"]), "jpg"
+    return driver.get_screenshot_as_png(), "png"
+
+
+def capture_console_log(driver, since=None):
+    """Сообщения консоли браузера (с момента since, секунды epoch) или [] без поддержки логов"""
+    from selenium.common.exceptions import WebDriverException
+    try:
+        entries = driver.get_log("browser")
+    except (WebDriverException, AttributeError):
+        return []
+    if since is not None:
+        entries = [entry for entry in entries if entry.get("timestamp", 0) >= since * 1000]
+    return entries
+
+
+def format_console_log(entries):
+    """Лог консоли в текстовом виде"""
+    return "\n".join(
+        f"{datetime.fromtimestamp(entry['timestamp'] / 1000):%H:%M:%S.%f} {entry['level']:<8} {entry['message']}"
+        for entry in entries
+    )
+
+
+class ArtifactWriter:
+    """Очередь артефактов и фоновый поток, который их записывает"""
+
+    def __init__(self, budget_mb=None):
+        # Бюджет читается из настроек при первой записи: модуль импортирует
+        # conftest, а настройки загружаются лениво (config/config.py)
+        self._budget_mb = budget_mb
+        self._budget_bytes = None
+        self.written_bytes = 0
+        self.saved = 0
+        self.duplicates = 0
+        self.skipped = 0
+        self.errors = []
+        # sha1 кадра -> путь к файлу, в котором он уже записан
+        self._frames = {}
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    @property
+    def budget_bytes(self):
+        """Место под артефакты этого воркера"""
+        if self._budget_bytes is None:
+            budget_mb = config.ARTIFACTS_BUDGET_MB if self._budget_mb is None else self._budget_mb
+            self._budget_bytes = budget_mb * 1024 * 1024 // worker_count()
+        return self._budget_bytes
+
+    @staticmethod
+    def screenshot_path(name, extension):
+        """Путь, по которому будет записан скриншот"""
+        if extension == "png" and Image is not None:
+            extension = "jpg"
+        return config.SCREENSHOTS_DIR / f"{name}.{extension}"
+
+    def submit(self, name, screenshot=None, page_source=None, console=None):
+        """
+        Поставить артефакты в очередь на запись
+
+        screenshot - (bytes, расширение) из capture_screenshot, page_source -
+        HTML страницы, console - записи из capture_console_log.
+        """
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="artifact-writer", daemon=True)
+                self._thread.start()
+        self._queue.put((name, screenshot, page_source, console))
+
+    def close(self):
+        """Дождаться записи всех артефактов из очереди"""
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+
+    def stats(self):
+        return {
+            "saved": self.saved,
+            "duplicates": self.duplicates,
+            "skipped": self.skipped,
+            "written_mb": round(self.written_bytes / 1024 / 1024, 1),
+        }
+
+    def _run(self):
+        while True:
+            task = self._queue.get()
+            if task is None:
+                return
+            name = task[0]
+            try:
+                self._write(*task)
+            except Exception as e:
+                # Ошибка одного артефакта не должна останавливать поток
+                self.errors.append(f"{name}: {type(e).__name__}: {e}")
+
+    def _write(self, name, screenshot, page_source, console):
+        if screenshot is not None:
+            self._write_screenshot(name, *screenshot)
+        if page_source is not None:
+            self._write_file(config.LOGS_DIR / f"{name}.html.gz", gzip.compress(page_source.encode("utf-8")))
+        if console:
+            self._write_file(
+                config.LOGS_DIR / f"{name}.console.log",
+                format_console_log(console).encode("utf-8")
+            )
+
+    def _write_screenshot(self, name, data, extension):
+        if extension == "png" and Image is not None:
+            output = io.BytesIO()
+            Image.open(io.BytesIO(data)).convert("RGB").save(output, "JPEG", quality=config.ARTIFACTS_JPEG_QUALITY)
+            data = output.getvalue()
+        path = self.screenshot_path(name, extension)
+
+        digest = hashlib.sha1(data).hexdigest()
+        existing = self._frames.get(digest)
+        if existing == path:
+            self.duplicates += 1
+            return
+        if existing is not None:
+            path.unlink(missing_ok=True)
+            try:
+                os.link(existing, path)
+                self.duplicates += 1
+                return
+            except OSError:
+                pass  # Файловая система без жёстких ссылок - храним копию
+
+        if self._write_file(path, data):
+            self._frames[digest] = path
+
+    def _write_file(self, path, data):
+        """Записать файл, если позволяет бюджет"""
+        if self.written_bytes + len(data) > self.budget_bytes:
+            self.skipped += 1
+            return False
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Старый файл может быть жёсткой ссылкой на чужой кадр - не пишем сквозь неё
+        path.unlink(missing_ok=True)
+        path.write_bytes(data)
+        self.written_bytes += len(data)
+        self.saved += 1
+        return True
+
+
+# Запись артефактов текущей сессии pytest
+artifacts = ArtifactWriter()
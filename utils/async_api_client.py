@@ -0,0 +1,210 @@
+"""
+Асинхронный клиент API MTS Shop
+
+Те же методы, что у ApiClient, но на asyncio/aiohttp. Метод gather
+выполняет много запросов одновременно с ограничением параллельности, чтобы
+проверять цены тысяч товаров или сотни корзин за время нескольких запросов.
+
+Пример:
+async def main():
+    async with AsyncApiClient() as client:
+        responses = await client.get_prices(product_ids)
+
+asyncio.run(main())
+
+aiohttp импортируется при первом запросе: сбор тестов и кассеты в режиме
+replay обходятся без него.
+"""
+import asyncio
+import json
+import time
+from datetime import timedelta
+from config.config import config
+from utils.cassette import stored_content
+from utils.transport import RetryPolicy, circuit_breaker_for
+
+
+class AsyncResponse:
+    """Ответ асинхронного клиента (интерфейс как у requests.Response)"""
+
+    def __init__(self, method, url, status_code, headers, content, elapsed):
+        self.method = method
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.elapsed = elapsed
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+    def __repr__(self):
+        return f"<AsyncResponse [{self.status_code}] {self.method} {self.url}>"
+
+
+class AsyncApiClient:
+    """Асинхронный клиент для работы с API MTS Shop"""
+
+    def __init__(self, base_url=None, concurrency=None, cassette=None):
+        self.base_url = base_url or config.API_BASE_URL
+        # Кассета для режимов record/replay (utils/cassette.py)
+        self.cassette = cassette
+        self.concurrency = concurrency or config.API_CONCURRENCY
+        self.retry_policy = RetryPolicy()
+        self.breaker = circuit_breaker_for(self.base_url)
+        # Слушатели ответов: listener(method, endpoint, status_code, seconds),
+        # status_code = None, если запрос завершился исключением
+        self.listeners = []
+        self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        """Закрыть HTTP-сессию"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def get_product_info(self, product_ids):
+        """Получить информацию о товарах по ID"""
+        if isinstance(product_ids, str):
+            product_ids = [product_ids]
+
+        params = {"id": product_ids} if len(product_ids) > 1 else {"id": product_ids[0]}
+        return await self._request("GET", "/products/prices", params=params)
+
+    async def add_to_cart(self, product_id, quantity=1, corporate=False):
+        """Добавить товар в корзину"""
+        payload = {
+            "id": product_id,
+            "quantity": quantity,
+            "corporate": corporate
+        }
+        return await self._request("POST", "/cart/add", json=payload)
+
+    async def get_cart(self, corporate=False):
+        """Получить содержимое корзины"""
+        params = {"corporate": str(corporate).lower()}
+        return await self._request("GET", "/cart", params=params)
+
+    async def clear_cart(self):
+        """Очистить корзину"""
+        return await self._request("DELETE", "/cart")
+
+    async def gather(self, calls, limit=None, return_exceptions=False):
+        """
+        Выполнить вызовы одновременно, не более limit за раз
+
+        calls - функции без аргументов, возвращающие корутины (например
+        lambda: client.get_cart()). Результаты - в порядке вызовов.
+        """
+        semaphore = asyncio.Semaphore(limit or self.concurrency)
+
+        async def run(call):
+            async with semaphore:
+                return await call()
+
+        return await asyncio.gather(*(run(call) for call in calls), return_exceptions=return_exceptions)
+
+    async def get_prices(self, product_ids, chunk_size=50, limit=None):
+        """Получить цены множества товаров пачками по chunk_size ID"""
+        product_ids = list(product_ids)
+        chunks = [product_ids[i:i + chunk_size] for i in range(0, len(product_ids), chunk_size)]
+        return await self.gather([lambda chunk=chunk: self.get_product_info(chunk) for chunk in chunks], limit)
+
+    async def _get_session(self):
+        import aiohttp
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                headers={
+                    "Content-Type": "application/json",
+                    "Accept": "application/json"
+                },
+                connector=aiohttp.TCPConnector(limit=self.concurrency),
+                timeout=aiohttp.ClientTimeout(
+                    sock_connect=config.API_CONNECT_TIMEOUT,
+                    sock_read=config.API_READ_TIMEOUT
+                ),
+            )
+        return self._session
+
+    async def _request(self, method, endpoint, params=None, **kwargs):
+        """Базовый запрос"""
+        url = f"{self.base_url}{endpoint}"
+        if self.cassette and self.cassette.replaying:
+            return await self._replay(method, endpoint, url, params, kwargs.get("json"))
+
+        import aiohttp
+        session = await self._get_session()
+        raw_params = params
+
+        # aiohttp не принимает списки в params - разворачиваем в пары
+        if params:
+            params = [
+                (key, str(item))
+                for key, value in params.items()
+                for item in (value if isinstance(value, (list, tuple)) else [value])
+            ]
+
+        # Повторы и размыкатель цепи - как в синхронном ApiClient (utils/transport.py)
+        attempt = 0
+        while True:
+            self.breaker.check()
+            start = time.perf_counter()
+            try:
+                async with session.request(method, url, params=params, **kwargs) as response:
+                    content = await response.read()
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                self.breaker.record_failure()
+                if not self.retry_policy.can_retry(method, attempt):
+                    self._notify(method, endpoint, None, time.perf_counter() - start)
+                    raise
+                await asyncio.sleep(self.retry_policy.delay(attempt))
+                attempt += 1
+                continue
+            elapsed = timedelta(seconds=time.perf_counter() - start)
+
+            if response.status >= 500:
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+
+            if self.retry_policy.should_retry_status(method, response.status, attempt):
+                await asyncio.sleep(self.retry_policy.delay(attempt, response.headers.get("Retry-After")))
+                attempt += 1
+                continue
+
+            if self.cassette and self.cassette.recording:
+                self.cassette.record(
+                    method, endpoint, raw_params, kwargs.get("json"),
+                    response.status, response.headers, content, elapsed.total_seconds()
+                )
+
+            self._notify(method, endpoint, response.status, elapsed.total_seconds())
+            return AsyncResponse(method, str(response.url), response.status, dict(response.headers), content, elapsed)
+
+    async def _replay(self, method, endpoint, url, params, body):
+        """Ответ из кассеты (без сети)"""
+        stored = self.cassette.play(method, endpoint, params, body)
+        await asyncio.sleep(self.cassette.delay(stored))
+        self._notify(method, endpoint, stored["status_code"], stored["elapsed"])
+        return AsyncResponse(
+            method, url, stored["status_code"], stored["headers"], stored_content(stored),
+            timedelta(seconds=stored["elapsed"])
+        )
+
+    def _notify(self, method, endpoint, status_code, seconds):
+        for listener in self.listeners:
+            listener(method, endpoint, status_code, seconds)
@@ -0,0 +1,165 @@
+"""
+Кэш ответов API для неизменяемых данных каталога
+
+Цены и описания товаров за время прогона не меняются, а тесты запрашивают
+одни и те же товары снова и снова. Кэш хранит успешные ответы:
+- запись живёт ttl секунд;
+- при превышении max_size вытесняется самая давно не использованная (LRU);
+- одинаковые одновременные запросы объединяются: к бэкенду уходит один,
+  остальные потоки ждут его ответ;
+- если задан API_CACHE_FILE, записи сохраняются на диск между запусками.
+
+Каждый вызов получает свой экземпляр requests.Response, собранный из
+сохранённого ответа (формат как в кассетах).
+"""
+import gzip
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from config.config import config
+from utils.cassette import build_response, serialize_response
+
+
+class ResponseCache:
+    """Кэш ответов с TTL, LRU-вытеснением и объединением запросов"""
+
+    def __init__(self, ttl=None, max_size=None, path=None):
+        self.ttl = config.API_CACHE_TTL if ttl is None else ttl
+        self.max_size = max_size or config.API_CACHE_SIZE
+        path = path or config.API_CACHE_FILE
+        self.path = Path(path) if path else None
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+        # key -> {"expires_at", "method", "url", "response"}
+        self._entries = OrderedDict()
+        # key -> threading.Event запроса, который сейчас выполняется
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        if self.path:
+            self._entries.update(self._read())
+            self._evict()
+
+    @staticmethod
+    def key(method, url, params=None):
+        """Ключ запроса (порядок значений параметра важен - от него зависит ответ)"""
+        query = sorted(
+            (name, [str(item) for item in (value if isinstance(value, (list, tuple)) else [value])])
+            for name, value in (params or {}).items()
+        )
+        return json.dumps([method.upper(), url, query], ensure_ascii=False)
+
+    def get_or_load(self, key, loader):
+        """
+        Ответ из кэша или loader()
+
+        Пока один поток выполняет loader для ключа, остальные ждут и получают
+        его ответ. Неуспешный ответ не кэшируется - ожидающий поток тогда
+        запрашивает сам.
+        """
+        waited = False
+        while True:
+            with self._lock:
+                entry = self._get(key)
+                if entry is not None:
+                    if waited:
+                        self.coalesced += 1
+                    else:
+                        self.hits += 1
+                    return build_response(entry["response"], entry["method"], entry["url"])
+
+                event = self._inflight.get(key)
+                if event is None:
+                    event = self._inflight[key] = threading.Event()
+                    self.misses += 1
+                    break
+            event.wait()
+            waited = True
+
+        try:
+            response = loader()
+            if response.ok:
+                self.put(key, response)
+            return response
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            event.set()
+
+    def put(self, key, response):
+        """Сохранить ответ"""
+        entry = {
+            "expires_at": time.time() + self.ttl,
+            "method": response.request.method if response.request else "GET",
+            "url": response.url,
+            "response": serialize_response(
+                response.status_code, response.headers, response.content, response.elapsed.total_seconds()
+            ),
+        }
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            self._evict()
+            self._dirty = True
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._dirty = True
+
+    def stats(self):
+        return {"hits": self.hits, "coalesced": self.coalesced, "misses": self.misses, "size": len(self._entries)}
+
+    def save(self):
+        """Сохранить записи на диск (слияние с файлом - его могут писать несколько воркеров)"""
+        if not self.path or not self._dirty:
+            return
+
+        with self._lock:
+            merged = self._read()
+            merged.update(self._entries)
+            entries = OrderedDict(
+                (key, entry) for key, entry in merged.items() if entry["expires_at"] > time.time()
+            )
+            # Лишние записи отбрасываем с начала - это записи с диска, не использованные в этом прогоне
+            while len(entries) > self.max_size:
+                entries.popitem(last=False)
+            self._dirty = False
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = json.dumps(entries, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(gzip.compress(data))
+        os.replace(tmp_path, self.path)
+
+    def _get(self, key):
+        """Живая запись или None (вызывать под self._lock)"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry["expires_at"] <= time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _evict(self):
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def _read(self):
+        try:
+            entries = json.loads(gzip.decompress(self.path.read_bytes()).decode("utf-8"))
+        except (OSError, EOFError, ValueError):
+            return OrderedDict()
+        return OrderedDict(
+            (key, entry) for key, entry in entries.items() if entry["expires_at"] > time.time()
+        )
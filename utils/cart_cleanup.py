@@ -0,0 +1,84 @@
+"""
+Отложенная очистка корзин
+
+Корзина магазина привязана к cookie сессии: у каждого ApiClient своя
+сессия, а браузер из пула после теста теряет cookies. Следующий тест и так
+начинает с пустой корзиной, очистка нужна только чтобы не оставлять товары
+на стенде - поэтому её можно отложить.
+
+Тест ставит cookies своей сессии в очередь, только если менял корзину
+(ApiClient.cart_touched, BasePage.mark_cart_touched). Очередь воркера
+очищается пачками по CART_CLEANUP_BATCH параллельными запросами и в конце
+сессии, ошибки попадают в итоги прогона. Пачка уходит в teardown того
+теста, который её заполнил, поэтому запросы очистки не записываются в
+тайминги API (иначе они попали бы в Allure и perf_budget чужого теста).
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from config.config import config
+from utils.api_client import ApiClient
+
+
+def browser_cookies(driver):
+    """Cookies текущего сайта браузера в виде cookie jar для requests"""
+    jar = requests.cookies.RequestsCookieJar()
+    for cookie in driver.get_cookies():
+        jar.set(cookie["name"], cookie["value"], domain=cookie.get("domain", ""), path=cookie.get("path", "/"))
+    return jar
+
+
+class CartCleaner:
+    """Очередь корзин на очистку (одна на воркер)"""
+
+    def __init__(self, batch_size=None, concurrency=None):
+        self.batch_size = batch_size or config.CART_CLEANUP_BATCH
+        self.concurrency = concurrency or config.API_CONCURRENCY
+        self.cleaned = 0
+        # (тест, сообщение об ошибке)
+        self.failures = []
+        self._pending = []
+        self._lock = threading.Lock()
+
+    def schedule(self, label, cookies):
+        """Поставить в очередь корзину сессии с cookies (label - для отчёта об ошибке)"""
+        with self._lock:
+            self._pending.append((label, cookies))
+            if len(self._pending) < self.batch_size:
+                return
+            batch, self._pending = self._pending, []
+        self._clean(batch)
+
+    def flush(self):
+        """Очистить все корзины из очереди"""
+        with self._lock:
+            batch, self._pending = self._pending, []
+        if batch:
+            self._clean(batch)
+
+    def _clean(self, batch):
+        with ThreadPoolExecutor(max_workers=min(self.concurrency, len(batch))) as executor:
+            results = list(executor.map(lambda item: self._clean_one(*item), batch))
+
+        with self._lock:
+            for label, error in results:
+                if error:
+                    self.failures.append((label, error))
+                else:
+                    self.cleaned += 1
+
+    @staticmethod
+    def _clean_one(label, cookies):
+        """(label, None) или (label, текст ошибки)"""
+        client = ApiClient(record_metrics=False)
+        client.session.cookies.update(cookies)
+        try:
+            response = client.clear_cart()
+        except requests.exceptions.RequestException as e:
+            return label, f"{type(e).__name__}: {e}"
+        finally:
+            client.session.close()
+
+        if not response.ok:
+            return label, f"HTTP {response.status_code}: {response.text[:200]}"
+        return label, None
@@ -0,0 +1,151 @@
+"""
+Запись и воспроизведение HTTP-взаимодействий API (кассеты)
+
+Режим задаётся API_MODE:
+- live   - обычные запросы к магазину;
+- record - запросы к магазину, пары запрос/ответ сохраняются в кассету;
+- replay - ответы берутся из кассеты, сеть не используется.
+
+Запросы сопоставляются по методу, эндпоинту, параметрам запроса (порядок не
+важен) и JSON-телу (порядок ключей не важен); отдельные параметры и поля
+тела можно исключить из сравнения. Одинаковые запросы воспроизводятся в
+порядке записи, после последней записи повторяется последний ответ.
+Кассета - сжатый gzip JSON, по одному файлу на тест.
+"""
+import base64
+import gzip
+import json
+from datetime import timedelta
+import requests
+from requests.structures import CaseInsensitiveDict
+from config.config import config
+from utils.transport import RequestTimings
+
+
+# Заголовки, которые не имеют смысла для уже раскодированного тела
+SKIPPED_HEADERS = {"content-encoding", "transfer-encoding", "content-length"}
+
+
+class CassetteMissError(requests.exceptions.RequestException):
+    """В кассете нет подходящей записи для запроса"""
+
+
+class Cassette:
+    """Кассета с записанными взаимодействиями одного теста"""
+
+    def __init__(self, path, mode=None, ignore_params=None, ignore_body_fields=None, latency_factor=None):
+        self.path = path
+        self.mode = mode or config.API_MODE
+        self.ignore_params = set(config.CASSETTE_IGNORE_PARAMS if ignore_params is None else ignore_params)
+        self.ignore_body_fields = set(
+            config.CASSETTE_IGNORE_BODY_FIELDS if ignore_body_fields is None else ignore_body_fields
+        )
+        self.latency_factor = config.CASSETTE_LATENCY_FACTOR if latency_factor is None else latency_factor
+
+        self.interactions = []
+        self._played = {}
+        if self.mode == "replay":
+            self.interactions = self._load()
+
+    @classmethod
+    def for_test(cls, node, **kwargs):
+        """Кассета теста: CASSETTE_DIR/<модуль>/<тест>.json.gz"""
+        module = node.path.stem if hasattr(node, "path") else node.module.__name__
+        name = node.name.replace("/", "_")
+        return cls(config.CASSETTE_DIR / module / f"{name}.json.gz", **kwargs)
+
+    @property
+    def replaying(self):
+        return self.mode == "replay"
+
+    @property
+    def recording(self):
+        return self.mode == "record"
+
+    def key(self, method, endpoint, params=None, body=None):
+        """Ключ сопоставления запроса"""
+        query = sorted(
+            (name, str(item))
+            for name, value in (params or {}).items()
+            if name not in self.ignore_params
+            for item in (value if isinstance(value, (list, tuple)) else [value])
+        )
+        if isinstance(body, dict):
+            body = {field: value for field, value in body.items() if field not in self.ignore_body_fields}
+        body = json.dumps(body, sort_keys=True, ensure_ascii=False, separators=(",", ":")) if body is not None else ""
+        return json.dumps([method.upper(), endpoint, query, body], ensure_ascii=False)
+
+    def play(self, method, endpoint, params=None, body=None):
+        """Записанный ответ на запрос (dict)"""
+        key = self.key(method, endpoint, params, body)
+        matches = [item["response"] for item in self.interactions if item["key"] == key]
+        if not matches:
+            raise CassetteMissError(
+                f"Нет записи для {method} {endpoint} (params={params}, body={body}) в кассете {self.path}"
+            )
+
+        index = self._played.get(key, 0)
+        self._played[key] = index + 1
+        return matches[min(index, len(matches) - 1)]
+
+    def delay(self, stored):
+        """Имитируемая задержка ответа: записанное время * latency_factor"""
+        return stored["elapsed"] * self.latency_factor
+
+    def record(self, method, endpoint, params, body, status_code, headers, content, elapsed):
+        """Добавить взаимодействие в кассету"""
+        self.interactions.append({
+            "key": self.key(method, endpoint, params, body),
+            "response": serialize_response(status_code, headers, content, elapsed),
+        })
+
+    def save(self):
+        """Сохранить записанные взаимодействия"""
+        if not self.recording or not self.interactions:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = json.dumps(self.interactions, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        self.path.write_bytes(gzip.compress(data))
+
+    def _load(self):
+        try:
+            return json.loads(gzip.decompress(self.path.read_bytes()).decode("utf-8"))
+        except FileNotFoundError:
+            return []
+
+
+def serialize_response(status_code, headers, content, elapsed):
+    """Ответ в виде JSON-совместимого dict (тело - utf-8 текст или base64)"""
+    try:
+        stored_body, encoding = content.decode("utf-8"), "utf-8"
+    except UnicodeDecodeError:
+        stored_body, encoding = base64.b64encode(content).decode("ascii"), "base64"
+
+    return {
+        "status_code": status_code,
+        "headers": {name: value for name, value in headers.items() if name.lower() not in SKIPPED_HEADERS},
+        "body": stored_body,
+        "encoding": encoding,
+        "elapsed": elapsed,
+    }
+
+
+def stored_content(stored):
+    """Тело записанного ответа в байтах"""
+    if stored["encoding"] == "base64":
+        return base64.b64decode(stored["body"])
+    return stored["body"].encode("utf-8")
+
+
+def build_response(stored, method, url):
+    """requests.Response из записанного ответа"""
+    response = requests.Response()
+    response.status_code = stored["status_code"]
+    response.headers = CaseInsensitiveDict(stored["headers"])
+    response._content = stored_content(stored)
+    response.encoding = "utf-8"
+    response.url = url
+    response.elapsed = timedelta(seconds=stored["elapsed"])
+    response.request = requests.Request(method, url).prepare()
+    response.timings = RequestTimings(connect=0.0, ttfb=stored["elapsed"], total=stored["elapsed"])
+    return response
@@ -0,0 +1,132 @@
+"""
+Профилирование команд WebDriver
+
+Каждая команда драйвера - отдельный HTTP-запрос к chromedriver или гриду.
+CommandProfiler оборачивает command_executor.execute драйвера, засекает
+время каждой команды и приписывает её методу page object, из которого она
+вызвана (самому внешнему: CartPage.get_items_count, а не BasePage.probe).
+Команды вне page objects (тест, фикстуры) попадают в группу "driver".
+
+Маркер webdriver_budget(N) в тесте ограничивает число команд (см. conftest).
+"""
+import json
+import sys
+import threading
+import time
+from config.config import BASE_DIR
+from utils.metrics import LatencyStats
+
+# Команды из файлов этой директории приписываются методам page objects
+PAGES_DIR = str(BASE_DIR / "pages")
+
+# Группа команд, отправленных не из page objects
+DIRECT_CALLER = "driver"
+
+
+def page_object_caller(frame):
+    """Самый внешний метод page object в стеке вызовов ("CartPage.is_empty")"""
+    caller = None
+    while frame is not None:
+        code = frame.f_code
+        if code.co_filename.startswith(PAGES_DIR):
+            owner = frame.f_locals.get("self")
+            caller = f"{type(owner).__name__}.{code.co_name}" if owner is not None else code.co_name
+        frame = frame.f_back
+    return caller or DIRECT_CALLER
+
+
+def is_error_response(response):
+    """Ответ W3C с ошибкой (например, no such element при ожидании)"""
+    if not isinstance(response, dict):
+        return False
+    value = response.get("value")
+    return isinstance(value, dict) and "error" in value
+
+
+class CommandProfiler:
+    """
+    Команды всех драйверов за сессию
+
+    Каждая команда хранится с именем, вызвавшим методом page object,
+    длительностью (секунды) и признаком ошибки. mark() и since() позволяют
+    выделить команды одного теста.
+    """
+
+    def __init__(self):
+        self.samples = []
+        self._lock = threading.Lock()
+
+    def instrument(self, driver):
+        """Обернуть command_executor драйвера (повторный вызов ничего не меняет)"""
+        executor = driver.command_executor
+        if getattr(executor, "profiled", False):
+            return driver
+        execute = executor.execute
+
+        def profiled_execute(command, params=None):
+            caller = page_object_caller(sys._getframe(1))
+            start = time.perf_counter()
+            try:
+                response = execute(command, params)
+            except Exception:
+                self.record(command, caller, time.perf_counter() - start, ok=False)
+                raise
+            self.record(command, caller, time.perf_counter() - start, ok=not is_error_response(response))
+            return response
+
+        executor.execute = profiled_execute
+        executor.profiled = True
+        return driver
+
+    def record(self, command, caller, seconds, ok=True):
+        with self._lock:
+            self.samples.append({"command": command, "caller": caller, "seconds": seconds, "ok": ok})
+
+    def mark(self):
+        """Позиция для since() - обычно начало теста"""
+        return len(self.samples)
+
+    def since(self, mark):
+        return self.samples[mark:]
+
+    def stats(self, samples=None):
+        """LatencyStats по вызвавшим методам"""
+        groups = {}
+        for sample in self.samples if samples is None else samples:
+            groups.setdefault(sample["caller"], LatencyStats()).record(sample["seconds"], ok=sample["ok"])
+        return groups
+
+    def summary(self, samples=None):
+        """
+        Сводка по методам, самые "разговорчивые" - первыми:
+        {метод: {"count", "errors", "total_ms", "commands": {команда: n}}}
+        """
+        samples = self.samples if samples is None else samples
+        commands = {}
+        for sample in samples:
+            counts = commands.setdefault(sample["caller"], {})
+            counts[sample["command"]] = counts.get(sample["command"], 0) + 1
+
+        result = {}
+        stats = self.stats(samples)
+        for caller in sorted(stats, key=lambda name: (-stats[name].count, name)):
+            result[caller] = {
+                "count": stats[caller].count,
+                "errors": stats[caller].errors,
+                "total_ms": round(sum(stats[caller].values) * 1000, 1),
+                "commands": dict(sorted(commands[caller].items(), key=lambda item: -item[1])),
+            }
+        return result
+
+    def save(self, path):
+        """Сохранить сводку и сырые данные в JSON"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({
+            "summary": self.summary(),
+            "samples": self.samples,
+        }, ensure_ascii=False, indent=2), encoding="utf-8")
+        return path
+
+
+# Команды WebDriver текущей сессии pytest
+webdriver_commands = CommandProfiler()
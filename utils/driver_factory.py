@@ -0,0 +1,181 @@
+"""
+Фабрика и пул веб-драйверов
+
+Браузер запускается один раз на сессию (воркер) и переиспользуется между
+тестами: после каждого теста состояние сбрасывается (cookies, storage,
+лишние вкладки), а после N тестов браузер пересоздаётся.
+"""
+import time
+from selenium import webdriver
+from selenium.common.exceptions import SessionNotCreatedException, WebDriverException
+from selenium.webdriver.chrome.service import Service as ChromeService
+from selenium.webdriver.firefox.service import Service as FirefoxService
+from config.config import config
+from utils.command_profiler import webdriver_commands
+from utils.driver_resolver import resolver
+from utils.network_profiles import apply_profile
+from utils.page_load import block_urls, blocked_patterns, get_profile
+from utils.page_scripts import PAGE_TRACKER_JS
+
+
+class DriverFactory:
+    """Создание веб-драйверов по настройкам конфигурации"""
+
+    def __init__(self, browser=None, headless=None, load_profile=None):
+        self.browser = (browser or config.BROWSER).lower()
+        self.headless = config.HEADLESS if headless is None else headless
+        # Профиль загрузки страниц (utils/page_load.py)
+        self.load_profile = get_profile(load_profile or config.PAGE_LOAD_PROFILE)
+        self.page_load_strategy = config.PAGE_LOAD_STRATEGY or self.load_profile["strategy"]
+
+    def create(self):
+        """Запустить новый браузер"""
+        if self.browser == "chrome":
+            driver = self._create_chrome()
+        elif self.browser == "firefox":
+            driver = self._create_firefox()
+        else:
+            raise ValueError(f"Unsupported browser: {self.browser}")
+
+        # Настройки драйвера. Неявное ожидание отключено: page objects ждут
+        # явно (IMPLICIT_WAIT - их таймаут по умолчанию), а неявное ожидание
+        # растягивало каждую проверку отсутствия элемента на весь таймаут
+        driver.implicitly_wait(0)
+        driver.set_page_load_timeout(config.PAGE_LOAD_TIMEOUT)
+
+        # Счётчик команд WebDriver по методам page objects
+        return webdriver_commands.instrument(driver)
+
+    def _create_chrome(self):
+        options = webdriver.ChromeOptions()
+        options.page_load_strategy = self.page_load_strategy
+        if self.headless:
+            options.add_argument("--headless")
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-dev-shm-usage")
+        options.add_argument("--disable-gpu")
+        options.add_argument(f"--window-size={config.WINDOW_WIDTH},{config.WINDOW_HEIGHT}")
+        # Лог консоли браузера - для артефактов упавших тестов
+        # и сетевые события DevTools - для метрик страниц (PAGE_PERF_DEVTOOLS)
+        logging_prefs = {"browser": "ALL"}
+        if config.PAGE_PERF_DEVTOOLS:
+            logging_prefs["performance"] = "ALL"
+        options.set_capability("goog:loggingPrefs", logging_prefs)
+
+        driver = self._start("chrome", lambda path: webdriver.Chrome(service=ChromeService(path), options=options))
+
+        # Трекер запросов/мутаций ставится до скриптов страницы на каждой навигации
+        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": PAGE_TRACKER_JS})
+
+        # Счётчики, чаты и реклама не нужны функциональным тестам
+        patterns = blocked_patterns(self.load_profile, config.BLOCKLIST_FILE)
+        if patterns:
+            block_urls(driver, patterns)
+        return driver
+
+    def _create_firefox(self):
+        options = webdriver.FirefoxOptions()
+        options.page_load_strategy = self.page_load_strategy
+        if self.headless:
+            options.add_argument("--headless")
+
+        driver = self._start("firefox", lambda path: webdriver.Firefox(service=FirefoxService(path), options=options))
+        driver.set_window_size(config.WINDOW_WIDTH, config.WINDOW_HEIGHT)
+        return driver
+
+    @staticmethod
+    def _start(browser, launch):
+        """
+        Запустить браузер с закреплённым драйвером
+
+        Если драйвер не подходит к версии браузера (браузер обновился),
+        lock-запись сбрасывается и драйвер ищется заново - одна попытка.
+        """
+        try:
+            return launch(resolver.resolve(browser))
+        except SessionNotCreatedException as e:
+            if "version" not in str(e).lower():
+                raise
+            resolver.invalidate(browser)
+            return launch(resolver.resolve(browser))
+
+
+class DriverPool:
+    """Пул прогретых браузеров на одну сессию pytest"""
+
+    def __init__(self, factory=None, size=None, recycle_after=None):
+        self.factory = factory or DriverFactory()
+        self.size = config.DRIVER_POOL_SIZE if size is None else size
+        self.recycle_after = config.DRIVER_RECYCLE_AFTER if recycle_after is None else recycle_after
+        self._idle = []
+        self._uses = {}
+
+    def acquire(self):
+        """Взять браузер из пула (или запустить новый)"""
+        if self._idle:
+            driver = self._idle.pop()
+        else:
+            driver = self.factory.create()
+            self._uses[id(driver)] = 0
+            # Отметка page objects, что тест менял корзину (см. utils/cart_cleanup.py)
+            driver.cart_touched = False
+            # Сетевой профиль теста (utils/network_profiles.py)
+            driver.network_profile = None
+
+        # С этого момента лог консоли относится к текущему тесту
+        driver.acquired_at = time.time()
+        return driver
+
+    def release(self, driver):
+        """Вернуть браузер в пул после теста"""
+        uses = self._uses.get(id(driver), 0) + 1
+        self._uses[id(driver)] = uses
+
+        if uses >= self.recycle_after or len(self._idle) >= self.size:
+            self._quit(driver)
+            return
+
+        try:
+            self.reset(driver)
+        except WebDriverException:
+            # Браузер в неисправном состоянии - пересоздадим при следующем запросе
+            self._quit(driver)
+            return
+
+        self._idle.append(driver)
+
+    def reset(self, driver):
+        """Сбросить состояние браузера между тестами"""
+        if driver.network_profile:
+            apply_profile(driver, None)
+
+        # Закрываем лишние вкладки
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+
+        if self.factory.browser == "chrome":
+            # Через DevTools очищаем cookies всех доменов, а не только текущего
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        else:
+            driver.delete_all_cookies()
+
+        # Storage доступен только на http(s)-странице, поэтому чистим до about:blank
+        if driver.current_url.startswith("http"):
+            driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+        driver.get("about:blank")
+        driver.cart_touched = False
+
+    def close(self):
+        """Закрыть все браузеры пула"""
+        while self._idle:
+            self._quit(self._idle.pop())
+
+    def _quit(self, driver):
+        self._uses.pop(id(driver), None)
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
@@ -0,0 +1,151 @@
+"""
+Поиск бинарников веб-драйверов без сети
+
+Драйвер ищется один раз на машину и закрепляется в lock-файле рядом с
+config/config.py. Дальше lock-файл работает полностью офлайн; если
+webdriver_manager недоступен (нет сети), берётся бинарник из PATH - причина
+выдаётся предупреждением и записывается в lock-файл (fallback_reason).
+
+Вместе с путём запоминается мажорная версия браузера: после обновления
+браузера закреплённый драйвер перестаёт ему подходить, и драйвер ищется
+заново. То же происходит, если браузер не запустился из-за несовпадения
+версий (DriverFactory вызывает invalidate).
+"""
+import json
+import os
+import platform
+import re
+import shutil
+import subprocess
+import tempfile
+import warnings
+from datetime import datetime
+from pathlib import Path
+from config.config import config
+
+# Имена бинарников драйверов в PATH
+DRIVER_BINARIES = {
+    "chrome": "chromedriver",
+    "firefox": "geckodriver",
+}
+
+# Бинарники браузеров для определения версии (первый найденный в PATH)
+BROWSER_BINARIES = {
+    "chrome": ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome"),
+    "firefox": ("firefox",),
+}
+
+
+def browser_major_version(browser):
+    """Мажорная версия установленного браузера ("120"), None - не удалось определить"""
+    for name in BROWSER_BINARIES.get(browser, ()):
+        binary = shutil.which(name)
+        if not binary:
+            continue
+        try:
+            output = subprocess.run([binary, "--version"], capture_output=True, text=True, timeout=10).stdout
+        except (OSError, subprocess.SubprocessError):
+            continue
+        match = re.search(r"(\d+)\.\d+", output)
+        if match:
+            return match.group(1)
+    return None
+
+
+class DriverResolver:
+    """Поиск драйвера: lock-файл -> webdriver_manager -> PATH"""
+
+    def __init__(self, lock_file=None, offline=None):
+        self.lock_file = Path(lock_file or config.DRIVER_LOCK_FILE)
+        self.offline = config.DRIVER_OFFLINE if offline is None else offline
+        self._resolved = {}
+
+    def resolve(self, browser):
+        """Путь к драйверу для браузера (None - отдать выбор Selenium Manager)"""
+        if browser in self._resolved:
+            return self._resolved[browser]
+
+        version = browser_major_version(browser)
+        path = self._from_lock(browser, version)
+        if path is None:
+            path, source, reason = self._lookup(browser)
+            if path:
+                self._write_lock(browser, path, source, version, reason)
+
+        self._resolved[browser] = path
+        return path
+
+    def invalidate(self, browser):
+        """Забыть закреплённый драйвер (не подошёл к браузеру) - следующий resolve ищет заново"""
+        self._resolved.pop(browser, None)
+        data = self._read_lock()
+        if data.pop(browser, None) is not None:
+            self._save_lock(data)
+
+    def _from_lock(self, browser, version):
+        """Закреплённый путь, если бинарник на месте и браузер не обновлялся"""
+        entry = self._read_lock().get(browser)
+        if not entry or entry.get("machine") != platform.node():
+            return None
+        if entry.get("browser_version") != version:
+            return None
+        if not Path(entry["path"]).is_file():
+            return None
+        return entry["path"]
+
+    def _lookup(self, browser):
+        """Найти драйвер заново: (путь, источник, почему не сработал webdriver_manager)"""
+        if browser not in DRIVER_BINARIES:
+            raise ValueError(f"Unsupported browser: {browser}")
+
+        reason = None
+        if not self.offline:
+            try:
+                return self._install(browser), "webdriver_manager", None
+            except Exception as e:
+                # Нет сети или недоступен репозиторий драйверов - пробуем PATH
+                reason = f"{type(e).__name__}: {e}"
+                warnings.warn(f"webdriver_manager не смог найти {browser}-драйвер ({reason}), ищем в PATH",
+                              RuntimeWarning, stacklevel=2)
+
+        return shutil.which(DRIVER_BINARIES[browser]), "path", reason
+
+    def _install(self, browser):
+        """Скачать/найти драйвер через webdriver_manager"""
+        if browser == "chrome":
+            from webdriver_manager.chrome import ChromeDriverManager
+            return ChromeDriverManager().install()
+
+        from webdriver_manager.firefox import GeckoDriverManager
+        return GeckoDriverManager().install()
+
+    def _read_lock(self):
+        try:
+            return json.loads(self.lock_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def _write_lock(self, browser, path, source, version, reason=None):
+        data = self._read_lock()
+        data[browser] = {
+            "path": str(path),
+            "source": source,
+            "machine": platform.node(),
+            "browser_version": version,
+            "resolved_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        if reason:
+            # Почему драйвер взят из PATH, а не от webdriver_manager
+            data[browser]["fallback_reason"] = reason
+        self._save_lock(data)
+
+    def _save_lock(self, data):
+        """Атомарно обновить lock-файл (его могут писать несколько воркеров)"""
+        fd, tmp_path = tempfile.mkstemp(dir=self.lock_file.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.lock_file)
+
+
+# Общий экземпляр: драйвер ищется один раз на процесс
+resolver = DriverResolver()
@@ -1,8 +1,9 @@
 import random
 import string
 from datetime import datetime
-from typing import Dict, Any
-from utils import generate_random_email, wait_for_element
+from typing import Any
+from utils.polling import poll
+from utils.schema import compiled
 
 
 def generate_random_string(length=10):
@@ -30,9 +31,9 @@ def get_current_timestamp():
     return datetime.now().strftime("%Y%m%d_%H%M%S")
 
 
-def validate_response_schema(response_data: Dict[str, Any], expected_schema: Dict[str, type]):
+def validate_response_schema(response_data: Any, expected_schema: Any):
     """
-    Валидация схемы ответа
+    Валидация схемы ответа (вложенные объекты, списки, Optional, Enum - см. utils/schema.py)
 
     Пример:
     schema = {
@@ -42,26 +43,7 @@ def validate_response_schema(response_data: Dict[str, Any], expected_schema: Dic
         "available": bool
     }
     """
-    errors = []
-
-    for field, expected_type in expected_schema.items():
-        if field not in response_data:
-            errors.append(f"Отсутствует обязательное поле: {field}")
-        else:
-            value = response_data[field]
-            if not isinstance(expected_type, tuple):
-                expected_type = (expected_type,)
-
-            if not any(isinstance(value, t) for t in expected_type):
-                errors.append(
-                    f"Поле {field} имеет тип {type(value).__name__}, "
-                    f"ожидался {[t.__name__ for t in expected_type]}"
-                )
-
-    if errors:
-        raise AssertionError(f"Ошибки валидации схемы:\n" + "\n".join(errors))
-
-    return True
+    return compiled(expected_schema).validate(response_data)
 
 
 def wait_for_condition(condition_func, timeout=10, interval=0.5, message=""):
@@ -71,15 +53,7 @@ def wait_for_condition(condition_func, timeout=10, interval=0.5, message=""):
     Args:
         condition_func: функция, возвращающая bool
         timeout: максимальное время ожидания
-        interval: интервал проверки
+        interval: максимальный интервал между проверками (первые - чаще, см. utils/polling.py)
         message: сообщение при таймауте
     """
-    import time
-    start_time = time.time()
-
-    while time.time() - start_time < timeout:
-        if condition_func():
-            return True
-        time.sleep(interval)
-
-    raise TimeoutError(message or f"Условие не выполнено за {timeout} секунд")
+    return poll(condition_func, timeout=timeout, message=message, max_interval=interval)
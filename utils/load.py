@@ -0,0 +1,178 @@
+"""
+Нагрузочный режим на основе AsyncApiClient
+
+Виртуальные пользователи (у каждого свой клиент, а значит своя корзина)
+проходят сценарии из методов клиента. Новые итерации сценария запускаются с
+заданной интенсивностью (итераций в секунду), которая линейно растёт в
+течение ramp-up. Если все пользователи заняты, итерация пропускается и
+учитывается как dropped - признак того, что бэкенд не справляется.
+
+Запуск: python run.py load --users 50 --rate 20 --duration 60 --ramp-up 10
+"""
+import asyncio
+import json
+import random
+import time
+from config.config import config
+from utils.async_api_client import AsyncApiClient
+from utils.metrics import LatencyStats
+from utils.transport import CircuitBreaker, RetryPolicy
+
+
+async def browse_scenario(client, product_ids):
+    """Просмотр цен нескольких товаров"""
+    await client.get_product_info(random.sample(product_ids, k=min(3, len(product_ids))))
+
+
+async def add_to_cart_scenario(client, product_ids):
+    """Карточка товара -> добавление в корзину -> просмотр корзины"""
+    product_id = random.choice(product_ids)
+    await client.get_product_info(product_id)
+    await client.add_to_cart(product_id)
+    await client.get_cart()
+
+
+async def cart_cycle_scenario(client, product_ids):
+    """Добавление товара, просмотр и очистка корзины"""
+    await client.add_to_cart(random.choice(product_ids))
+    await client.get_cart()
+    await client.clear_cart()
+
+
+SCENARIOS = {
+    "browse": browse_scenario,
+    "add_to_cart": add_to_cart_scenario,
+    "cart_cycle": cart_cycle_scenario,
+}
+
+
+class LoadRunner:
+    """Прогон сценария N виртуальными пользователями"""
+
+    def __init__(self, scenario="add_to_cart", users=10, rate=5.0, duration=30.0, ramp_up=0.0, product_ids=None):
+        if scenario not in SCENARIOS:
+            raise ValueError(f"Неизвестный сценарий: {scenario}. Доступны: {', '.join(SCENARIOS)}")
+        self.scenario_name = scenario
+        self.scenario = SCENARIOS[scenario]
+        self.users = users
+        self.rate = rate
+        self.duration = duration
+        self.ramp_up = ramp_up
+        self.product_ids = product_ids or config.LOAD_PRODUCT_IDS
+
+        self.requests = {}
+        self.iterations = LatencyStats()
+        self.dropped = 0
+
+    def run(self):
+        """Запустить нагрузку и вернуть отчёт"""
+        return asyncio.run(self._run())
+
+    async def _run(self):
+        idle_users = asyncio.Queue()
+        for _ in range(self.users):
+            idle_users.put_nowait(self._create_client())
+
+        tasks = set()
+        tokens = 0.0
+        start = last_tick = time.monotonic()
+
+        while True:
+            now = time.monotonic()
+            elapsed = now - start
+            if elapsed >= self.duration:
+                break
+
+            # Интенсивность растёт линейно в течение ramp-up
+            current_rate = self.rate * min(1.0, elapsed / self.ramp_up) if self.ramp_up else self.rate
+            tokens += current_rate * (now - last_tick)
+            last_tick = now
+
+            while tokens >= 1:
+                tokens -= 1
+                if idle_users.empty():
+                    self.dropped += 1
+                    continue
+                task = asyncio.create_task(self._iteration(idle_users))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+
+            await asyncio.sleep(0.01)
+
+        if tasks:
+            await asyncio.gather(*tasks)
+        wall_time = time.monotonic() - start
+
+        while not idle_users.empty():
+            await idle_users.get_nowait().close()
+
+        return self.report(wall_time)
+
+    def _create_client(self):
+        """Клиент виртуального пользователя"""
+        client = AsyncApiClient(concurrency=1)
+        # Под нагрузкой нужны реальные ответы бэкенда: без повторов и
+        # без размыкателя цепи, который подменил бы ошибки быстрыми отказами
+        client.retry_policy = RetryPolicy(max_retries=0)
+        client.breaker = CircuitBreaker(threshold=float("inf"))
+        client.listeners.append(self._record_request)
+        return client
+
+    def _record_request(self, method, endpoint, status_code, seconds):
+        key = f"{method} {endpoint}"
+        stats = self.requests.setdefault(key, LatencyStats())
+        stats.record(seconds, ok=status_code is not None and status_code < 400)
+
+    async def _iteration(self, idle_users):
+        client = idle_users.get_nowait()
+        start = time.perf_counter()
+        ok = True
+        try:
+            await self.scenario(client, self.product_ids)
+        except Exception:
+            ok = False
+        finally:
+            self.iterations.record(time.perf_counter() - start, ok=ok)
+            idle_users.put_nowait(client)
+
+    def report(self, wall_time):
+        """Отчёт: пропускная способность, доля ошибок и перцентили задержек"""
+        overall = LatencyStats()
+        for stats in self.requests.values():
+            overall.values.extend(stats.values)
+            overall.errors += stats.errors
+
+        return {
+            "scenario": self.scenario_name,
+            "users": self.users,
+            "rate": self.rate,
+            "ramp_up": self.ramp_up,
+            "duration_s": round(wall_time, 2),
+            "throughput_rps": round(overall.count / wall_time, 2) if wall_time else 0.0,
+            "iterations_per_s": round(self.iterations.count / wall_time, 2) if wall_time else 0.0,
+            "dropped_iterations": self.dropped,
+            "iterations": self.iterations.summary(),
+            "requests": overall.summary(),
+            "endpoints": {key: stats.summary() for key, stats in sorted(self.requests.items())},
+        }
+
+
+def print_report(report):
+    """Вывести отчёт нагрузочного прогона"""
+    print(f"Сценарий: {report['scenario']}, пользователей: {report['users']}, "
+          f"интенсивность: {report['rate']}/с, длительность: {report['duration_s']} с")
+    print(f"Пропускная способность: {report['throughput_rps']} запросов/с, "
+          f"{report['iterations_per_s']} итераций/с, пропущено итераций: {report['dropped_iterations']}")
+    print(f"{'Запрос':<28}{'Кол-во':>8}{'Ошибки':>9}{'p50, мс':>10}{'p95, мс':>10}{'p99, мс':>10}")
+    rows = list(report["endpoints"].items()) + [("Всего", report["requests"])]
+    for name, stats in rows:
+        print(f"{name:<28}{stats['count']:>8}{stats['error_rate']:>9.1%}"
+              f"{stats['p50_ms']:>10}{stats['p95_ms']:>10}{stats['p99_ms']:>10}")
+
+
+def save_report(report, path=None):
+    """Сохранить отчёт в JSON"""
+    path = path or config.REPORTS_DIR / "load_report.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    return path
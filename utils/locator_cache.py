@@ -0,0 +1,133 @@
+"""
+Кэш разрешения составных локаторов
+
+Почти все локаторы страниц - списки альтернатив вида
+"[data-test='cart-item'], .cart-item". Кэш запоминает, какая альтернатива
+реально находит элемент (для класса страницы и хоста), чтобы в следующий раз
+искать сразу по точному селектору (только для одного элемента: все элементы
+ищутся по полному селектору). Если после ожидания элемент нашёлся по другой
+альтернативе, она заменяет выученную. Счётчики совпадений сохраняются между
+запусками и показывают альтернативы, которые не срабатывают никогда.
+"""
+import json
+import os
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+from config.config import config
+
+
+@lru_cache(maxsize=None)
+def split_selector(selector):
+    """Разбить CSS-селектор по запятым верхнего уровня"""
+    parts = []
+    depth = 0
+    quote = None
+    current = ""
+
+    for char in selector:
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in "'\"":
+            quote = char
+        elif char in "([":
+            depth += 1
+        elif char in ")]":
+            depth -= 1
+        elif char == "," and depth == 0:
+            parts.append(current.strip())
+            current = ""
+            continue
+        current += char
+
+    parts.append(current.strip())
+    return tuple(part for part in parts if part)
+
+
+class LocatorCache:
+    """Выученные альтернативы составных селекторов"""
+
+    def __init__(self, path=None):
+        # Путь из настроек - при первом обращении (настройки загружаются лениво)
+        self._path = Path(path) if path else None
+        self._entries = None
+        self._dirty = False
+
+    @property
+    def path(self):
+        if self._path is None:
+            self._path = Path(config.LOCATOR_CACHE_FILE)
+        return self._path
+
+    @property
+    def entries(self):
+        if self._entries is None:
+            self._entries = self._read()
+        return self._entries
+
+    @staticmethod
+    def key(page, host, selector):
+        return f"{page}|{host}|{selector}"
+
+    def preferred(self, page, host, selector):
+        """Индекс выученной альтернативы или None"""
+        entry = self.entries.get(self.key(page, host, selector))
+        return entry["index"] if entry else None
+
+    def remember(self, page, host, selector, index, alternatives_count):
+        """Запомнить сработавшую альтернативу"""
+        entry = self.entries.setdefault(self.key(page, host, selector), {
+            "index": None,
+            "matches": [0] * alternatives_count,
+        })
+        entry["index"] = index
+        if index is not None:
+            entry["matches"][index] += 1
+        self._dirty = True
+
+    def hit(self, page, host, selector):
+        """Учесть совпадение по выученной альтернативе"""
+        entry = self.entries[self.key(page, host, selector)]
+        entry["matches"][entry["index"]] += 1
+        self._dirty = True
+
+    def dead_alternatives(self):
+        """Альтернативы, которые ни разу не нашли элемент: {ключ: [селекторы]}"""
+        report = {}
+        for key, entry in self.entries.items():
+            selector = key.split("|", 2)[2]
+            alternatives = split_selector(selector)
+            dead = [alt for alt, count in zip(alternatives, entry["matches"]) if count == 0]
+            if dead and any(entry["matches"]):
+                report[key] = dead
+        return report
+
+    def save(self):
+        """Сохранить кэш (слияние с файлом - его могут писать несколько воркеров)"""
+        if not self._dirty:
+            return
+
+        merged = self._read()
+        for key, entry in self.entries.items():
+            previous = merged.get(key)
+            if previous and len(previous["matches"]) == len(entry["matches"]):
+                entry = dict(entry, matches=[max(a, b) for a, b in zip(previous["matches"], entry["matches"])])
+            merged[key] = entry
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(merged, f, ensure_ascii=False, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+
+    def _read(self):
+        try:
+            return json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+
+# Общий кэш процесса
+locator_cache = LocatorCache()
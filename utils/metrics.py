@@ -0,0 +1,131 @@
+"""
+Статистика задержек запросов
+"""
+import json
+import math
+import threading
+
+# Границы корзин гистограммы задержек, мс
+HISTOGRAM_BOUNDS_MS = (50, 100, 250, 500, 1000, 2500, 5000)
+
+
+def percentile(sorted_values, p):
+    """Перцентиль p (0-100) отсортированного списка (линейная интерполяция)"""
+    if not sorted_values:
+        return 0.0
+    rank = (len(sorted_values) - 1) * p / 100
+    low, high = math.floor(rank), math.ceil(rank)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (rank - low)
+
+
+class LatencyStats:
+    """Задержки одной группы запросов (секунды) и число ошибок"""
+
+    def __init__(self):
+        self.values = []
+        self.errors = 0
+
+    def record(self, seconds, ok=True):
+        self.values.append(seconds)
+        if not ok:
+            self.errors += 1
+
+    @property
+    def count(self):
+        return len(self.values)
+
+    def percentile(self, p):
+        return percentile(sorted(self.values), p)
+
+    def histogram(self, bounds_ms=HISTOGRAM_BOUNDS_MS):
+        """Гистограмма: {"<=50ms": n, ..., ">5000ms": n}"""
+        buckets = {f"<={bound}ms": 0 for bound in bounds_ms}
+        buckets[f">{bounds_ms[-1]}ms"] = 0
+        for value in self.values:
+            ms = value * 1000
+            bound = next((b for b in bounds_ms if ms <= b), None)
+            buckets[f"<={bound}ms" if bound is not None else f">{bounds_ms[-1]}ms"] += 1
+        return buckets
+
+    def summary(self):
+        """Сводка в миллисекундах"""
+        values = sorted(self.values)
+        count = len(values)
+        return {
+            "count": count,
+            "errors": self.errors,
+            "error_rate": round(self.errors / count, 4) if count else 0.0,
+            "min_ms": round(values[0] * 1000, 1) if values else 0.0,
+            "mean_ms": round(sum(values) / count * 1000, 1) if values else 0.0,
+            "p50_ms": round(percentile(values, 50) * 1000, 1),
+            "p95_ms": round(percentile(values, 95) * 1000, 1),
+            "p99_ms": round(percentile(values, 99) * 1000, 1),
+            "max_ms": round(values[-1] * 1000, 1) if values else 0.0,
+        }
+
+
+class ApiMetrics:
+    """
+    Тайминги всех запросов ApiClient за сессию
+
+    Каждый запрос хранится с методом, эндпоинтом, статусом и временами
+    connect / ttfb / total (секунды). mark() и since() позволяют выделить
+    запросы одного теста.
+    """
+
+    PHASES = ("connect", "ttfb", "total")
+
+    def __init__(self):
+        self.samples = []
+        self._lock = threading.Lock()
+
+    def record(self, method, endpoint, status_code, connect, ttfb, total):
+        with self._lock:
+            self.samples.append({
+                "method": method,
+                "endpoint": endpoint,
+                "status_code": status_code,
+                "connect": connect,
+                "ttfb": ttfb,
+                "total": total,
+            })
+
+    def mark(self):
+        """Позиция для since() - обычно начало теста"""
+        return len(self.samples)
+
+    def since(self, mark):
+        return self.samples[mark:]
+
+    def stats(self, samples=None, phase="total"):
+        """LatencyStats по группам "METHOD /endpoint" для фазы запроса"""
+        groups = {}
+        for sample in self.samples if samples is None else samples:
+            key = f"{sample['method']} {sample['endpoint']}"
+            ok = sample["status_code"] is not None and sample["status_code"] < 500
+            groups.setdefault(key, LatencyStats()).record(sample[phase], ok=ok)
+        return groups
+
+    def summary(self, samples=None):
+        """Сводка: {"METHOD /endpoint": {фаза: сводка}, гистограмма total}"""
+        result = {}
+        for phase in self.PHASES:
+            for key, stats in self.stats(samples, phase).items():
+                entry = result.setdefault(key, {})
+                entry[phase] = stats.summary()
+                if phase == "total":
+                    entry["histogram"] = stats.histogram()
+        return result
+
+    def save(self, path):
+        """Сохранить сводку и сырые тайминги в JSON"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({
+            "summary": self.summary(),
+            "samples": self.samples,
+        }, ensure_ascii=False, indent=2), encoding="utf-8")
+        return path
+
+
+# Тайминги запросов текущей сессии pytest
+api_metrics = ApiMetrics()
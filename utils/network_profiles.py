@@ -0,0 +1,75 @@
+"""
+Эмуляция сетевых условий в Chrome (DevTools Network.emulateNetworkConditions)
+
+Профиль выбирается на прогон (NETWORK_PROFILE или --network-profile, можно
+несколько через запятую) или на тест маркером network_profile("3g", ...).
+Тест с драйвером запускается по разу на каждый профиль, метрики страниц
+(utils/page_perf.py) группируются по профилю.
+
+lan - без эмуляции. offline-after-load отключает сеть после загрузки
+каждой страницы (BasePage.open): проверка поведения страницы, у которой
+пропала связь.
+"""
+
+# latency - мс, скорости - кбит/с (-1 - без ограничения)
+NETWORK_PROFILES = {
+    "lan": None,
+    "3g": {"latency": 300, "download_kbps": 750, "upload_kbps": 250},
+    "slow-4g": {"latency": 150, "download_kbps": 1600, "upload_kbps": 750},
+    "high-latency": {"latency": 800, "download_kbps": -1, "upload_kbps": -1},
+    "offline-after-load": {"latency": 0, "download_kbps": -1, "upload_kbps": -1, "offline_after_load": True},
+}
+
+
+def parse_profiles(value):
+    """Имена профилей из строки "3g,slow-4g" (ValueError для неизвестных)"""
+    names = [name.strip() for name in value.split(",") if name.strip()]
+    unknown = [name for name in names if name not in NETWORK_PROFILES]
+    if unknown:
+        raise ValueError(f"Неизвестные сетевые профили: {', '.join(unknown)} (есть: {', '.join(NETWORK_PROFILES)})")
+    return names
+
+
+def supports_emulation(driver):
+    return hasattr(driver, "execute_cdp_cmd")
+
+
+def _throughput(kbps):
+    return -1 if kbps < 0 else kbps * 1000 / 8  # DevTools ждёт байт/с
+
+
+def emulate(driver, profile, offline=False):
+    """Включить условия профиля (словарь из NETWORK_PROFILES, None - без ограничений)"""
+    profile = profile or {"latency": 0, "download_kbps": -1, "upload_kbps": -1}
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.emulateNetworkConditions", {
+        "offline": offline,
+        "latency": profile["latency"],
+        "downloadThroughput": _throughput(profile["download_kbps"]),
+        "uploadThroughput": _throughput(profile["upload_kbps"]),
+    })
+
+
+def apply_profile(driver, name):
+    """Применить профиль к драйверу и запомнить его имя в driver.network_profile"""
+    if name and name != "lan" and not supports_emulation(driver):
+        raise RuntimeError(f"Сетевой профиль {name} требует Chrome (DevTools)")
+    if name and name != "lan":
+        emulate(driver, NETWORK_PROFILES[name])
+    elif getattr(driver, "network_profile", None):
+        emulate(driver, None)
+    driver.network_profile = name if name != "lan" else None
+
+
+def before_navigation(driver):
+    """Вернуть сеть перед переходом (для offline-after-load)"""
+    profile = NETWORK_PROFILES.get(getattr(driver, "network_profile", None) or "lan")
+    if profile and profile.get("offline_after_load"):
+        emulate(driver, profile)
+
+
+def after_load(driver):
+    """Отключить сеть после загрузки страницы (для offline-after-load)"""
+    profile = NETWORK_PROFILES.get(getattr(driver, "network_profile", None) or "lan")
+    if profile and profile.get("offline_after_load"):
+        emulate(driver, profile, offline=True)
@@ -0,0 +1,65 @@
+"""
+Профили загрузки страниц для UI тестов
+
+Профиль задаёт стратегию загрузки (page load strategy) и блокировку
+сторонних запросов через DevTools (Network.setBlockedURLs):
+- full - как у пользователя: ждём событие load, ничего не блокируем;
+- functional - ждём DOMContentLoaded, блокируем счётчики, чаты и рекламу
+  из BLOCKLIST_FILE (по умолчанию для функциональных тестов);
+- fast - как functional, но блокируются ещё и картинки.
+
+PAGE_LOAD_STRATEGY заменяет стратегию профиля (normal, eager, none).
+Блокировка работает только в Chrome, в остальных браузерах применяется
+только стратегия.
+"""
+from pathlib import Path
+
+PAGE_LOAD_PROFILES = {
+    "full": {"strategy": "normal", "block_third_party": False, "block_images": False},
+    "functional": {"strategy": "eager", "block_third_party": True, "block_images": False},
+    "fast": {"strategy": "eager", "block_third_party": True, "block_images": True},
+}
+
+PAGE_LOAD_STRATEGIES = ("normal", "eager", "none")
+
+# Шаблоны картинок для профиля fast
+IMAGE_PATTERNS = ("*.jpg*", "*.jpeg*", "*.png*", "*.gif*", "*.webp*", "*.avif*")
+
+
+def get_profile(name):
+    """Профиль по имени (ValueError для неизвестного)"""
+    if name not in PAGE_LOAD_PROFILES:
+        raise ValueError(f"Неизвестный профиль загрузки: {name} (есть: {', '.join(PAGE_LOAD_PROFILES)})")
+    return PAGE_LOAD_PROFILES[name]
+
+
+def load_blocklist(path):
+    """
+    Шаблоны URL из файла: по одному на строку, # - комментарий
+
+    Строка без "*" считается доменом: "mc.yandex.ru" -> "*mc.yandex.ru*".
+    """
+    try:
+        lines = Path(path).read_text(encoding="utf-8").splitlines()
+    except OSError:
+        return []
+    patterns = []
+    for line in lines:
+        line = line.split("#", 1)[0].strip()
+        if line:
+            patterns.append(line if "*" in line else f"*{line}*")
+    return patterns
+
+
+def blocked_patterns(profile, blocklist_file):
+    """Шаблоны URL, которые блокирует профиль"""
+    patterns = load_blocklist(blocklist_file) if profile["block_third_party"] else []
+    if profile["block_images"]:
+        patterns.extend(IMAGE_PATTERNS)
+    return patterns
+
+
+def block_urls(driver, patterns):
+    """Блокировать запросы по шаблонам (Chrome DevTools)"""
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(patterns)})
@@ -0,0 +1,274 @@
+"""
+Производительность страниц в UI тестах
+
+BasePage.open после загрузки страницы снимает одним execute_script
+Navigation Timing (TTFB, DOMContentLoaded, load), Paint Timing (first
+contentful paint) и Resource Timing (число запросов, объём). Ключевые
+действия page objects (BasePage.measure) записываются так же: время,
+запросы и объём за время действия; если действие открыло новую страницу,
+записывается и её загрузка.
+
+Метрики группируются по классу страницы ("CartPage") и действию
+("ProductPage.add_to_cart"). Страницы, открытые через BasePage,
+относятся к классу по пути URL (PAGE_PATHS).
+
+С PAGE_PERF_DEVTOOLS=true в Chrome дополнительно читаются логи DevTools
+(Network.*): точный объём с учётом кросс-доменных ресурсов и число
+неудачных запросов.
+
+Бюджеты - JSON-файл PAGE_PERF_BUDGETS_FILE:
+{"*": {"dom_content_loaded_ms": 6000}, "CartPage": {"fcp_ms": 3000}, "ProductPage.add_to_cart": {"duration_ms": 5000}}
+"*" и класс страницы задают бюджеты загрузок, "Класс.действие" - действий.
+load_ms есть только в профиле загрузки full: при стратегии eager/none
+(профили functional и fast, utils/page_load.py) метрики снимаются до
+события load, поэтому бюджеты по умолчанию заданы по DOMContentLoaded и FCP.
+Бюджет метрики, которой нет в записи, не проверяется.
+Под сетевым профилем (utils/network_profiles.py) ключи получают суффикс
+"@профиль" ("*@3g", "OrderPage.submit_order@3g"), бюджеты без суффикса
+к ним не применяются.
+Итоги прогона дописываются строкой в PAGE_PERF_TREND_FILE (JSON Lines).
+"""
+import json
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import urlparse
+from config.config import config
+from utils.metrics import percentile
+from utils.page_scripts import PAGE_PERF_JS, PAGE_PERF_MARK_JS
+from utils.sharding import worker_id
+
+# Класс page object по началу пути URL (первое совпадение)
+PAGE_PATHS = (
+    ("/product/", "ProductPage"),
+    ("/cart", "CartPage"),
+    ("/checkout", "OrderPage"),
+    ("/order", "OrderPage"),
+    ("/", "MainPage"),
+)
+
+# Метрики, которые показываются в итогах прогона
+SUMMARY_METRICS = ("dom_content_loaded_ms", "load_ms", "fcp_ms", "duration_ms", "requests", "transfer_kb")
+
+
+def page_for_url(url):
+    """Класс страницы по URL ("CartPage")"""
+    path = urlparse(url).path or "/"
+    return next((page for prefix, page in PAGE_PATHS if path.startswith(prefix)), "MainPage")
+
+
+def load_metrics(data):
+    """Метрики загрузки документа из результата PAGE_PERF_JS"""
+    navigation = data["navigation"] or {}
+    resources = data["resources"]
+    return {
+        "ttfb_ms": navigation.get("ttfb"),
+        "dom_content_loaded_ms": navigation.get("dom_content_loaded"),
+        "load_ms": navigation.get("load"),
+        "fcp_ms": data["first_contentful_paint"],
+        "requests": resources["count"] + 1,
+        "cached": resources["cached"],
+        "transfer_kb": (navigation.get("transfer_size", 0) + resources["transfer_size"]) / 1024,
+    }
+
+
+def network_profile(driver):
+    """Сетевой профиль драйвера (None - без эмуляции)"""
+    return getattr(driver, "network_profile", None)
+
+
+def devtools_network(driver):
+    """Сетевые события из логов DevTools с прошлого чтения (None без поддержки логов)"""
+    from selenium.common.exceptions import WebDriverException
+    try:
+        entries = driver.get_log("performance")
+    except (WebDriverException, AttributeError):
+        return None
+
+    network = {"network_requests": 0, "network_kb": 0.0, "failed_requests": 0}
+    for entry in entries:
+        message = json.loads(entry["message"])["message"]
+        if message["method"] == "Network.loadingFinished":
+            network["network_requests"] += 1
+            network["network_kb"] += message["params"].get("encodedDataLength", 0) / 1024
+        elif message["method"] == "Network.loadingFailed":
+            network["failed_requests"] += 1
+    return network
+
+
+class PagePerf:
+    """
+    Метрики загрузок страниц и действий за сессию
+
+    mark() и since() позволяют выделить записи одного теста, baseline -
+    последние значения из файла трендов до текущего прогона с тем же
+    профилем загрузки и тем же воркером.
+    """
+
+    def __init__(self):
+        self.samples = []
+        self.baseline = {}
+        self._budgets = None
+        self._lock = threading.Lock()
+
+    def start(self, driver):
+        """Отметка начала действия для record_action"""
+        self.drain_devtools(driver)
+        return driver.execute_script(PAGE_PERF_MARK_JS), time.perf_counter()
+
+    def drain_devtools(self, driver):
+        """Отбросить накопленные логи DevTools (перед навигацией или действием)"""
+        if config.PAGE_PERF_DEVTOOLS:
+            devtools_network(driver)
+
+    def record_load(self, driver, page):
+        """Записать загрузку текущего документа (BasePage - класс по URL)"""
+        data = driver.execute_script(PAGE_PERF_JS, 0)
+        if page == "BasePage":
+            page = page_for_url(data["url"])
+        metrics = load_metrics(data)
+        metrics.update(self._devtools_metrics(driver))
+        return self.record(page, "load", data["url"], metrics, network_profile(driver))
+
+    def record_action(self, driver, page, action, start):
+        """Записать действие, начатое в start (результат start())"""
+        mark, started = start
+        data = driver.execute_script(PAGE_PERF_JS, mark["now"])
+        duration_ms = (time.perf_counter() - started) * 1000
+        navigated = data["time_origin"] != mark["time_origin"]
+
+        # После перехода все ресурсы нового документа относятся к действию
+        metrics = load_metrics(data) if navigated else {
+            "requests": data["resources"]["count"],
+            "transfer_kb": data["resources"]["transfer_size"] / 1024,
+        }
+        network = self._devtools_metrics(driver)
+        sample = self.record(
+            page, action, data["url"],
+            {"duration_ms": duration_ms, "requests": metrics["requests"], "transfer_kb": metrics["transfer_kb"], **network},
+            network_profile(driver)
+        )
+        if navigated:
+            self.record(page_for_url(data["url"]), "load", data["url"], metrics, network_profile(driver))
+        return sample
+
+    def record(self, page, kind, url, metrics, network=None):
+        sample = {
+            "page": page,
+            "kind": kind,
+            "url": url,
+            "network": network,
+            "metrics": {name: round(value, 1) for name, value in metrics.items() if value is not None},
+        }
+        with self._lock:
+            self.samples.append(sample)
+        return sample
+
+    def mark(self):
+        """Позиция для since() - обычно начало теста"""
+        return len(self.samples)
+
+    def since(self, mark):
+        return self.samples[mark:]
+
+    @staticmethod
+    def key(sample):
+        """
+        Ключ группы: "CartPage" для загрузки, "ProductPage.add_to_cart" для
+        действия, с сетевым профилем - "CartPage@3g"
+        """
+        key = sample["page"] if sample["kind"] == "load" else f"{sample['page']}.{sample['kind']}"
+        return f"{key}@{sample['network']}" if sample.get("network") else key
+
+    def summary(self, samples=None):
+        """{ключ: {метрика: {"count", "p50", "p95", "max"}}}"""
+        values = {}
+        for sample in self.samples if samples is None else samples:
+            group = values.setdefault(self.key(sample), {})
+            for name, value in sample["metrics"].items():
+                group.setdefault(name, []).append(value)
+
+        return {
+            key: {
+                name: {
+                    "count": len(metric_values),
+                    "p50": round(percentile(sorted(metric_values), 50), 1),
+                    "p95": round(percentile(sorted(metric_values), 95), 1),
+                    "max": max(metric_values),
+                }
+                for name, metric_values in sorted(group.items())
+            }
+            for key, group in sorted(values.items())
+        }
+
+    def budgets(self):
+        """Бюджеты из PAGE_PERF_BUDGETS_FILE (пустой словарь без файла)"""
+        if self._budgets is None:
+            path = config.PAGE_PERF_BUDGETS_FILE
+            self._budgets = json.loads(Path(path).read_text(encoding="utf-8")) if path else {}
+        return self._budgets
+
+    def budget_for(self, sample):
+        """Бюджеты метрик записи: {"dom_content_loaded_ms": 6000, ...}"""
+        budgets = self.budgets()
+        default = f"*@{sample['network']}" if sample.get("network") else "*"
+        result = dict(budgets.get(default, {})) if sample["kind"] == "load" else {}
+        result.update(budgets.get(self.key(sample), {}))
+        return result
+
+    def violations(self, samples):
+        """Превышения бюджетов в виде строк"""
+        violations = []
+        for sample in samples:
+            for name, limit in self.budget_for(sample).items():
+                value = sample["metrics"].get(name)
+                if value is not None and value > limit:
+                    violations.append(f"{self.key(sample)} {name}: {value} > {limit} ({sample['url']})")
+        return violations
+
+    def save_trend(self, path=None):
+        """
+        Дописать p50/p95 прогона в файл трендов; прошлые значения - в baseline
+
+        С прошлыми прогонами сравниваются только строки того же профиля
+        загрузки (fast быстрее full по определению) и того же воркера (у
+        шардов разные наборы тестов).
+        """
+        path = Path(path or config.PAGE_PERF_TREND_FILE)
+        try:
+            lines = path.read_text(encoding="utf-8").splitlines()
+        except OSError:
+            lines = []
+        worker, load_profile = worker_id(), config.PAGE_LOAD_PROFILE
+        for line in lines:
+            try:
+                previous = json.loads(line)
+                if previous.get("load_profile") == load_profile and previous.get("worker") == worker:
+                    self.baseline.update(previous["pages"])
+            except (ValueError, KeyError, AttributeError):
+                continue
+
+        entry = {
+            "time": datetime.now().isoformat(timespec="seconds"),
+            "worker": worker,
+            "load_profile": load_profile,
+            "pages": {
+                key: {name: {"p50": stats["p50"], "p95": stats["p95"]} for name, stats in metrics.items()}
+                for key, metrics in self.summary().items()
+            },
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        return path
+
+    @staticmethod
+    def _devtools_metrics(driver):
+        if not config.PAGE_PERF_DEVTOOLS:
+            return {}
+        return devtools_network(driver) or {}
+
+
+# Метрики страниц текущей сессии pytest
+page_perf = PagePerf()
@@ -0,0 +1,302 @@
+"""
+JavaScript, выполняемый в браузере через execute_script
+
+Скрипты собраны в одном месте, чтобы page objects и фабрика драйверов
+использовали одни и те же версии.
+"""
+
+# Трекер активности страницы: считает незавершённые fetch/XHR и время
+# последней мутации DOM. В Chrome ставится до скриптов страницы через
+# Page.addScriptToEvaluateOnNewDocument, в остальных браузерах - при первом
+# ожидании (запросы, начатые до этого, не учитываются).
+PAGE_TRACKER_JS = """
+(function () {
+    if (window.__pageTracker) return;
+    window.__pageTracker = true;
+    window.__pendingRequests = 0;
+    window.__lastRequestEnd = 0;
+    window.__lastMutation = Date.now();
+    // Буфер Resource Timing по умолчанию - 250 записей, на витрине их больше
+    if (performance.setResourceTimingBufferSize) performance.setResourceTimingBufferSize(1000);
+
+    var requestDone = function () {
+        window.__pendingRequests = Math.max(0, window.__pendingRequests - 1);
+        window.__lastRequestEnd = Date.now();
+    };
+
+    if (window.fetch) {
+        var originalFetch = window.fetch;
+        window.fetch = function () {
+            window.__pendingRequests++;
+            try {
+                var result = originalFetch.apply(this, arguments);
+            } catch (e) {
+                requestDone();
+                throw e;
+            }
+            result.then(requestDone, requestDone);
+            return result;
+        };
+    }
+
+    var originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        window.__pendingRequests++;
+        this.addEventListener('loadend', requestDone);
+        return originalSend.apply(this, arguments);
+    };
+
+    var observe = function () {
+        new MutationObserver(function () { window.__lastMutation = Date.now(); })
+            .observe(document.documentElement, {
+                childList: true, subtree: true, attributes: true, characterData: true
+            });
+    };
+    if (document.documentElement) {
+        observe();
+    } else {
+        document.addEventListener('DOMContentLoaded', observe);
+    }
+})();
+"""
+
+# Ожидание готовности страницы за один вызов execute_async_script.
+# Проверки выполняются в браузере каждые 50 мс, поэтому ожидание
+# заканчивается сразу, как только страница готова.
+PAGE_READY_JS = PAGE_TRACKER_JS + """
+var options = arguments[0];
+var done = arguments[arguments.length - 1];
+var deadline = Date.now() + options.timeout;
+
+var spinnerVisible = function () {
+    if (!options.spinner) return false;
+    var elements = document.querySelectorAll(options.spinner);
+    for (var i = 0; i < elements.length; i++) {
+        if (elements[i].getClientRects().length > 0) return true;
+    }
+    return false;
+};
+
+// document: 'interactive' (стратегия eager/none) - достаточно DOMContentLoaded,
+// иначе ждём 'complete'
+var documentReady = function () {
+    if (!options.document) return true;
+    if (options.document === 'interactive') return document.readyState !== 'loading';
+    return document.readyState === 'complete';
+};
+
+var isReady = function () {
+    var now = Date.now();
+    if (!documentReady()) return false;
+    if (options.network && (window.__pendingRequests > 0 ||
+            now - window.__lastRequestEnd < options.idle)) return false;
+    if (options.dom && now - window.__lastMutation < options.quiet) return false;
+    return !spinnerVisible();
+};
+
+(function check() {
+    if (isReady()) return done(true);
+    if (Date.now() > deadline) return done(false);
+    setTimeout(check, 50);
+})();
+"""
+
+# Общие функции поиска элементов для скриптов ниже. Локаторы передаются как
+# {using: 'css'|'xpath', value} (см. BasePage._to_js_locator).
+LOCATOR_HELPERS_JS = """
+var findAll = function (root, locator) {
+    if (locator.using === 'xpath') {
+        var snapshot = document.evaluate(locator.value, root, null,
+            XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        var nodes = [];
+        for (var i = 0; i < snapshot.snapshotLength; i++) nodes.push(snapshot.snapshotItem(i));
+        return nodes;
+    }
+    return Array.prototype.slice.call(root.querySelectorAll(locator.value));
+};
+
+var findOne = function (root, locator) {
+    if (!locator) return root;
+    return findAll(root, locator)[0] || null;
+};
+"""
+
+# Массовое извлечение данных: для каждого контейнера (строки) собирает текст
+# и атрибуты полей за один вызов execute_script. Поле без локатора - сам
+# контейнер. Текст - как у WebElement.text: только отрисованный, у скрытого
+# элемента (display:none и т.п.) - пустая строка.
+QUERY_ALL_JS = LOCATOR_HELPERS_JS + """
+var container = arguments[0];
+var fields = arguments[1];
+
+var visibleText = function (element) {
+    if (!element.getClientRects().length) return '';
+    return (element.innerText || '').trim();
+};
+
+return findAll(document, container).map(function (row) {
+    var result = {_element: row};
+    fields.forEach(function (field) {
+        var element = findOne(row, field.locator);
+        if (!element) {
+            result[field.name] = null;
+        } else if (field.attribute) {
+            result[field.name] = element.getAttribute(field.attribute);
+        } else {
+            result[field.name] = visibleText(element);
+        }
+    });
+    return result;
+});
+"""
+
+# Заполнение формы за один вызов execute_script. Значение ставится через
+# нативный сеттер и сопровождается событиями input/change, чтобы фреймворк
+# сайта (React/Vue) увидел изменения. Для select выбирается опция по тексту
+# или value, для radio/checkbox - элемент, у которого value или id содержит
+# значение. Возвращает имена полей, которые заполнить не удалось.
+FILL_FORM_JS = LOCATOR_HELPERS_JS + """
+var fields = arguments[0];
+var failed = [];
+
+var fire = function (element, type) {
+    element.dispatchEvent(new Event(type, {bubbles: true}));
+};
+
+// Нативный сеттер есть только у input и textarea; contenteditable и
+// custom elements считаются незаполненными - их вводит Python посимвольно
+var setValue = function (element, value) {
+    var proto;
+    if (element instanceof HTMLTextAreaElement) {
+        proto = HTMLTextAreaElement.prototype;
+    } else if (element instanceof HTMLInputElement) {
+        proto = HTMLInputElement.prototype;
+    } else {
+        return false;
+    }
+    Object.getOwnPropertyDescriptor(proto, 'value').set.call(element, value);
+    return true;
+};
+
+fields.forEach(function (field) {
+    var elements = findAll(document, field.locator);
+    var element = elements[0];
+    if (!element) {
+        failed.push(field.name);
+        return;
+    }
+
+    if (element.tagName === 'SELECT') {
+        var option = Array.prototype.find.call(element.options, function (o) {
+            return o.text.trim() === field.value || o.value === field.value;
+        });
+        if (!option) {
+            failed.push(field.name);
+            return;
+        }
+        element.value = option.value;
+        fire(element, 'input');
+        fire(element, 'change');
+    } else if (element.type === 'radio' || element.type === 'checkbox') {
+        var target = elements.find(function (el) {
+            return (el.value || '').indexOf(field.value) !== -1 || (el.id || '').indexOf(field.value) !== -1;
+        });
+        if (!target) {
+            failed.push(field.name);
+            return;
+        }
+        if (!target.checked) target.click();
+    } else {
+        element.focus();
+        if (!setValue(element, field.value)) {
+            failed.push(field.name);
+            return;
+        }
+        fire(element, 'input');
+        fire(element, 'change');
+        element.blur();
+    }
+});
+
+return failed;
+"""
+
+# Проверка наличия нескольких альтернативных элементов за один вызов
+# execute_async_script: в пределах бюджета (мс) каждые 50 мс проверяет
+# локаторы по порядку и возвращает индекс первого найденного или -1.
+PROBE_JS = LOCATOR_HELPERS_JS + """
+var locators = arguments[0];
+var deadline = Date.now() + arguments[1];
+var done = arguments[arguments.length - 1];
+
+(function check() {
+    for (var i = 0; i < locators.length; i++) {
+        try {
+            if (findAll(document, locators[i]).length) return done(i);
+        } catch (e) {
+            // Невалидный селектор считаем отсутствующим элементом
+        }
+    }
+    if (Date.now() >= deadline) return done(-1);
+    setTimeout(check, 50);
+})();
+"""
+
+# Какой из альтернативных CSS-селекторов совпадает с найденным элементом
+# (индекс или -1). Используется кэшем локаторов при обучении.
+MATCH_ALTERNATIVE_JS = """
+var element = arguments[0];
+var alternatives = arguments[1];
+for (var i = 0; i < alternatives.length; i++) {
+    try {
+        if (element.matches(alternatives[i])) return i;
+    } catch (e) {
+        // Невалидный селектор пропускаем
+    }
+}
+return -1;
+"""
+
+# Метрики загрузки документа (Navigation и Paint Timing) и ресурсов, начатых
+# не раньше arguments[0] (мс от начала документа, 0 - все ресурсы). Время -
+# в мс от начала навигации; null - браузер метрику не отдал. transferSize
+# кросс-доменных ресурсов без Timing-Allow-Origin равен 0 (точный объём - в
+# логах DevTools, PAGE_PERF_DEVTOOLS).
+PAGE_PERF_JS = """
+var since = arguments[0] || 0;
+var navigation = performance.getEntriesByType('navigation')[0];
+var paints = {};
+performance.getEntriesByType('paint').forEach(function (entry) {
+    paints[entry.name] = entry.startTime;
+});
+
+var resources = {count: 0, transfer_size: 0, cached: 0, by_type: {}};
+performance.getEntriesByType('resource').forEach(function (entry) {
+    if (entry.startTime < since) return;
+    resources.count++;
+    resources.transfer_size += entry.transferSize || 0;
+    if (!entry.transferSize && entry.decodedBodySize) resources.cached++;
+    resources.by_type[entry.initiatorType] = (resources.by_type[entry.initiatorType] || 0) + 1;
+});
+
+return {
+    url: location.href,
+    time_origin: performance.timeOrigin,
+    now: performance.now(),
+    navigation: navigation ? {
+        ttfb: navigation.responseStart,
+        dom_interactive: navigation.domInteractive,
+        dom_content_loaded: navigation.domContentLoadedEventEnd || null,
+        load: navigation.loadEventEnd || null,
+        transfer_size: navigation.transferSize || 0
+    } : null,
+    first_paint: paints['first-paint'] || null,
+    first_contentful_paint: paints['first-contentful-paint'] || null,
+    resources: resources
+};
+"""
+
+# Отметка начала действия для PAGE_PERF_JS: документ и время в нём
+PAGE_PERF_MARK_JS = """
+return {time_origin: performance.timeOrigin, now: performance.now()};
+"""
@@ -0,0 +1,157 @@
+"""
+Ожидание условий с адаптивным интервалом
+
+Условие проверяется сразу, затем с растущим интервалом: от
+POLL_INITIAL_INTERVAL с множителем POLL_BACKOFF до POLL_MAX_INTERVAL.
+Быстро выполняющееся условие замечается почти без задержки, а долгое не
+засыпает бэкенд запросами. Время считается по монотонным часам, пауза
+никогда не выходит за общий срок.
+
+poll_async и wait_all - то же для asyncio: wait_all ждёт сотни условий
+одновременно (например, статусы заказов) и ограничивает число одновременных
+проверок. Каждое ожидание записывается в wait_timings.
+"""
+import inspect
+import threading
+import time
+from config.config import config
+from utils.metrics import LatencyStats
+
+
+class PollTimeout(TimeoutError):
+    """Условие не выполнилось за отведённое время"""
+
+
+class WaitTimings:
+    """Длительности ожиданий за сессию"""
+
+    def __init__(self):
+        self.samples = []
+        self._lock = threading.Lock()
+
+    def record(self, name, seconds, attempts, ok):
+        with self._lock:
+            self.samples.append({"name": name, "seconds": seconds, "attempts": attempts, "ok": ok})
+
+    def stats(self):
+        """LatencyStats по именам ожиданий (таймаут считается ошибкой)"""
+        groups = {}
+        for sample in self.samples:
+            groups.setdefault(sample["name"], LatencyStats()).record(sample["seconds"], ok=sample["ok"])
+        return groups
+
+
+# Ожидания текущей сессии pytest
+wait_timings = WaitTimings()
+
+
+class Backoff:
+    """Интервалы между проверками с учётом общего срока"""
+
+    def __init__(self, timeout, initial=None, factor=None, maximum=None):
+        self.deadline = time.monotonic() + timeout
+        self.interval = config.POLL_INITIAL_INTERVAL if initial is None else initial
+        self.factor = config.POLL_BACKOFF if factor is None else factor
+        self.maximum = config.POLL_MAX_INTERVAL if maximum is None else maximum
+
+    def remaining(self):
+        return self.deadline - time.monotonic()
+
+    def next_delay(self):
+        """Пауза до следующей проверки или None, если срок вышел"""
+        remaining = self.remaining()
+        if remaining <= 0:
+            return None
+        delay = min(self.interval, self.maximum, remaining)
+        self.interval = min(self.interval * self.factor, self.maximum)
+        return delay
+
+
+def poll(condition, timeout=10, name=None, message="", initial=None, factor=None, max_interval=None):
+    """
+    Ждать, пока condition() вернёт истинное значение, и вернуть его
+
+    Последняя проверка выполняется ровно на сроке, так что условие,
+    выполнившееся в последний момент, не теряется.
+    """
+    name = name or getattr(condition, "__name__", "condition")
+    backoff = Backoff(timeout, initial, factor, max_interval)
+    start = time.monotonic()
+    attempts = 0
+
+    while True:
+        attempts += 1
+        result = condition()
+        if result:
+            wait_timings.record(name, time.monotonic() - start, attempts, True)
+            return result
+
+        delay = backoff.next_delay()
+        if delay is None:
+            wait_timings.record(name, time.monotonic() - start, attempts, False)
+            raise PollTimeout(message or f"Условие {name} не выполнено за {timeout} секунд ({attempts} проверок)")
+        time.sleep(delay)
+
+
+async def poll_async(condition, timeout=10, name=None, message="", initial=None, factor=None,
+                     max_interval=None, semaphore=None):
+    """
+    Асинхронный poll: condition - функция или корутинная функция
+
+    semaphore ограничивает одновременные проверки (см. wait_all).
+    """
+    import asyncio
+    name = name or getattr(condition, "__name__", "condition")
+    backoff = Backoff(timeout, initial, factor, max_interval)
+    start = time.monotonic()
+    attempts = 0
+
+    while True:
+        attempts += 1
+        if semaphore is not None:
+            async with semaphore:
+                result = await _call(condition)
+        else:
+            result = await _call(condition)
+        if result:
+            wait_timings.record(name, time.monotonic() - start, attempts, True)
+            return result
+
+        delay = backoff.next_delay()
+        if delay is None:
+            wait_timings.record(name, time.monotonic() - start, attempts, False)
+            raise PollTimeout(message or f"Условие {name} не выполнено за {timeout} секунд ({attempts} проверок)")
+        await asyncio.sleep(delay)
+
+
+async def wait_all(conditions, timeout=10, limit=None, **poll_kwargs):
+    """
+    Ждать одновременно все условия {имя: condition} и вернуть {имя: результат}
+
+    limit - сколько проверок может выполняться одновременно (по умолчанию
+    API_CONCURRENCY). Если часть условий не выполнилась, PollTimeout
+    перечисляет их все, а не только первое.
+    """
+    import asyncio
+    semaphore = asyncio.Semaphore(limit or config.API_CONCURRENCY)
+    names = list(conditions)
+    results = await asyncio.gather(
+        *(poll_async(conditions[name], timeout, name=name, semaphore=semaphore, **poll_kwargs) for name in names),
+        return_exceptions=True
+    )
+
+    failed = [name for name, result in zip(names, results) if isinstance(result, PollTimeout)]
+    errors = [result for result in results if isinstance(result, BaseException) and not isinstance(result, PollTimeout)]
+    if errors:
+        raise errors[0]
+    if failed:
+        shown = ", ".join(failed[:10]) + (f" и ещё {len(failed) - 10}" if len(failed) > 10 else "")
+        raise PollTimeout(f"Не выполнено {len(failed)} из {len(names)} условий за {timeout} секунд: {shown}")
+    return dict(zip(names, results))
+
+
+async def _call(condition):
+    result = condition()
+    if inspect.isawaitable(result):
+        result = await result
+    return result
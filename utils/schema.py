@@ -0,0 +1,225 @@
+"""
+Проверка структуры JSON-ответов API
+
+Схема описывается так же, как в validate_response_schema, но может быть
+вложенной:
+- тип или кортеж типов: str, (int, float);
+- словарь полей: {"id": str, "price": (int, float)} - лишние поля допустимы;
+- список элементов: [схема элемента];
+- Optional(схема) - поле может отсутствовать или быть null;
+- Enum("a", "b") - одно из значений.
+
+Схема компилируется один раз в пару функций: быстрая проверка без
+сообщений и подробная, которая собирает все ошибки с JSON-путями. Подробная
+запускается только для элементов, не прошедших быструю, поэтому проверка
+всего каталога стоит немногим больше одного прохода по нему.
+
+Пример:
+PRODUCTS = Schema([{"id": (str, int), "price": (int, float), "name": Optional(str)}])
+PRODUCTS.validate(response.json())
+"""
+
+# Сколько ошибок показывать в тексте AssertionError
+MAX_REPORTED_ERRORS = 20
+
+# Отсутствующее поле (None - допустимое значение)
+_MISSING = object()
+
+
+class Optional:
+    """Необязательное поле (может отсутствовать или быть null)"""
+
+    def __init__(self, schema):
+        self.schema = schema
+
+
+class Enum:
+    """Значение из фиксированного набора"""
+
+    def __init__(self, *values):
+        self.values = frozenset(values)
+
+
+class Schema:
+    """Скомпилированная схема"""
+
+    def __init__(self, schema):
+        self.schema = schema
+        self._is_valid, self._collect = _compile(schema)
+
+    def is_valid(self, data):
+        return self._is_valid(data)
+
+    def errors(self, data):
+        """Все ошибки в виде строк "$.items[3].price: ..." (пустой список - данные верны)"""
+        if self._is_valid(data):
+            return []
+        errors = []
+        self._collect(data, "$", errors)
+        return errors
+
+    def validate(self, data):
+        """Проверить данные, при ошибках - AssertionError со списком путей"""
+        errors = self.errors(data)
+        if errors:
+            shown = errors[:MAX_REPORTED_ERRORS]
+            if len(errors) > len(shown):
+                shown.append(f"... и ещё {len(errors) - len(shown)}")
+            raise AssertionError("Ошибки валидации схемы:\n" + "\n".join(shown))
+        return True
+
+
+def _compile(schema):
+    """(is_valid(value) -> bool, collect(value, path, errors))"""
+    if isinstance(schema, Schema):
+        return schema._is_valid, schema._collect
+    if isinstance(schema, Optional):
+        return _compile_nullable(schema.schema)
+    if isinstance(schema, Enum):
+        return _compile_enum(schema.values)
+    if isinstance(schema, list):
+        if len(schema) != 1:
+            raise ValueError(f"Список в схеме описывает один тип элементов: [схема], получено {schema!r}")
+        return _compile_list(schema[0])
+    if isinstance(schema, dict):
+        return _compile_dict(schema)
+    if isinstance(schema, type) or (isinstance(schema, tuple) and all(isinstance(t, type) for t in schema)):
+        return _compile_type(schema if isinstance(schema, tuple) else (schema,))
+    raise TypeError(f"Неподдерживаемый элемент схемы: {schema!r}")
+
+
+def _compile_type(types):
+    # bool - подкласс int, но True в поле price - ошибка
+    exact = frozenset(types)
+    allow_bool = bool in exact
+    expected = " | ".join(t.__name__ for t in types)
+
+    def is_valid(value):
+        cls = type(value)
+        return cls in exact or (isinstance(value, types) and (allow_bool or cls is not bool))
+
+    def collect(value, path, errors):
+        if not is_valid(value):
+            errors.append(f"{path}: ожидался {expected}, получен {type(value).__name__}")
+
+    return is_valid, collect
+
+
+def _compile_enum(values):
+    expected = ", ".join(sorted(repr(value) for value in values))
+
+    def is_valid(value):
+        try:
+            return value in values
+        except TypeError:
+            # Нехешируемое значение (список, словарь) заведомо не из набора
+            return False
+
+    def collect(value, path, errors):
+        if not is_valid(value):
+            errors.append(f"{path}: значение {value!r} не из набора {expected}")
+
+    return is_valid, collect
+
+
+def _compile_nullable(schema):
+    item_valid, item_collect = _compile(schema)
+
+    def is_valid(value):
+        return value is None or item_valid(value)
+
+    def collect(value, path, errors):
+        if value is not None:
+            item_collect(value, path, errors)
+
+    return is_valid, collect
+
+
+def _compile_list(item_schema):
+    item_valid, item_collect = _compile(item_schema)
+
+    def is_valid(value):
+        return isinstance(value, list) and all(map(item_valid, value))
+
+    def collect(value, path, errors):
+        if not isinstance(value, list):
+            errors.append(f"{path}: ожидался list, получен {type(value).__name__}")
+            return
+        for index, item in enumerate(value):
+            if not item_valid(item):
+                item_collect(item, f"{path}[{index}]", errors)
+
+    return is_valid, collect
+
+
+def _compile_dict(fields_schema):
+    # (поле, обязательное, проверки значения)
+    fields = []
+    for name, field_schema in fields_schema.items():
+        required = not isinstance(field_schema, Optional)
+        fields.append((name, required, *_compile(field_schema)))
+
+    checks = [(name, required, field_valid) for name, required, field_valid, _ in fields]
+
+    def is_valid(value):
+        if not isinstance(value, dict):
+            return False
+        for name, required, field_valid in checks:
+            item = value.get(name, _MISSING)
+            if item is _MISSING:
+                if required:
+                    return False
+            elif not field_valid(item):
+                return False
+        return True
+
+    def collect(value, path, errors):
+        if not isinstance(value, dict):
+            errors.append(f"{path}: ожидался object, получен {type(value).__name__}")
+            return
+        for name, required, field_valid, field_collect in fields:
+            if name in value:
+                if not field_valid(value[name]):
+                    field_collect(value[name], f"{path}.{name}", errors)
+            elif required:
+                errors.append(f"{path}.{name}: отсутствует обязательное поле")
+
+    return is_valid, collect
+
+
+# Скомпилированные схемы validate_response_schema: канонический ключ -> Schema
+_compiled = {}
+
+
+def schema_key(schema):
+    """
+    Хешируемый ключ описания схемы
+
+    Одинаковые описания (например, литерал словаря, который
+    validate_response_schema получает заново при каждом вызове) дают
+    одинаковый ключ. Порядок полей словаря не важен.
+    """
+    if isinstance(schema, Schema):
+        return schema
+    if isinstance(schema, Optional):
+        return "optional", schema_key(schema.schema)
+    if isinstance(schema, Enum):
+        return "enum", schema.values
+    if isinstance(schema, list):
+        return "list", tuple(schema_key(item) for item in schema)
+    if isinstance(schema, dict):
+        return "dict", tuple(sorted((str(name), schema_key(value)) for name, value in schema.items()))
+    if isinstance(schema, tuple):
+        return "types", schema
+    return schema
+
+
+def compiled(schema):
+    """Schema для описания схемы (компилируется один раз на одинаковые описания)"""
+    if isinstance(schema, Schema):
+        return schema
+    key = schema_key(schema)
+    cached = _compiled.get(key)
+    if cached is None:
+        cached = _compiled[key] = Schema(schema)
+    return cached
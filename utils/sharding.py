@@ -0,0 +1,86 @@
+"""
+Разбиение тестов на шарды по историческим длительностям
+
+Каждый воркер после прогона сохраняет длительности своих тестов в
+reports/durations/<worker>.json, run.py сливает их в reports/durations.json
+и по ним балансирует шарды следующего запуска.
+"""
+import json
+import os
+from pathlib import Path
+from config.config import config
+
+# Длительность теста, для которого ещё нет истории (секунды)
+DEFAULT_DURATION = 1.0
+
+# Вес новой длительности при слиянии с историей (сглаживание выбросов)
+SMOOTHING = 0.5
+
+
+def worker_id():
+    """Идентификатор текущего воркера (main при обычном запуске)"""
+    return os.getenv("TEST_WORKER_ID", "main")
+
+
+def worker_count():
+    """Сколько воркеров в прогоне (1 при обычном запуске)"""
+    return max(1, int(os.getenv("TEST_WORKERS", "1")))
+
+
+def load_durations(path=None):
+    """Загрузить историю длительностей {nodeid: секунды}"""
+    path = Path(path or config.DURATIONS_FILE)
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def save_worker_durations(durations):
+    """Сохранить длительности тестов текущего воркера"""
+    directory = config.REPORTS_DIR / "durations"
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{worker_id()}.json"
+    path.write_text(json.dumps(durations, ensure_ascii=False, indent=2), encoding="utf-8")
+    return path
+
+
+def merge_worker_durations(path=None):
+    """Слить длительности воркеров в общую историю"""
+    path = Path(path or config.DURATIONS_FILE)
+    history = load_durations(path)
+    directory = config.REPORTS_DIR / "durations"
+
+    for worker_file in sorted(directory.glob("*.json")):
+        for nodeid, duration in load_durations(worker_file).items():
+            if nodeid in history:
+                duration = SMOOTHING * duration + (1 - SMOOTHING) * history[nodeid]
+            history[nodeid] = round(duration, 3)
+        worker_file.unlink()
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(history, ensure_ascii=False, indent=2, sort_keys=True), encoding="utf-8")
+    return history
+
+
+def make_shards(nodeids, workers, durations=None):
+    """
+    Разбить тесты на шарды с примерно равным суммарным временем
+
+    Жадный алгоритм LPT: самые долгие тесты раздаются первыми, каждый - в
+    наименее загруженный шард. Тесты без истории получают медиану известных
+    длительностей.
+    """
+    durations = durations if durations is not None else load_durations()
+    known = sorted(durations[n] for n in nodeids if n in durations)
+    default = known[len(known) // 2] if known else DEFAULT_DURATION
+
+    shards = [[] for _ in range(workers)]
+    loads = [0.0] * workers
+
+    for nodeid in sorted(nodeids, key=lambda n: durations.get(n, default), reverse=True):
+        index = loads.index(min(loads))
+        shards[index].append(nodeid)
+        loads[index] += durations.get(nodeid, default)
+
+    return [shard for shard in shards if shard]
@@ -0,0 +1,251 @@
+"""
+HTTP-транспорт для клиентов API
+
+Пул соединений с настраиваемым размером на хост, раздельные таймауты
+подключения и чтения, повторы только идемпотентных запросов (экспоненциальная
+задержка с джиттером и учётом Retry-After) и circuit breaker, который при
+недоступном бэкенде сразу отказывает вместо ожидания таймаутов.
+
+Каждый ответ получает атрибут timings: время подключения (0, если
+соединение взято из пула), время до первого байта и полное время запроса.
+"""
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from config.config import config
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Бэкенд недоступен: запросы отклоняются без отправки"""
+
+
+def parse_retry_after(value):
+    """Значение заголовка Retry-After в секундах (число или HTTP-дата)"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class RetryPolicy:
+    """Когда и через сколько повторять запрос"""
+
+    IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+    RETRY_STATUSES = frozenset({429, 502, 503, 504})
+
+    def __init__(self, max_retries=None, backoff_base=None, backoff_max=None):
+        self.max_retries = config.API_MAX_RETRIES if max_retries is None else max_retries
+        self.backoff_base = config.API_BACKOFF_BASE if backoff_base is None else backoff_base
+        self.backoff_max = config.API_BACKOFF_MAX if backoff_max is None else backoff_max
+
+    def can_retry(self, method, attempt):
+        """Можно ли повторить запрос (POST и PATCH не повторяются)"""
+        return method.upper() in self.IDEMPOTENT_METHODS and attempt < self.max_retries
+
+    def should_retry_status(self, method, status_code, attempt):
+        return status_code in self.RETRY_STATUSES and self.can_retry(method, attempt)
+
+    def delay(self, attempt, retry_after=None):
+        """Пауза перед повтором: Retry-After или экспонента с полным джиттером"""
+        retry_after = parse_retry_after(retry_after)
+        if retry_after is not None:
+            return min(retry_after, config.API_READ_TIMEOUT)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+
+class CircuitBreaker:
+    """
+    Размыкатель цепи для одного хоста
+
+    После threshold подряд неудачных запросов (ошибки соединения, таймауты,
+    5xx) цепь размыкается на reset_timeout секунд. Затем цепь полуоткрыта:
+    пропускается один пробный запрос, остальные отклоняются до его
+    результата. Успех замыкает цепь, ошибка снова размыкает. Если результат
+    пробы не пришёл за reset_timeout, пропускается следующая проба.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, threshold=None, reset_timeout=None):
+        self.threshold = config.API_BREAKER_THRESHOLD if threshold is None else threshold
+        self.reset_timeout = config.API_BREAKER_RESET if reset_timeout is None else reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.probe_started_at = None
+        self._lock = threading.Lock()
+
+    def check(self):
+        """Выбросить CircuitOpenError, если запрос не пропускается"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+            now = time.monotonic()
+            if self.state == self.OPEN:
+                remaining = self.reset_timeout - (now - self.opened_at)
+            else:
+                remaining = self.reset_timeout - (now - self.probe_started_at)
+            if remaining <= 0:
+                # Этот запрос - пробный
+                self.state = self.HALF_OPEN
+                self.probe_started_at = now
+                return
+            waiting = "идёт пробный запрос" if self.state == self.HALF_OPEN else f"повтор через {remaining:.1f} с"
+            failures = self.failures
+
+        raise CircuitOpenError(f"Бэкенд недоступен ({failures} ошибок подряд), {waiting}")
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self.opened_at = None
+            self.probe_started_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+                self.probe_started_at = None
+
+
+# Один размыкатель на хост: общий для всех клиентов процесса
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def circuit_breaker_for(url):
+    """Размыкатель цепи для хоста из URL"""
+    host = urlparse(url).netloc
+    with _breakers_lock:
+        if host not in _breakers:
+            _breakers[host] = CircuitBreaker()
+        return _breakers[host]
+
+
+# Время установки соединения последнего запроса в текущем потоке
+_connect_timer = threading.local()
+
+
+class _TimedHTTPConnection(HTTPConnection):
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()
+        _connect_timer.seconds = time.perf_counter() - start
+
+
+class _TimedHTTPSConnection(HTTPSConnection):
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()
+        _connect_timer.seconds = time.perf_counter() - start
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter, засекающий время установки соединения"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool,
+        }
+
+
+class RequestTimings:
+    """Тайминги одного запроса (секунды)"""
+
+    def __init__(self, connect, ttfb, total):
+        self.connect = connect
+        self.ttfb = ttfb
+        self.total = total
+
+    def __repr__(self):
+        return f"<RequestTimings connect={self.connect:.3f} ttfb={self.ttfb:.3f} total={self.total:.3f}>"
+
+
+def create_session(pool_connections=None, pool_size=None):
+    """requests.Session с пулом соединений заданного размера"""
+    session = requests.Session()
+    adapter = TimedHTTPAdapter(
+        pool_connections=pool_connections or config.API_POOL_CONNECTIONS,
+        pool_maxsize=pool_size or config.API_POOL_SIZE,
+        max_retries=0,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+class Transport:
+    """Отправка запросов с таймаутами, повторами и размыкателем цепи"""
+
+    def __init__(self, session, breaker, retry_policy=None, timeout=None):
+        self.session = session
+        self.breaker = breaker
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.timeout = timeout or (config.API_CONNECT_TIMEOUT, config.API_READ_TIMEOUT)
+
+    def request(self, method, url, **kwargs):
+        """Отправить запрос (повторяет только идемпотентные методы)"""
+        kwargs.setdefault("timeout", self.timeout)
+        attempt = 0
+
+        while True:
+            self.breaker.check()
+            _connect_timer.seconds = 0.0
+            start = time.perf_counter()
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                self.breaker.record_failure()
+                if not self.retry_policy.can_retry(method, attempt):
+                    raise
+                time.sleep(self.retry_policy.delay(attempt))
+                attempt += 1
+                continue
+
+            # elapsed у requests - от отправки до разбора заголовков ответа
+            response.timings = RequestTimings(
+                connect=_connect_timer.seconds,
+                ttfb=response.elapsed.total_seconds(),
+                total=time.perf_counter() - start,
+            )
+
+            if response.status_code >= 500:
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+
+            if self.retry_policy.should_retry_status(method, response.status_code, attempt):
+                time.sleep(self.retry_policy.delay(attempt, response.headers.get("Retry-After")))
+                attempt += 1
+                continue
+
+            return response
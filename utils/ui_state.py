@@ -0,0 +1,114 @@
+"""
+Подготовка состояния UI тестов через API
+
+Корзина магазина привязана к cookie сессии, поэтому её можно собрать
+запросами ApiClient и перенести cookies в браузер: тест сразу открывает
+CartPage или OrderPage, а через браузер проходит только проверяемый шаг.
+
+В Chrome cookies ставятся одной командой DevTools (Network.setCookies) без
+навигации, в других браузерах - через add_cookie после перехода на лёгкий
+URL сайта (cookie можно поставить только для открытого домена).
+
+Пример (фикстура ui_state):
+cart_page = ui_state.fill_cart({"708888": 2}).open_cart()
+"""
+from config.config import config
+from utils.api_client import ApiClient
+
+# Лёгкий URL сайта для перехода перед add_cookie (без CDP)
+COOKIE_LANDING_PATH = "/robots.txt"
+
+
+def cdp_cookie(cookie, url):
+    """Cookie из cookie jar requests в формате Network.setCookies"""
+    entry = {
+        "name": cookie.name,
+        "value": cookie.value,
+        "path": cookie.path or "/",
+        "secure": bool(cookie.secure),
+        "httpOnly": cookie.has_nonstandard_attr("HttpOnly"),
+    }
+    # Cookie без Domain принадлежит только хосту, выдавшему её
+    if cookie.domain_specified:
+        entry["domain"] = cookie.domain
+    else:
+        entry["url"] = url
+    if cookie.expires:
+        entry["expires"] = cookie.expires
+    return entry
+
+
+def transfer_cookies(cookies, driver, base_url=None):
+    """Перенести cookies сессии requests в браузер"""
+    base_url = base_url or config.BASE_URL
+    cookies = list(cookies)
+    if not cookies:
+        return driver
+
+    if hasattr(driver, "execute_cdp_cmd"):
+        driver.execute_cdp_cmd("Network.setCookies", {"cookies": [cdp_cookie(c, base_url) for c in cookies]})
+        return driver
+
+    driver.get(f"{base_url.rstrip('/')}{COOKIE_LANDING_PATH}")
+    for cookie in cookies:
+        browser_cookie = {"name": cookie.name, "value": cookie.value, "path": cookie.path or "/",
+                          "secure": bool(cookie.secure)}
+        if cookie.domain_specified:
+            browser_cookie["domain"] = cookie.domain
+        if cookie.expires:
+            browser_cookie["expiry"] = cookie.expires
+        driver.add_cookie(browser_cookie)
+    return driver
+
+
+class UiState:
+    """Состояние магазина для теста: собирается через API, открывается в браузере"""
+
+    def __init__(self, driver, client=None):
+        self.driver = driver
+        # Отдельный клиент без кассеты и кэша: браузер ходит в живой магазин
+        self.client = client or ApiClient()
+
+    def fill_cart(self, products=None):
+        """
+        Положить товары в корзину и перенести её в браузер
+
+        products - {id: количество} или список ID (по умолчанию TEST_PRODUCT_ID).
+        """
+        products = products or [config.TEST_PRODUCT_ID]
+        if not isinstance(products, dict):
+            products = {product_id: 1 for product_id in products}
+
+        # Пока корзина не перенесена в браузер, её очищает фикстура ui_state
+        # по cookies API-сессии (client.cart_touched) - в том числе если
+        # один из товаров не добавился
+        for product_id, quantity in products.items():
+            response = self.client.add_to_cart(product_id, quantity)
+            if not response.ok:
+                raise RuntimeError(
+                    f"Не удалось добавить товар {product_id} через API: HTTP {response.status_code} {response.text[:200]}"
+                )
+
+        self.driver.cart_touched = True
+        self.transfer_session()
+        # Корзина теперь в браузере - очистка по его cookies (см. conftest, фикстура driver)
+        self.client.cart_touched = False
+        return self
+
+    def transfer_session(self):
+        """Перенести cookies API-сессии в браузер"""
+        transfer_cookies(self.client.session.cookies, self.driver)
+        return self
+
+    def open_cart(self):
+        """Открыть корзину"""
+        from pages.cart_page import CartPage
+        return CartPage(self.driver).open("/cart")
+
+    def open_checkout(self):
+        """Открыть оформление заказа"""
+        from pages.order_page import OrderPage
+        return OrderPage(self.driver).open("/checkout")
+
+    def close(self):
+        self.client.session.close()